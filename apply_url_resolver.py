@@ -0,0 +1,175 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from config import APPLY_URL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def is_linkedin_url(url: str) -> bool:
+    return urlparse(url).netloc.endswith('linkedin.com')
+
+
+def unwrap_redirect(url: str) -> str:
+    """Return the target of a LinkedIn redirect/external-apply link without a request when it is embedded."""
+    parsed = urlparse(url)
+    if is_linkedin_url(url):
+        query = parse_qs(parsed.query)
+        for key in ('url', 'redirect', 'redirectUrl'):
+            if query.get(key):
+                return query[key][0]
+    return url
+
+
+class ApplyUrlResolver:
+    """Resolve external apply links to their final URL off the browser thread, cached by job_id.
+
+    Requests go out through the browser's current proxy. Requests to LinkedIn itself, when a pace
+    callable is given, wait for the same rate cap as the browser's page loads; requests to employer
+    sites do not use up that budget.
+    """
+
+    def __init__(self, collection=None, max_workers: int = None, user_agent: str = None,
+                 pace: Optional[Callable[[], None]] = None):
+        self.collection = collection
+        self.pace = pace
+        self.session = requests.Session()
+        pool_size = max_workers or APPLY_URL_CONFIG['max_workers']
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='apply-url')
+        self.resolved = {}
+        self.pending = {}
+        # Jobs whose URL failed to resolve this time; their stored apply_url should be kept
+        self.unresolved = set()
+        self.stats = {'submitted': 0, 'cached': 0, 'resolved': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+    def bind(self, collection):
+        self.collection = collection
+
+    def use_proxy(self, proxy_url: Optional[str]):
+        """Send later requests through proxy_url, the proxy the browser switched to."""
+        self.session.proxies = {'http': proxy_url, 'https': proxy_url} if proxy_url else {}
+
+    def request(self, method: str, url: str, **kwargs):
+        if self.pace and is_linkedin_url(url):
+            self.pace()
+        return self.session.request(method, url, **kwargs)
+
+    def cached(self, job_id: str) -> Optional[str]:
+        """Resolved apply URL for job_id from memory or MongoDB."""
+        if job_id in self.resolved:
+            return self.resolved[job_id]
+        if self.collection is None:
+            return None
+        try:
+            doc = self.collection.find_one({"_id": job_id}, {"apply_url": 1})
+        except Exception as e:
+            logger.warning(f"Apply URL cache lookup failed: {str(e)}")
+            return None
+        if doc:
+            self.resolved[job_id] = doc['apply_url']
+            return doc['apply_url']
+        return None
+
+    def submit(self, job_id: str, link: str) -> Future:
+        """Start resolving a job's apply link unless it is cached or already in progress."""
+        with self._lock:
+            if job_id in self.pending:
+                return self.pending[job_id]
+        # The cache lookup may go to MongoDB, so it runs outside the lock
+        cached_url = self.cached(job_id)
+        with self._lock:
+            if job_id in self.pending:
+                return self.pending[job_id]
+            if cached_url:
+                self.stats['cached'] += 1
+                future = Future()
+                future.set_result(cached_url)
+            else:
+                self.stats['submitted'] += 1
+                future = self.executor.submit(self._resolve, job_id, link)
+            self.pending[job_id] = future
+            return future
+
+    def is_pending(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self.pending
+
+    def result(self, job_id: str, timeout: float = None) -> str:
+        """Wait for a submitted job's apply URL; 'Not Applicable' if none was submitted."""
+        with self._lock:
+            future = self.pending.pop(job_id, None)
+        if future is None:
+            return self.cached(job_id) or 'Not Applicable'
+        try:
+            return future.result(timeout=timeout or APPLY_URL_CONFIG['result_timeout'])
+        except Exception as e:
+            logger.error(f"Apply URL for job {job_id} not resolved in time: {str(e)}")
+            with self._lock:
+                self.unresolved.add(job_id)
+            return 'Not Applicable'
+
+    def was_unresolved(self, job_id: str) -> bool:
+        """True once for a job whose last resolution failed or timed out."""
+        with self._lock:
+            if job_id in self.unresolved:
+                self.unresolved.discard(job_id)
+                return True
+            return False
+
+    def resolve(self, link: str) -> str:
+        """Follow redirects for one link and return the final URL."""
+        url = unwrap_redirect(link)
+        timeout = APPLY_URL_CONFIG['request_timeout']
+        response = self.request('HEAD', url, allow_redirects=True, timeout=timeout)
+        if response.status_code in (403, 405) or response.status_code >= 500:
+            # Some sites reject HEAD; a streamed GET follows the same redirects without the body
+            response = self.request('GET', url, allow_redirects=True, timeout=timeout, stream=True)
+            response.close()
+        final_url = response.url or url
+        # A meta or JS redirect leaves us on a LinkedIn page; keep the unwrapped target instead
+        if is_linkedin_url(final_url):
+            return url
+        return final_url
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _resolve(self, job_id: str, link: str) -> str:
+        try:
+            apply_url = self.resolve(link)
+            self.count('resolved')
+        except Exception as e:
+            # Not cached, so the next visit tries again
+            logger.warning(f"Failed to resolve apply URL for job {job_id}, keeping the captured link: {str(e)}")
+            self.count('failed')
+            with self._lock:
+                self.unresolved.add(job_id)
+            return unwrap_redirect(link)
+
+        self.resolved[job_id] = apply_url
+        if self.collection is not None:
+            try:
+                self.collection.update_one(
+                    {"_id": job_id},
+                    {"$set": {"apply_url": apply_url, "link": link, "resolved_at": datetime.now().isoformat()}},
+                    upsert=True
+                )
+            except Exception as e:
+                logger.warning(f"Failed to cache apply URL for job {job_id}: {str(e)}")
+        return apply_url
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
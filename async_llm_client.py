@@ -0,0 +1,265 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError
+)
+from config import LLM_CONFIG, LLM_RATE_LIMIT_CONFIG
+from description_preprocessor import count_tokens
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `per_minute` units per minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> float:
+        """Wait until `amount` units are available, take them and return the time spent waiting."""
+        # A single request larger than the whole bucket may still go through once it is full
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+    def drain(self):
+        """Empty the bucket, e.g. after the server reports the limit was hit anyway."""
+        self._refill()
+        self.tokens = 0.0
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of request latencies in seconds."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            index = next((i for i, bound in enumerate(self.buckets) if seconds <= bound), len(self.buckets))
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bucket bound containing the p-th percentile (the max for the overflow bucket)."""
+        if not self.count:
+            return None
+        rank = p / 100.0 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def summary(self) -> Dict:
+        with self._lock:
+            buckets = {f"<={bound}s": count for bound, count in zip(self.buckets, self.counts)}
+            buckets[f">{self.buckets[-1]}s"] = self.counts[-1]
+            count, total, longest = self.count, self.total, self.max
+        return {
+            'count': count,
+            'mean': total / count if count else None,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'max': longest,
+            'buckets': buckets
+        }
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the server's requested delay from Retry-After / retry-after-ms headers."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+    retry_after = headers.get('retry-after')
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncLLMClient:
+    """Rate-limited chat-completions client running on its own asyncio event loop.
+
+    Requests wait on request-per-minute and token-per-minute buckets, at most `max_in_flight`
+    are sent at once, and retryable failures are retried with jittered exponential backoff
+    that honours Retry-After. Synchronous callers use `complete()`; coroutines use `acomplete()`.
+    """
+
+    def __init__(self, api_key: str = None, base_url: str = None, requests_per_minute: int = None,
+                 tokens_per_minute: int = None, max_in_flight: int = None, max_retries: int = None):
+        self.api_key = api_key
+        self.base_url = base_url or LLM_RATE_LIMIT_CONFIG['base_url']
+        self.requests_per_minute = requests_per_minute or LLM_RATE_LIMIT_CONFIG['requests_per_minute']
+        self.tokens_per_minute = tokens_per_minute or LLM_RATE_LIMIT_CONFIG['tokens_per_minute']
+        self.max_in_flight = max_in_flight or LLM_RATE_LIMIT_CONFIG['max_in_flight']
+        self.max_retries = LLM_RATE_LIMIT_CONFIG['max_retries'] if max_retries is None else max_retries
+        self.latency = {'success': LatencyHistogram(), 'retried': LatencyHistogram(), 'failed': LatencyHistogram()}
+        self.stats = {'requests': 0, 'retries': 0, 'rate_limited': 0, 'failures': 0, 'throttle_seconds': 0.0}
+        self._stats_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._client = None
+
+    def start(self):
+        """Start the event loop thread and create the client and limiters on it."""
+        with self._start_lock:
+            if self._loop:
+                return
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=loop.run_forever, name='llm-client', daemon=True)
+            self._thread.start()
+            asyncio.run_coroutine_threadsafe(self._setup(), loop).result()
+            self._loop = loop
+        logger.info(
+            f"Async OpenAI client started ({self.requests_per_minute} RPM, {self.tokens_per_minute} TPM, "
+            f"{self.max_in_flight} in flight)"
+        )
+
+    async def _setup(self):
+        # The OpenAI client's own retries are disabled so every retry goes through the limiters
+        self._client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            max_retries=0,
+            timeout=LLM_RATE_LIMIT_CONFIG['request_timeout']
+        )
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self._request_bucket = TokenBucket(self.requests_per_minute)
+        self._token_bucket = TokenBucket(self.tokens_per_minute)
+
+    def count(self, key: str, amount: float = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def estimate_request_tokens(self, request: Dict) -> int:
+        """Prompt tokens plus the completion budget, which is what OpenAI counts against TPM."""
+        prompt_tokens = sum(count_tokens(message.get('content') or '') for message in request['messages'])
+        return prompt_tokens + request.get('max_tokens', LLM_CONFIG['max_tokens'])
+
+    def backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        base = LLM_RATE_LIMIT_CONFIG['backoff_base']
+        delay = random.uniform(0, min(LLM_RATE_LIMIT_CONFIG['backoff_max'], base * 2 ** attempt))
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after + random.uniform(0, base))
+        return delay
+
+    async def acomplete(self, request: Dict) -> str:
+        """Send one chat-completions request and return the message content."""
+        estimated_tokens = self.estimate_request_tokens(request)
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            throttled = await self._request_bucket.acquire(1)
+            throttled += await self._token_bucket.acquire(estimated_tokens)
+            self.count('throttle_seconds', throttled)
+            try:
+                async with self._in_flight:
+                    self.count('requests')
+                    response = await self._client.chat.completions.create(**request)
+                self.latency['success' if attempt == 0 else 'retried'].observe(time.monotonic() - started)
+                return response.choices[0].message.content
+
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, RateLimitError):
+                    self.count('rate_limited')
+                    self._request_bucket.drain()
+                if attempt >= self.max_retries:
+                    self.count('failures')
+                    self.latency['failed'].observe(time.monotonic() - started)
+                    raise
+                delay = self.backoff_delay(attempt, e)
+                attempt += 1
+                self.count('retries')
+                logger.warning(
+                    f"OpenAI request failed ({e.__class__.__name__}), retry {attempt}/{self.max_retries} "
+                    f"in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+            except Exception:
+                self.count('failures')
+                self.latency['failed'].observe(time.monotonic() - started)
+                raise
+
+    def complete(self, request: Dict) -> str:
+        """Blocking wrapper around acomplete() for callers on other threads."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self.acomplete(request), self._loop).result()
+
+    def latency_summary(self) -> Dict:
+        return {outcome: histogram.summary() for outcome, histogram in self.latency.items()}
+
+    def close(self):
+        """Close the HTTP client and stop the event loop thread."""
+        with self._start_lock:
+            self._shutdown()
+
+    def _shutdown(self):
+        if not self._loop:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result(timeout=10)
+        except Exception as e:
+            logger.warning(f"Error closing async OpenAI client: {str(e)}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        self._loop.close()
+        self._loop = None
+        self._thread = None
@@ -0,0 +1,119 @@
+import sys
+import json
+import time
+import argparse
+from typing import Dict, List
+from llm_extractor import JobFieldExtractor, LLM_FIELDS
+from rule_extractor import RuleBasedExtractor
+from description_preprocessor import count_tokens, prepare_description
+
+# Rough completion size of one extracted field in the JSON answer
+COMPLETION_TOKENS_PER_FIELD = 25
+
+
+def request_tokens(request: Dict, field_count: int) -> int:
+    prompt = ''.join(message['content'] for message in request['messages'])
+    return count_tokens(prompt) + field_count * COMPLETION_TOKENS_PER_FIELD
+
+
+def load_corpus(path: str) -> List[Dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def same_value(resolved: str, label: str) -> bool:
+    """Compare values case-insensitively, as unordered sets for comma-separated lists."""
+    def normalise(value):
+        return {part.strip().lower() for part in str(value).split(',') if part.strip()}
+    return normalise(resolved) == normalise(label)
+
+
+def run_benchmark(corpus: List[Dict], rules: RuleBasedExtractor, verbose: bool = False) -> Dict:
+    """Compare LLM calls and tokens with and without the rule-based pre-extractor."""
+    extractor = JobFieldExtractor(client=None, rules=rules)
+    totals = {
+        'jobs': len(corpus),
+        'baseline_calls': 0,
+        'baseline_tokens': 0,
+        'rule_calls': 0,
+        'rule_tokens': 0,
+        'fields_resolved': 0,
+        'description_tokens_raw': 0,
+        'description_tokens_sent': 0,
+        'rule_seconds': 0.0
+    }
+    resolved_per_field = {field: 0 for field in LLM_FIELDS}
+    # Per field: [resolved values checked against a label, values that agreed]
+    accuracy_per_field = {field: [0, 0] for field in LLM_FIELDS}
+
+    for job in corpus:
+        description = job['full_job_description']
+        prepared = prepare_description(description)
+        totals['description_tokens_raw'] += prepared.tokens_before
+        totals['description_tokens_sent'] += prepared.tokens_after
+        totals['baseline_calls'] += 1
+        totals['baseline_tokens'] += request_tokens(extractor.build_single_request(description), len(LLM_FIELDS))
+
+        started = time.perf_counter()
+        resolved = extractor.resolve_locally(description)
+        totals['rule_seconds'] += time.perf_counter() - started
+
+        missing = extractor.missing_fields(resolved)
+        totals['fields_resolved'] += len(resolved)
+        for field in resolved:
+            resolved_per_field[field] += 1
+        for field, label in job.get('labels', {}).items():
+            if field in resolved:
+                accuracy_per_field[field][0] += 1
+                if same_value(resolved[field], label):
+                    accuracy_per_field[field][1] += 1
+                elif verbose:
+                    print(f"{job['job_id']}: {field} resolved as {resolved[field]!r}, labelled {label!r}")
+        if missing:
+            totals['rule_calls'] += 1
+            totals['rule_tokens'] += request_tokens(extractor.build_single_request(description, missing), len(missing))
+
+        if verbose:
+            print(f"{job['job_id']}: resolved {sorted(resolved)}; LLM still needed for {missing}")
+
+    totals['resolved_per_field'] = resolved_per_field
+    totals['accuracy_per_field'] = accuracy_per_field
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure LLM calls and tokens saved by the rule-based pre-extractor.")
+    parser.add_argument('--corpus', default='benchmark_corpus.jsonl',
+                        help="JSONL file of {job_id, full_job_description, labels} records; labels maps "
+                             "fields to reference answers and is optional")
+    parser.add_argument('--verbose', action='store_true', help="Print the fields resolved for each job")
+    args = parser.parse_args(argv)
+
+    totals = run_benchmark(load_corpus(args.corpus), RuleBasedExtractor(), args.verbose)
+
+    calls_saved = totals['baseline_calls'] - totals['rule_calls']
+    tokens_saved = totals['baseline_tokens'] - totals['rule_tokens']
+    print(f"Jobs: {totals['jobs']}")
+    print(f"LLM calls: {totals['baseline_calls']} -> {totals['rule_calls']} ({calls_saved} saved)")
+    print(
+        f"Estimated tokens: {totals['baseline_tokens']} -> {totals['rule_tokens']} "
+        f"({tokens_saved} saved, {tokens_saved / max(1, totals['baseline_tokens']):.0%})"
+    )
+    print(
+        f"Description tokens after pre-processing: {totals['description_tokens_raw']} -> "
+        f"{totals['description_tokens_sent']}"
+    )
+    print(f"Fields resolved locally: {totals['fields_resolved']} of {totals['jobs'] * len(LLM_FIELDS)}")
+    for field, count in totals['resolved_per_field'].items():
+        print(f"  {field}: {count}")
+    checked = {field: counts for field, counts in totals['accuracy_per_field'].items() if counts[0]}
+    if checked:
+        print("Locally resolved values matching the labels:")
+        for field, (total, agreed) in checked.items():
+            print(f"  {field}: {agreed} of {total}")
+    print(f"Rule extraction time: {totals['rule_seconds'] * 1000:.1f} ms total")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -109,4 +109,162 @@ RETRY_CONFIG = {
     'max_search_attempts': 3,    # Maximum number of search attempts
     'max_job_attempts': 2,       # Maximum number of job processing attempts
     'max_proxy_attempts': 3      # Maximum number of proxy rotation attempts
-} 
\ No newline at end of file
+} 
+
+# Buffered MongoDB job writer
+JOB_WRITER_CONFIG = {
+    'max_batch_size': 50,          # Flush once this many jobs are buffered
+    'max_buffer_age': 30,          # Flush once the oldest buffered job is this many seconds old
+    'write_concern_w': 1,          # Write acknowledgement level for each flush
+    'write_concern_journal': False  # Wait for the journal commit on each flush
+}
+
+# MongoDB connection management
+MONGODB_CONFIG = {
+    'uri': 'mongodb://localhost:27017/',
+    'database': 'linkedin_jobs',
+    'server_selection_timeout_ms': 5000,  # Timeout for finding a usable server
+    'heartbeat_frequency_ms': 10000,      # Interval between pymongo's background health checks
+    'reconnect_attempts': 5,              # Maximum reconnect attempts after a connection failure
+    'reconnect_backoff_base': 1,          # First reconnect backoff in seconds, doubled per attempt
+    'reconnect_backoff_max': 30           # Upper bound for a single reconnect backoff
+}
+
+# Background persistence stage
+PERSISTENCE_CONFIG = {
+    'max_queue_size': 20,     # Finished jobs waiting to be persisted before the browser loop blocks
+    'put_timeout': 30,        # Seconds between warnings while the browser loop waits on a full queue
+    'idle_interval': 1,       # Seconds the worker waits for work before running its idle check
+    'shutdown_timeout': 120   # Seconds to wait for the queue to drain on shutdown
+}
+
+# Cache for OpenAI field extraction
+LLM_CACHE_CONFIG = {
+    'enabled': True,
+    'max_size_mb': 256,              # Evict least recently used entries above this size
+    'eviction_check_interval': 100,  # Check the cache size after this many new entries
+    'eviction_target_ratio': 0.9     # Evict down to this fraction of the size budget
+}
+
+# LLM enrichment of scraped jobs
+ENRICHMENT_CONFIG = {
+    'inline': False,        # Enrich while scraping instead of leaving it to enrichment_worker.py
+    'concurrency': 4,       # Maximum OpenAI requests in flight in the enrichment worker
+    'batch_size': 25,       # Enriched jobs written back per bulk_write
+    'max_attempts': 3,      # Stop retrying a job after this many failed enrichments
+    'batch_api_max_jobs': 1000  # Descriptions per OpenAI Batch API submission
+}
+
+# OpenAI field extraction
+LLM_CONFIG = {
+    'model': 'gpt-3.5-turbo',
+    'temperature': 0.3,
+    'max_tokens': 1000,                # Completion budget per description
+    'completion_token_limit': 4096,    # Most completion tokens the model returns for one request
+    'structured_output': 'json_object',  # 'json_object', or 'json_schema' for models with strict schema support
+    'pack_max_chars': 2500,            # Descriptions up to this length can share a request
+    'pack_size': 4,                    # Maximum descriptions packed into one request; capped so every
+                                       # description keeps its max_tokens within completion_token_limit
+    'batch_completion_window': '24h'   # Completion window for OpenAI Batch API jobs
+}
+
+# Rule-based field extraction that runs before the LLM
+RULE_EXTRACTION_CONFIG = {
+    'enabled': True,
+    'min_confidence': 0.75,   # Fields found with at least this confidence are not sent to the LLM
+    'min_skill_matches': 3,   # Distinct vocabulary skills needed before a skills field counts as resolved
+    'min_benefit_matches': 2  # Distinct benefits needed before benefits counts as resolved
+}
+
+# Job description pre-processing before the LLM
+PREPROCESSING_CONFIG = {
+    'enabled': True,
+    'max_description_tokens': 1500,     # Token budget for one description in a prompt
+    'tokenizer_encoding': 'cl100k_base'  # tiktoken encoding used when tiktoken is installed
+}
+
+# Rate limits and retries for the async OpenAI client
+LLM_RATE_LIMIT_CONFIG = {
+    'base_url': None,              # Defaults to OPENAI_BASE_URL or the public API
+    'requests_per_minute': 500,
+    'tokens_per_minute': 200000,
+    'max_in_flight': 8,
+    'max_retries': 6,
+    'backoff_base': 1,             # Seconds; doubled on each retry
+    'backoff_max': 60,
+    'request_timeout': 60
+}
+
+# Job detail extraction
+EXTRACTION_CONFIG = {
+    'mode': 'script',  # 'script' runs the in-page extractor, 'snapshot' parses one HTML snapshot locally,
+                       # 'webdriver' looks up each field live
+    'snapshot_selector': 'div.jobs-search__job-details--container, div.jobs-details'  # Detail pane; page_source is the fallback
+}
+
+# Selector fallback chains ordered by observed hit rate
+SELECTOR_REGISTRY_CONFIG = {
+    'wait_timeout': 15,     # One wait covering every selector in a chain, in seconds
+    'history_decay': 0.5    # Weight of statistics from previous runs when a run starts
+}
+
+# Single-visit card -> detail -> extract flow
+JOB_VISIT_CONFIG = {
+    'ready_timeout': 10,          # Seconds to wait for the detail pane to show the clicked job
+    'ready_poll_interval': 0.25,
+    'description_selector': 'div.jobs-description__content'
+}
+
+# Deferred resolution of external apply URLs
+APPLY_URL_CONFIG = {
+    'max_workers': 8,          # Concurrent resolutions, also the HTTP connection pool size
+    'request_timeout': 10,     # Seconds per HTTP request
+    'result_timeout': 60,      # Seconds the persistence stage waits for a resolution
+    'click_fallback': False    # Open the apply tab in the browser when the page has no apply link
+}
+
+# Content-addressed company logo store
+LOGO_STORE_CONFIG = {
+    'directory': 'logos',
+    'max_workers': 4,              # Concurrent downloads, also the HTTP connection pool size
+    'request_timeout': 15,         # Seconds per HTTP request
+    'result_timeout': 60,          # Seconds the persistence stage waits for a logo
+    'revalidate_after_hours': 24   # Reuse a stored logo without a request for this long, then send a conditional GET
+}
+
+# Incremental scraping of recurring searches
+INCREMENTAL_CONFIG = {
+    'enabled': True,            # Skip the detail visit for jobs already stored and extracted recently
+    'refresh_ttl_hours': 72,    # Known jobs older than this are visited and extracted again
+    'seen_batch_size': 100      # Skipped jobs stamped as seen per update
+}
+
+# Search results URLs built directly instead of filling the search form
+SEARCH_URL_CONFIG = {
+    'direct': True,                                           # Build the URL when the location's geoId is cached
+    'search_url': 'https://www.linkedin.com/jobs/search/',
+    'jobs_per_page': 25,
+    'max_pages': 40                                           # LinkedIn stops paginating after 1000 results
+}
+
+# Yield-driven recrawl scheduling of search criteria
+SCHEDULER_CONFIG = {
+    'enabled': True,
+    'history_runs': 5,             # Recent runs per search the decision is based on
+    'target_new_per_run': 10,      # New or changed jobs per run that earn the base interval
+    'base_interval_hours': 24,
+    'min_interval_hours': 6,
+    'max_interval_hours': 168,     # Even the quietest search is crawled at least weekly
+    'depth_margin_pages': 2,       # Pages crawled past the deepest page that recently held a new job
+    'full_depth_every_runs': 4,    # Every Nth run (or after max_interval_hours) crawls all pages and sweeps inactive jobs
+    'time_budget_minutes': None    # Stop starting new searches after this long; None for no limit
+}
+
+# Parallel browser workers sharing one request-rate cap
+WORKER_POOL_CONFIG = {
+    'workers': 1,                  # Browser processes; 1 runs the scraper in this process
+    'actions_per_minute': 20,      # Page loads and job clicks per minute across all workers, a single browser's pace
+    'start_stagger_seconds': 30,   # Gap between worker logins
+    'report_timeout': 600,         # Seconds to wait for a finished worker's report
+    'claim_retention_days': 7      # Per-run job claims in run_claims expire after this
+}
@@ -0,0 +1,156 @@
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, List, NamedTuple
+from config import PREPROCESSING_CONFIG
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character-based estimate
+    tiktoken = None
+
+# Headings that open a section with nothing the LLM needs
+BOILERPLATE_HEADING = re.compile(
+    r"^\W*(?:about us|about the company|about our company|who we are|our company|company overview|"
+    r"equal (?:employment )?opportunity(?: employer)?|eeo(?: statement)?|diversity (?:and|&) inclusion|"
+    r"disclaimer|pay transparency|privacy notice|accommodations?)\W*$",
+    re.I
+)
+
+# Paragraphs carrying any of these phrases are legal/EEO boilerplate
+BOILERPLATE_PHRASES = re.compile(
+    r"equal opportunity employer|equal employment opportunity|without regard to (?:race|age|sex|religion)|"
+    r"reasonable accommodation|e-verify|affirmative action|protected veteran|"
+    r"regardless of (?:race|age|gender|religion)|applicants? (?:will|shall) receive consideration|"
+    r"does not discriminate|background check",
+    re.I
+)
+
+BULLET = re.compile(r"^\s*(?:[-*•●▪]|\d+[.)])\s+")
+
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+# Stripping that keeps less than this share of the text falls back to the original
+MIN_KEPT_RATIO = 0.2
+
+
+class PreparedDescription(NamedTuple):
+    text: str
+    tokens_before: int
+    tokens_after: int
+    truncated: bool
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(PREPROCESSING_CONFIG['tokenizer_encoding'])
+    except Exception as e:
+        logger.warning(f"Failed to load tokenizer, falling back to estimates: {str(e)}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken when installed, otherwise estimate about four characters per token."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to at most max_tokens tokens, on a word boundary when estimating."""
+    encoding = _encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(' ', 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
+
+
+def is_heading(line: str) -> bool:
+    """Short, unpunctuated, non-bullet lines are treated as section headings."""
+    stripped = line.strip()
+    return (
+        0 < len(stripped) <= 60
+        and len(stripped.split()) <= 8
+        and not stripped.endswith(('.', ','))
+        and not BULLET.match(line)
+    )
+
+
+def strip_boilerplate_sentences(line: str):
+    """Drop the boilerplate sentences of one line; None when nothing else is left."""
+    if not BOILERPLATE_PHRASES.search(line):
+        return line
+    sentences = [s for s in SENTENCE_BREAK.split(line) if not BOILERPLATE_PHRASES.search(s)]
+    return ' '.join(sentences) if sentences else None
+
+
+def strip_boilerplate(text: str) -> str:
+    """Drop boilerplate sections and paragraphs, keeping the original if little would be left."""
+    kept: List[str] = []
+    skipping = False
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if BOILERPLATE_HEADING.match(stripped):
+            skipping = True
+            continue
+        if skipping:
+            # A boilerplate section runs until the next heading
+            if is_heading(line):
+                skipping = False
+            else:
+                continue
+        kept.append(line)
+
+    paragraphs = re.split(r"\n\s*\n", '\n'.join(kept))
+    if len(paragraphs) > 1:
+        stripped_text = '\n\n'.join(p for p in paragraphs if not BOILERPLATE_PHRASES.search(p))
+    else:
+        # No paragraph breaks: drop boilerplate sentences line by line instead
+        lines = (strip_boilerplate_sentences(line) for line in paragraphs[0].split('\n'))
+        stripped_text = '\n'.join(line for line in lines if line is not None)
+
+    if len(stripped_text.strip()) < MIN_KEPT_RATIO * len(text.strip()):
+        return text
+    return stripped_text
+
+
+def collapse_whitespace(text: str) -> str:
+    """Collapse runs of spaces and blank lines while keeping paragraph breaks."""
+    lines = [' '.join(line.split()) for line in text.split('\n')]
+    return re.sub(r"\n{3,}", "\n\n", '\n'.join(lines)).strip()
+
+
+@lru_cache(maxsize=256)
+def prepare_description(description: str, max_tokens: int = None) -> PreparedDescription:
+    """Strip boilerplate, collapse whitespace and fit the description into the token budget."""
+    if max_tokens is None:
+        max_tokens = PREPROCESSING_CONFIG['max_description_tokens']
+    tokens_before = count_tokens(description)
+    if not PREPROCESSING_CONFIG['enabled']:
+        return PreparedDescription(description, tokens_before, tokens_before, False)
+
+    text = collapse_whitespace(strip_boilerplate(description))
+    truncated = False
+    if count_tokens(text) > max_tokens:
+        text = truncate_to_tokens(text, max_tokens)
+        truncated = True
+    return PreparedDescription(text, tokens_before, count_tokens(text), truncated)
+
+
+def token_counts(description: str) -> Dict[str, int]:
+    """Token counts before and after pre-processing, in the shape stored on job records."""
+    prepared = prepare_description(description)
+    return {
+        'description_tokens_raw': prepared.tokens_before,
+        'description_tokens_sent': prepared.tokens_after
+    }
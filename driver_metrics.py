@@ -0,0 +1,44 @@
+import logging
+import threading
+from collections import Counter
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class WebDriverCommandCounter:
+    """Count the WebDriver commands (chromedriver round trips) a driver issues."""
+
+    def __init__(self):
+        self.total = 0
+        self.by_command = Counter()
+        self.per_mode = {}
+        self._lock = threading.Lock()
+
+    def install(self, driver):
+        """Wrap driver.execute; WebElement calls go through it as well."""
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            with self._lock:
+                self.total += 1
+                self.by_command[driver_command] += 1
+            return original_execute(driver_command, params)
+
+        driver.execute = execute
+        return driver
+
+    def record_job(self, mode: str, commands: int):
+        """Record the commands one job extraction took under the given extraction mode."""
+        with self._lock:
+            stats = self.per_mode.setdefault(mode, {'jobs': 0, 'commands': 0})
+            stats['jobs'] += 1
+            stats['commands'] += commands
+
+    def summary(self) -> Dict[str, float]:
+        """Average WebDriver commands per job for each extraction mode."""
+        with self._lock:
+            return {
+                mode: stats['commands'] / stats['jobs']
+                for mode, stats in self.per_mode.items() if stats['jobs']
+            }
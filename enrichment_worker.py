@@ -0,0 +1,294 @@
+import os
+import sys
+import logging
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from openai import OpenAI
+from pymongo import UpdateOne
+from config import ENRICHMENT_CONFIG, LLM_CACHE_CONFIG, RULE_EXTRACTION_CONFIG
+from mongo_connection import MongoConnectionManager
+from async_llm_client import AsyncLLMClient
+from llm_cache import LLMFieldCache
+from llm_extractor import JobFieldExtractor, LLM_PROMPT_VERSION, LLM_FIELDS
+from rule_extractor import RuleBasedExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class EnrichmentWorker:
+    """Enrich stored jobs with llm_converted == 0 and write the results back in bulk."""
+
+    def __init__(self, extractor: JobFieldExtractor, collection, batches_collection=None,
+                 concurrency: int = None, batch_size: int = None, max_attempts: int = None):
+        self.extractor = extractor
+        self.collection = collection
+        self.batches_collection = batches_collection
+        self.concurrency = concurrency or ENRICHMENT_CONFIG['concurrency']
+        self.batch_size = batch_size or ENRICHMENT_CONFIG['batch_size']
+        self.max_attempts = max_attempts or ENRICHMENT_CONFIG['max_attempts']
+        self.stats = {'enriched': 0, 'failed': 0, 'written': 0}
+        self._stats_lock = threading.Lock()
+
+    def pending_filter(self) -> Dict:
+        """Query for jobs that still need enrichment and have not exhausted their attempts."""
+        return {
+            "llm_converted": 0,
+            "full_job_description": {"$nin": [None, "", "Not Applicable"]},
+            "llm_attempts": {"$not": {"$gte": self.max_attempts}},
+            "llm_batch_id": {"$exists": False}
+        }
+
+    def stream_pending(self, limit: Optional[int] = None):
+        """Stream pending jobs, fetching only the fields enrichment needs."""
+        cursor = self.collection.find(
+            self.pending_filter(),
+            {"job_id": 1, "full_job_description": 1, "content_hash": 1},
+            no_cursor_timeout=True
+        ).batch_size(self.batch_size)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    def build_operation(self, job: Dict, fields: Dict, batch_id: Optional[str] = None) -> UpdateOne:
+        """Build the write-back operation for one job's extraction result.
+
+        The write only lands on the content that was extracted: a job re-scraped with a changed
+        description in the meantime has a new content_hash and no llm_batch_id, and is left for
+        the next pass.
+        """
+        job_filter = {"job_id": job['job_id']}
+        if batch_id is not None:
+            job_filter['llm_batch_id'] = batch_id
+        elif job.get('content_hash'):
+            job_filter['content_hash'] = job['content_hash']
+
+        if fields.get('llm_converted'):
+            with self._stats_lock:
+                self.stats['enriched'] += 1
+            update = {field: fields.get(field, 'Not Applicable') for field in LLM_FIELDS}
+            update['llm_converted'] = 1
+            for key in ('description_tokens_raw', 'description_tokens_sent'):
+                if key in fields:
+                    update[key] = fields[key]
+            return UpdateOne(
+                {**job_filter, "llm_converted": 0},
+                {"$set": update, "$unset": {"llm_batch_id": ""}}
+            )
+
+        with self._stats_lock:
+            self.stats['failed'] += 1
+        return UpdateOne(job_filter, {"$inc": {"llm_attempts": 1}, "$unset": {"llm_batch_id": ""}})
+
+    def enrich(self, jobs: List[Dict]) -> List[UpdateOne]:
+        """Enrich a group of jobs, packing short descriptions together, and build their write-backs."""
+        results = self.extractor.extract_many(jobs)
+        return [
+            self.build_operation(job, results.get(job['job_id'], {'llm_converted': 0}))
+            for job in jobs
+        ]
+
+    def write(self, operations: List[UpdateOne]):
+        """Write a batch of enrichment results in one unordered bulk_write."""
+        if not operations:
+            return
+        result = self.collection.bulk_write(operations, ordered=False)
+        self.stats['written'] += result.modified_count
+        logger.info(f"Wrote back {len(operations)} enrichment results ({result.modified_count} modified)")
+
+    def run(self, limit: Optional[int] = None) -> Dict:
+        """Enrich pending jobs with at most `concurrency` OpenAI requests in flight."""
+        operations = []
+        in_flight = set()
+        # Jobs behind each submitted group, so a failed group still records an attempt per job
+        groups = {}
+        group = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            cursor = self.stream_pending(limit)
+            try:
+                for job in cursor:
+                    group.append(job)
+                    if len(group) < self.extractor.pack_size:
+                        continue
+
+                    # Keep the number of submitted groups bounded so the cursor is consumed lazily
+                    if len(in_flight) >= self.concurrency * 2:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        operations.extend(self._collect(done, groups))
+                    future = executor.submit(self.enrich, group)
+                    groups[future] = group
+                    in_flight.add(future)
+                    group = []
+
+                    if len(operations) >= self.batch_size:
+                        self.write(operations)
+                        operations = []
+
+                if group:
+                    future = executor.submit(self.enrich, group)
+                    groups[future] = group
+                    in_flight.add(future)
+                done, _ = wait(in_flight)
+                operations.extend(self._collect(done, groups))
+                self.write(operations)
+            finally:
+                cursor.close()
+
+        logger.info(
+            f"Enrichment finished: {self.stats['enriched']} enriched, {self.stats['failed']} failed, "
+            f"{self.stats['written']} written"
+        )
+        return self.stats
+
+    def submit_batches(self, limit: Optional[int] = None) -> List[str]:
+        """Submit pending jobs through the OpenAI Batch API instead of enriching them directly."""
+        batch_ids = []
+        operations = []
+        pending = []
+        cursor = self.stream_pending(limit)
+        try:
+            for job in cursor:
+                # Cache hits and jobs the rules fully resolve never need to go through the Batch API
+                fields = self.extractor.resolve_without_api(job['full_job_description'])
+                if fields:
+                    operations.append(self.build_operation(job, fields))
+                    continue
+                pending.append(job)
+                if len(pending) >= ENRICHMENT_CONFIG['batch_api_max_jobs']:
+                    batch_ids.append(self._submit_batch(pending))
+                    pending = []
+            if pending:
+                batch_ids.append(self._submit_batch(pending))
+        finally:
+            cursor.close()
+        self.write(operations)
+        return batch_ids
+
+    def _submit_batch(self, jobs: List[Dict]) -> str:
+        batch_id = self.extractor.submit_batch(jobs)
+        job_ids = [job['job_id'] for job in jobs]
+        self.batches_collection.insert_one({
+            "_id": batch_id,
+            "job_ids": job_ids,
+            "status": "submitted",
+            "submitted_at": datetime.now().isoformat()
+        })
+        # Mark the jobs so the streaming worker and later submissions skip them
+        self.collection.update_many({"job_id": {"$in": job_ids}}, {"$set": {"llm_batch_id": batch_id}})
+        return batch_id
+
+    def collect_batches(self) -> int:
+        """Write back the results of finished OpenAI batches."""
+        collected = 0
+        for batch in self.batches_collection.find({"status": "submitted"}):
+            # Jobs re-scraped with new content since submission have lost their llm_batch_id;
+            # their answers are for the old text and must not be cached under the new one
+            jobs = list(self.collection.find(
+                {"job_id": {"$in": batch['job_ids']}, "llm_batch_id": batch['_id']},
+                {"job_id": 1, "full_job_description": 1}
+            ))
+            results = self.extractor.collect_batch(batch['_id'], jobs)
+            if results is None:
+                logger.info(f"OpenAI batch {batch['_id']} is still running")
+                continue
+
+            operations = [
+                self.build_operation(job, results.get(job['job_id'], {'llm_converted': 0}), batch['_id'])
+                for job in jobs
+            ]
+            self.write(operations)
+            self.batches_collection.update_one(
+                {"_id": batch['_id']},
+                {"$set": {"status": "collected", "collected_at": datetime.now().isoformat(), "results": len(results)}}
+            )
+            collected += 1
+        return collected
+
+    def _collect(self, futures, groups: Dict) -> List[UpdateOne]:
+        operations = []
+        for future in futures:
+            jobs = groups.pop(future)
+            try:
+                operations.extend(future.result())
+            except Exception as e:
+                logger.error(f"Enrichment task failed for {len(jobs)} jobs: {str(e)}")
+                # Count the attempt so a group that keeps failing stops being picked up after max_attempts
+                operations.extend(self.build_operation(job, {'llm_converted': 0}) for job in jobs)
+        return operations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enrich scraped jobs that have not been through the LLM yet.")
+    parser.add_argument('--concurrency', type=int, default=ENRICHMENT_CONFIG['concurrency'],
+                        help="Maximum OpenAI requests in flight")
+    parser.add_argument('--batch-size', type=int, default=ENRICHMENT_CONFIG['batch_size'],
+                        help="Enriched jobs written back per bulk_write")
+    parser.add_argument('--limit', type=int, default=None, help="Stop after this many jobs")
+    parser.add_argument('--mode', choices=['stream', 'submit-batch', 'collect-batches'], default='stream',
+                        help="Enrich directly, submit through the OpenAI Batch API, or collect finished batches")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('enrichment.log'),
+            logging.StreamHandler()
+        ]
+    )
+    load_dotenv()
+
+    mongo = MongoConnectionManager()
+    mongo.connect()
+    cache = None
+    if LLM_CACHE_CONFIG['enabled']:
+        cache = LLMFieldCache(mongo.db['llm_field_cache'], LLM_PROMPT_VERSION)
+    rules = RuleBasedExtractor() if RULE_EXTRACTION_CONFIG['enabled'] else None
+    api_key = os.getenv('OPENAI_API_KEY', 'your_api_key')
+    llm_client = AsyncLLMClient(api_key=api_key, max_in_flight=args.concurrency)
+    extractor = JobFieldExtractor(OpenAI(api_key=api_key), cache, rules=rules, llm=llm_client)
+
+    worker = EnrichmentWorker(
+        extractor,
+        mongo.db['jobdetails'],
+        mongo.db['llm_batches'],
+        concurrency=args.concurrency,
+        batch_size=args.batch_size
+    )
+    try:
+        if args.mode == 'submit-batch':
+            batch_ids = worker.submit_batches(limit=args.limit)
+            print(f"Submitted {len(batch_ids)} OpenAI batches")
+        elif args.mode == 'collect-batches':
+            collected = worker.collect_batches()
+            print(f"Collected {collected} OpenAI batches")
+        stats = worker.run(limit=args.limit) if args.mode == 'stream' else worker.stats
+        print(f"Enriched {stats['enriched']} jobs ({stats['failed']} failed)")
+        print(
+            f"OpenAI requests: {extractor.stats['llm_requests']}, "
+            f"jobs resolved by rules alone: {extractor.stats['rule_only']}"
+        )
+        if cache:
+            cache_stats = cache.stats()
+            print(f"LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        print(
+            f"OpenAI HTTP: {llm_client.stats['requests']} sent, {llm_client.stats['retries']} retried, "
+            f"{llm_client.stats['rate_limited']} rate limited, {llm_client.stats['throttle_seconds']:.1f}s throttled"
+        )
+        for outcome, summary in llm_client.latency_summary().items():
+            if summary['count']:
+                print(
+                    f"  {outcome} latency: n={summary['count']} mean={summary['mean']:.2f}s "
+                    f"p50<={summary['p50']}s p95<={summary['p95']}s max={summary['max']:.2f}s"
+                )
+    finally:
+        llm_client.close()
+        mongo.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
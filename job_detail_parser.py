@@ -0,0 +1,235 @@
+import re
+import json
+import logging
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Selectors for the job detail pane, matching the ones used for live WebDriver lookups
+TITLE_SELECTOR = "h1.t-24.t-bold.inline"
+COMPANY_SELECTOR = "div.job-details-jobs-unified-top-card__company-name a"
+TERTIARY_SELECTOR = "div.job-details-jobs-unified-top-card__tertiary-description-container span.tvm__text"
+LOCATION_SELECTOR = TERTIARY_SELECTOR + ".tvm__text--low-emphasis"
+PREFERENCE_PILL_SELECTOR = "div.job-details-preferences-and-skills__pill span.ui-label"
+SALARY_SELECTOR = "span[dir='ltr']"
+APPLY_BUTTON_SELECTOR = "button.jobs-apply-button"
+# Anchors carrying the external apply target, so it can be resolved without clicking
+APPLY_LINK_SELECTORS = [
+    "a.jobs-apply-button[href]",
+    "div.jobs-apply-button--top-card a[href]",
+    "a[href*='externalApply']",
+    "a[href*='/jobs/view/'][href*='/apply']"
+]
+LOGO_SELECTOR = "img.ivm-view-attr__img--centered"
+DESCRIPTION_SELECTOR = "div.jobs-description__content div.jobs-box__html-content"
+COMPANY_DESCRIPTION_SELECTORS = [
+    "p.jobs-company__company-description div.DSkFjPIRUfGDmNnMiGtRQTFCGOMZBo",
+    "div.DSkFjPIRUfGDmNnMiGtRQTFCGOMZBo",
+    "p.jobs-company__company-description",
+    "div.jobs-company__company-description",
+    "div.jobs-company__description"
+]
+
+CARD_TITLE_SELECTORS = ["h3.base-search-card__title", "a.job-card-container__link strong"]
+CARD_COMPANY_SELECTORS = [
+    "div.artdeco-entity-lockup__subtitle span",
+    "span.job-card-container__primary-description",
+    "h4.base-search-card__subtitle"
+]
+
+# Fallback chains by field, shared with the in-page script extractor
+DETAIL_SELECTORS = {
+    'job_title': [TITLE_SELECTOR],
+    'company_name': [COMPANY_SELECTOR],
+    'job_location': [LOCATION_SELECTOR],
+    'full_job_description': [DESCRIPTION_SELECTOR],
+    'preference_pills': [PREFERENCE_PILL_SELECTOR],
+    'salary': [SALARY_SELECTOR],
+    'posted': [TERTIARY_SELECTOR],
+    'apply_button': [APPLY_BUTTON_SELECTOR],
+    'apply_link': APPLY_LINK_SELECTORS,
+    'logo': [LOGO_SELECTOR],
+    'comp_desc': COMPANY_DESCRIPTION_SELECTORS
+}
+
+EMPLOYMENT_TYPES = ['Full-time', 'Contract', 'Part-time', 'Temporary']
+WORK_MODES = ['Remote', 'Hybrid', 'On-site']
+SENIORITY_KEYWORDS = [
+    'Entry level', 'Mid-Senior level', 'Senior level', 'Associate',
+    'Mid level', 'Senior', 'Lead', 'Architect', 'Principal',
+    'Junior', 'Intermediate', 'Expert', 'Director', 'Manager',
+    'Staff', 'Senior Staff', 'Executive'
+]
+
+# Elements rendered on their own line, so their text is separated like Selenium's .text
+BLOCK_TAGS = ['p', 'div', 'li', 'ul', 'ol', 'section', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr']
+
+# The offsite apply URL as it appears in the JSON LinkedIn embeds in <code> elements
+COMPANY_APPLY_URL = re.compile(r'"companyApplyUrl"\s*:\s*"([^"]+)"')
+
+# Set by the snapshot script on elements that were not rendered, which the parser cannot tell
+HIDDEN_ATTRIBUTE = 'data-snapshot-hidden'
+
+# Serializes the detail pane for parse_job_details. Arguments: the pane selector and the selector
+# chains whose matches must be visible (comp_desc). Hidden matches are marked with HIDDEN_ATTRIBUTE
+# on a copy of the pane, and the embedded JSON blobs holding companyApplyUrl, which live outside
+# the pane, are appended. Returns null when the pane is not found.
+DETAIL_SNAPSHOT_SCRIPT = """
+var pane = document.querySelector(arguments[0]);
+if (!pane) { return null; }
+var copy = pane.cloneNode(true);
+arguments[1].forEach(function (selector) {
+  var live = pane.querySelectorAll(selector), copies = copy.querySelectorAll(selector);
+  for (var i = 0; i < live.length && i < copies.length; i++) {
+    if (!(live[i].offsetWidth || live[i].offsetHeight || live[i].getClientRects().length)) {
+      copies[i].setAttribute('%s', '');
+    }
+  }
+});
+var blobs = [];
+var codes = document.querySelectorAll('code');
+for (var j = 0; j < codes.length; j++) {
+  if (!pane.contains(codes[j]) && codes[j].textContent.indexOf('companyApplyUrl') !== -1) {
+    blobs.push(codes[j].outerHTML);
+  }
+}
+return copy.outerHTML + blobs.join('');
+""" % HIDDEN_ATTRIBUTE
+
+
+def element_text(element) -> str:
+    """Approximate the rendered text of an element: one line per block, whitespace collapsed."""
+    for br in element.find_all('br'):
+        br.replace_with('\n')
+    for block in element.find_all(BLOCK_TAGS):
+        block.insert_before('\n')
+        block.insert_after('\n')
+    lines = (' '.join(line.split()) for line in element.get_text().split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def clean_company_description(text: str) -> str:
+    """Drop the "show more" tail, redirect prefixes and extra whitespace from a company description."""
+    if '…' in text:
+        text = text.split('…')[0].strip()
+    text = ' '.join(text.split())
+    text = text.replace('https://www.linkedin.com/redir/suspicious-page?url=', '')
+    return text.strip()
+
+
+def section_list_text(soup, heading: str) -> Optional[str]:
+    """Text of the <ul> following a <strong> heading containing `heading`."""
+    for strong in soup.find_all('strong'):
+        if heading in strong.get_text():
+            section = strong.find_next_sibling('ul')
+            if section is not None:
+                return element_text(section)
+    return None
+
+
+def embedded_apply_url(texts) -> Optional[str]:
+    """First companyApplyUrl found in LinkedIn's embedded JSON blobs."""
+    for text in texts:
+        match = COMPANY_APPLY_URL.search(text)
+        if match:
+            try:
+                return json.loads(f'"{match.group(1)}"')
+            except ValueError:
+                return match.group(1)
+    return None
+
+
+def first_text(soup, selectors: List[str], require_visible: bool = False) -> Optional[str]:
+    """Text of the first element, across a fallback chain, that has any.
+
+    With require_visible, elements the snapshot script marked as not rendered are skipped, like the
+    visibility check of the other extraction modes.
+    """
+    for selector in selectors:
+        for element in soup.select(selector):
+            if require_visible and element.has_attr(HIDDEN_ATTRIBUTE):
+                continue
+            text = element_text(element)
+            if text:
+                return text
+    return None
+
+
+def parse_preferences(pills: List[str]) -> Dict[str, str]:
+    """Map preference pill labels to employment type, work mode and seniority level."""
+    fields = {}
+    for text in pills:
+        if any(emp_type in text for emp_type in EMPLOYMENT_TYPES):
+            fields['employment_type'] = text
+        if any(mode in text for mode in WORK_MODES):
+            fields['work_location_type'] = text
+        if any(keyword.lower() in text.lower() for keyword in SENIORITY_KEYWORDS):
+            fields['seniority_level'] = text
+    return fields
+
+
+def normalize_detail_fields(raw: Dict) -> Dict[str, str]:
+    """Turn raw detail pane values into job_data fields.
+
+    `raw` holds the field texts plus `preference_pills` (a list of labels) and `posted_text`
+    (the relative date, e.g. "3 days ago", left for calculate_posted_date). Empty values are dropped.
+    """
+    fields = {key: value for key, value in raw.items() if value and key != 'preference_pills'}
+    fields.update(parse_preferences(raw.get('preference_pills') or []))
+    if fields.get('comp_desc'):
+        fields['comp_desc'] = clean_company_description(fields['comp_desc'])
+        if not fields['comp_desc']:
+            del fields['comp_desc']
+    fields.setdefault('apply_button_label', 'Not Applicable')
+    return fields
+
+
+def parse_job_details(html: str, selectors: Dict[str, List[str]] = None) -> Dict[str, str]:
+    """Parse every job detail field from one HTML snapshot of the detail pane.
+
+    `selectors` overrides the fallback chains in DETAIL_SELECTORS, e.g. with a registry's ordering.
+    """
+    selectors = {**DETAIL_SELECTORS, **(selectors or {})}
+    soup = BeautifulSoup(html, 'lxml')
+    for tag in soup(['script', 'style', 'template']):
+        tag.decompose()
+
+    raw = {key: first_text(soup, selectors[key])
+           for key in ('job_title', 'company_name', 'job_location', 'full_job_description')}
+    raw['comp_desc'] = first_text(soup, selectors['comp_desc'], require_visible=True)
+    raw['preference_pills'] = [
+        element_text(pill) for selector in selectors['preference_pills'] for pill in soup.select(selector)
+    ]
+
+    spans = [element_text(span) for selector in selectors['salary'] for span in soup.select(selector)]
+    raw['salary_range'] = next((text for text in spans if '/yr' in text or '/hr' in text), None)
+
+    spans = [element_text(span) for selector in selectors['posted'] for span in soup.select(selector)]
+    raw['posted_text'] = next(
+        (text for text in spans if any(x in text.lower() for x in ['hour', 'day', 'month', 'ago'])), None
+    )
+
+    for selector in selectors['apply_button']:
+        apply_button = soup.select_one(selector)
+        if apply_button is not None:
+            raw['apply_button_label'] = element_text(apply_button)
+            break
+
+    for selector in selectors['apply_link']:
+        link = soup.select_one(selector)
+        if link is not None and link.get('href'):
+            raw['apply_link'] = link['href']
+            break
+    else:
+        raw['apply_link'] = embedded_apply_url(code.get_text() for code in soup.find_all('code'))
+
+    for selector in selectors['logo']:
+        logo = soup.select_one(selector)
+        if logo is not None and logo.get('src'):
+            raw['logo_url'] = logo['src']
+            break
+
+    raw['benefits'] = section_list_text(soup, 'Benefits')
+    raw['qualifications'] = section_list_text(soup, 'Qualifications')
+    return normalize_detail_fields(raw)
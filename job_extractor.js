@@ -0,0 +1,150 @@
+// In-page job extractor. Registered once per driver session by page_script.py and
+// called with the selector chains from job_detail_parser.DETAIL_SELECTORS.
+// __EXTRACTOR_VERSION__ is substituted when the script is loaded; bump
+// page_script.SCRIPT_VERSION whenever this file changes.
+(function (root) {
+  var VERSION = __EXTRACTOR_VERSION__;
+  if (root.__jobExtractor && root.__jobExtractor.version === VERSION) {
+    return;
+  }
+
+  function text(element) {
+    return element ? (element.innerText || element.textContent || '').trim() : '';
+  }
+
+  function visible(element) {
+    return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+  }
+
+  // First element across a fallback chain that has text, with the selector that matched
+  function first(scope, selectors, requireVisible) {
+    for (var i = 0; i < selectors.length; i++) {
+      var elements = scope.querySelectorAll(selectors[i]);
+      for (var j = 0; j < elements.length; j++) {
+        if (text(elements[j]) && (!requireVisible || visible(elements[j]))) {
+          return {element: elements[j], selector: selectors[i]};
+        }
+      }
+    }
+    return null;
+  }
+
+  // Every element matched by the first selector in the chain that matches anything
+  function all(scope, selectors) {
+    for (var i = 0; i < selectors.length; i++) {
+      var elements = scope.querySelectorAll(selectors[i]);
+      if (elements.length) {
+        return {elements: Array.prototype.slice.call(elements), selector: selectors[i]};
+      }
+    }
+    return {elements: [], selector: null};
+  }
+
+  function sectionList(heading) {
+    var headings = document.querySelectorAll('strong');
+    for (var i = 0; i < headings.length; i++) {
+      if (headings[i].textContent.indexOf(heading) === -1) {
+        continue;
+      }
+      var sibling = headings[i].nextElementSibling;
+      while (sibling && sibling.tagName !== 'UL') {
+        sibling = sibling.nextElementSibling;
+      }
+      if (sibling) {
+        return text(sibling);
+      }
+    }
+    return null;
+  }
+
+  // The offsite apply URL from the JSON LinkedIn embeds in <code> elements
+  function embeddedApplyUrl() {
+    var blobs = document.querySelectorAll('code');
+    for (var i = 0; i < blobs.length; i++) {
+      var match = /"companyApplyUrl"\s*:\s*("[^"]+")/.exec(blobs[i].textContent);
+      if (match) {
+        try {
+          return JSON.parse(match[1]);
+        } catch (e) {
+          return match[1].slice(1, -1);
+        }
+      }
+    }
+    return null;
+  }
+
+  function extractDetails(selectors) {
+    var fields = {};
+    var matched = {};
+
+    ['job_title', 'company_name', 'job_location', 'full_job_description'].forEach(function (key) {
+      var hit = first(document, selectors[key], false);
+      if (hit) {
+        fields[key] = text(hit.element);
+        matched[key] = hit.selector;
+      }
+    });
+
+    var companyDescription = first(document, selectors.comp_desc, true);
+    if (companyDescription) {
+      fields.comp_desc = text(companyDescription.element);
+      matched.comp_desc = companyDescription.selector;
+    }
+
+    var pills = all(document, selectors.preference_pills);
+    fields.preference_pills = pills.elements.map(text).filter(Boolean);
+    matched.preference_pills = pills.selector;
+
+    var salary = all(document, selectors.salary);
+    salary.elements.some(function (element) {
+      var value = text(element);
+      if (value.indexOf('/yr') !== -1 || value.indexOf('/hr') !== -1) {
+        fields.salary_range = value;
+        matched.salary = salary.selector;
+        return true;
+      }
+      return false;
+    });
+
+    var posted = all(document, selectors.posted);
+    posted.elements.some(function (element) {
+      var value = text(element);
+      if (/hour|day|month|ago/i.test(value)) {
+        fields.posted_text = value;
+        matched.posted = posted.selector;
+        return true;
+      }
+      return false;
+    });
+
+    var apply = all(document, selectors.apply_button);
+    if (apply.elements.length) {
+      fields.apply_button_label = text(apply.elements[0]);
+      matched.apply_button = apply.selector;
+    }
+
+    for (var i = 0; i < selectors.apply_link.length && !fields.apply_link; i++) {
+      var link = document.querySelector(selectors.apply_link[i]);
+      if (link && link.href) {
+        fields.apply_link = link.href;
+        matched.apply_link = selectors.apply_link[i];
+      }
+    }
+    if (!fields.apply_link) {
+      fields.apply_link = embeddedApplyUrl();
+    }
+
+    var logo = all(document, selectors.logo);
+    if (logo.elements.length && logo.elements[0].src) {
+      fields.logo_url = logo.elements[0].src;
+      matched.logo = logo.selector;
+    }
+
+    fields.benefits = sectionList('Benefits');
+    fields.qualifications = sectionList('Qualifications');
+
+    return {version: VERSION, fields: fields, matched: matched};
+  }
+
+  root.__jobExtractor = {version: VERSION, extractDetails: extractDetails};
+})(window);
@@ -0,0 +1,292 @@
+import logging
+from enum import Enum
+from typing import Dict, List, NamedTuple, Optional
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from config import EXTRACTION_CONFIG, JOB_VISIT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Reads every result card on the page in one round trip. Arguments: the job card selector and the
+# card_link, card_title and card_company chains. Returns one
+# {jobId, title, company, link, matched: {group: selector}} per card.
+CARD_HARVEST_SCRIPT = """
+function first(scope, selectors) {
+  for (var i = 0; i < selectors.length; i++) {
+    var element = scope.querySelector(selectors[i]);
+    if (element) { return {element: element, selector: selectors[i]}; }
+  }
+  return null;
+}
+function text(hit) {
+  return hit ? (hit.element.innerText || hit.element.textContent || '').trim() : null;
+}
+var cards = document.querySelectorAll(arguments[0]);
+var harvested = [];
+for (var i = 0; i < cards.length; i++) {
+  var card = cards[i];
+  var link = first(card, arguments[1]);
+  var title = first(card, arguments[2]);
+  var company = first(card, arguments[3]);
+  var anchor = (link && link.element.closest('a')) || card.querySelector('a[href*="/jobs/view/"], a[href*="currentJobId="]');
+  var href = anchor ? anchor.href : '';
+  var match = href.match(/\\/jobs\\/view\\/(\\d+)/) || href.match(/currentJobId=(\\d+)/);
+  var jobId = match ? match[1] : null;
+  if (!jobId) {
+    var tagged = card.matches('[data-job-id], [data-occludable-job-id]') ? card
+      : card.querySelector('[data-job-id], [data-occludable-job-id]');
+    jobId = tagged ? (tagged.getAttribute('data-job-id') || tagged.getAttribute('data-occludable-job-id')) : null;
+  }
+  harvested.push({
+    jobId: jobId,
+    title: text(title),
+    company: text(company),
+    link: href || null,
+    matched: {
+      card_link: link ? link.selector : null,
+      card_title: title ? title.selector : null,
+      card_company: company ? company.selector : null
+    }
+  });
+}
+return harvested;
+"""
+
+# Re-locates a harvested card's clickable element just before the click: by job id when the card
+# had one, else by position. Returns {selector, element} or null.
+CARD_LOCATE_SCRIPT = """
+var cards = document.querySelectorAll(arguments[0]), jobId = arguments[1], card = null;
+if (jobId) {
+  var tagged = '[data-job-id="' + jobId + '"], [data-occludable-job-id="' + jobId + '"]';
+  var linked = 'a[href*="/jobs/view/' + jobId + '"], a[href*="currentJobId=' + jobId + '"]';
+  for (var i = 0; i < cards.length && !card; i++) {
+    if (cards[i].matches(tagged) || cards[i].querySelector(tagged + ', ' + linked)) { card = cards[i]; }
+  }
+} else {
+  card = cards[arguments[2]] || null;
+}
+if (!card) { return null; }
+for (var j = 0; j < arguments[3].length; j++) {
+  var element = card.querySelector(arguments[3][j]);
+  if (element) { return {selector: arguments[3][j], element: element}; }
+}
+return null;
+"""
+
+# Reads what the detail pane currently shows once its description is present, else returns null.
+# Arguments: the description selector and the pane_job_link, job_title and company_name chains.
+# Returns {jobId, selector, title, company}: jobId and the matching selector come from the pane's
+# own job link (the currentJobId URL parameter changes on click, before the pane re-renders); title
+# and company are read for the fallback check when no link selector matches.
+DETAIL_PANE_JOB_ID_SCRIPT = """
+function text(selectors) {
+  for (var i = 0; i < selectors.length; i++) {
+    var element = document.querySelector(selectors[i]);
+    if (element) { return (element.innerText || element.textContent || '').trim(); }
+  }
+  return null;
+}
+if (!document.querySelector(arguments[0])) { return null; }
+for (var i = 0; i < arguments[1].length; i++) {
+  var link = document.querySelector(arguments[1][i]);
+  var match = link ? (link.getAttribute('href') || '').match(/\\/jobs\\/view\\/(\\d+)/) : null;
+  if (match) { return {jobId: match[1], selector: arguments[1][i], title: null, company: null}; }
+}
+return {jobId: null, selector: null, title: text(arguments[2]), company: text(arguments[3])};
+"""
+
+
+class JobCard(NamedTuple):
+    """What the results list shows for one job, harvested before any card is clicked."""
+    index: int
+    job_id: Optional[str]
+    title: Optional[str]
+    company: Optional[str]
+    link: Optional[str]
+
+
+def harvest_cards(driver, registry, card_selector: str) -> List[JobCard]:
+    """Read job id, title, company and link for every card on the page in one script call."""
+    groups = ('card_link', 'card_title', 'card_company')
+    chains = registry.ordered_groups(groups)
+    harvested = driver.execute_script(
+        CARD_HARVEST_SCRIPT, card_selector, chains['card_link'], chains['card_title'], chains['card_company']
+    ) or []
+    cards = []
+    for index, card in enumerate(harvested):
+        for group in groups:
+            registry.record(group, card['matched'][group], chains[group])
+        cards.append(JobCard(index, card['jobId'], card['title'], card['company'], card['link']))
+    return cards
+
+
+class VisitState(Enum):
+    CARD = 'card'
+    SKIPPED = 'skipped'
+    CLICKED = 'clicked'
+    READY = 'ready'
+    EXTRACTED = 'extracted'
+    FAILED = 'failed'
+
+
+TRANSITIONS = {
+    VisitState.CARD: {VisitState.CLICKED, VisitState.SKIPPED, VisitState.FAILED},
+    VisitState.CLICKED: {VisitState.READY, VisitState.FAILED},
+    VisitState.READY: {VisitState.EXTRACTED, VisitState.FAILED},
+    VisitState.SKIPPED: set(),
+    VisitState.EXTRACTED: set(),
+    VisitState.FAILED: set()
+}
+
+
+def same_text(card_text: Optional[str], pane_text: Optional[str]) -> bool:
+    """Loose match between card and pane text; cards can add suffixes such as "with verification"."""
+    card_text = ' '.join((card_text or '').lower().split())
+    pane_text = ' '.join((pane_text or '').lower().split())
+    return bool(card_text and pane_text) and (pane_text in card_text or card_text in pane_text)
+
+
+class DetailPaneShows:
+    """Expected condition: the detail pane has loaded and shows the given card's job.
+
+    The pane's job link (a registry chain) identifies the job it shows. For a card without a job id,
+    a pane is accepted once it shows any job other than the one extracted before, whose content may
+    still be on screen. When no link selector matches at all, the pane's title and company are
+    compared with the card's instead. `pane_job_id` and `link_selector` hold what was accepted.
+    """
+
+    def __init__(self, card: JobCard, previous_job_id: Optional[str] = None, chains: Dict[str, List[str]] = None):
+        self.card = card
+        self.job_id = card.job_id
+        self.previous_job_id = previous_job_id
+        self.chains = chains
+        self.pane_job_id = None
+        self.link_selector = None
+
+    def __call__(self, driver):
+        pane = driver.execute_script(
+            DETAIL_PANE_JOB_ID_SCRIPT,
+            JOB_VISIT_CONFIG['description_selector'],
+            self.chains['pane_job_link'],
+            self.chains['job_title'],
+            self.chains['company_name']
+        )
+        if not pane:
+            return False
+        if not pane['jobId']:
+            return self.matches_card(pane)
+        if self.job_id is not None and pane['jobId'] != self.job_id:
+            return False
+        # Without a card id the pane's id is adopted, but never the previous job's
+        if self.job_id is None and pane['jobId'] == self.previous_job_id:
+            return False
+        self.pane_job_id = pane['jobId']
+        self.link_selector = pane['selector']
+        return True
+
+    def matches_card(self, pane: Dict) -> bool:
+        """Fallback when the pane has no recognisable job link: title and company must match the card."""
+        if not same_text(self.card.title, pane.get('title')):
+            return False
+        if self.card.company and pane.get('company') and not same_text(self.card.company, pane['company']):
+            return False
+        self.pane_job_id = self.job_id
+        return True
+
+
+class JobVisit:
+    """Card -> detail -> extract for one search result: one click, one readiness wait, one extraction."""
+
+    def __init__(self, scraper, card: JobCard, card_selector: str):
+        self.scraper = scraper
+        self.driver = scraper.driver
+        self.card = card
+        self.card_selector = card_selector
+        self.state = VisitState.CARD
+        self.job_id = card.job_id
+        self.job_title = card.title or f"Job {card.index + 1}"
+        self.error = None
+
+    def advance(self, state: VisitState, error: str = None):
+        if state not in TRANSITIONS[self.state]:
+            raise RuntimeError(f"Invalid job visit transition {self.state.value} -> {state.value}")
+        self.state = state
+        if error:
+            self.error = error
+            logger.error(f"Job visit failed for {self.job_title}: {error}")
+
+    def skip(self, reason: str = "extracted recently"):
+        """CARD -> SKIPPED: the job is already stored and fresh, or another worker has it, so it is not opened."""
+        self.advance(VisitState.SKIPPED)
+        logger.info(f"Job {self.job_id}: {reason}, skipping the detail visit")
+
+    def run(self, domain: str, software: str) -> Optional[Dict]:
+        """Drive the visit to EXTRACTED and return job_data, or None if it FAILED."""
+        commands_before = self.scraper.command_counter.total
+        if self.click():
+            self.wait_until_ready()
+        job_data = self.extract(domain, software) if self.state == VisitState.READY else None
+
+        commands = self.scraper.command_counter.total - commands_before
+        self.scraper.command_counter.record_job(EXTRACTION_CONFIG['mode'], commands)
+        logger.info(f"Job {self.job_id}: {commands} WebDriver commands, visit ended {self.state.value}")
+        return job_data
+
+    def click(self) -> bool:
+        """CARD -> CLICKED: re-locate the card by job id, scroll to it and click it once."""
+        registry = self.scraper.selector_registry
+        selectors = registry.ordered('card_link')
+        located = self.driver.execute_script(
+            CARD_LOCATE_SCRIPT, self.card_selector, self.job_id, self.card.index, selectors
+        )
+        registry.record('card_link', located['selector'] if located else None, selectors)
+        if not located:
+            self.advance(VisitState.FAILED, "card is no longer in the results list")
+            return False
+
+        print(f"\nProcessing job: {self.job_title}")
+
+        element = located['element']
+        self.scraper.natural_scroll(element)
+        self.scraper.random_delay(1, 2)
+        try:
+            self.scraper.paced_click(element)
+        except Exception:
+            try:
+                self.driver.execute_script("arguments[0].click();", element)
+            except Exception:
+                webdriver.ActionChains(self.driver).move_to_element(element).click().perform()
+        self.advance(VisitState.CLICKED)
+        return True
+
+    def wait_until_ready(self) -> bool:
+        """CLICKED -> READY once the detail pane shows this card's job, so stale content is never read."""
+        registry = self.scraper.selector_registry
+        chains = registry.ordered_groups(('pane_job_link', 'job_title', 'company_name'))
+        condition = DetailPaneShows(self.card, self.scraper.last_pane_job_id, chains)
+        try:
+            WebDriverWait(
+                self.driver,
+                JOB_VISIT_CONFIG['ready_timeout'],
+                poll_frequency=JOB_VISIT_CONFIG['ready_poll_interval']
+            ).until(condition)
+        except TimeoutException:
+            self.advance(VisitState.FAILED, f"detail pane did not show job {self.job_id}")
+            return False
+        registry.record('pane_job_link', condition.link_selector, chains['pane_job_link'])
+        if not condition.link_selector:
+            logger.warning(f"Job {self.job_id}: no pane job link matched, accepted the pane on title and company")
+        self.job_id = condition.pane_job_id
+        self.scraper.last_pane_job_id = self.job_id
+        self.advance(VisitState.READY)
+        return True
+
+    def extract(self, domain: str, software: str) -> Optional[Dict]:
+        """READY -> EXTRACTED: read the detail pane once."""
+        job_data = self.scraper.extract_job_details(self.job_id, domain, software)
+        if job_data is None:
+            self.advance(VisitState.FAILED, "extraction failed")
+            return None
+        self.advance(VisitState.EXTRACTED)
+        return job_data
@@ -0,0 +1,337 @@
+import time
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure
+from pymongo.write_concern import WriteConcern
+from config import JOB_WRITER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Scraped fields that make up a job's content hash. LLM output and bookkeeping
+# fields (dates, flags, search ids) are left out so they never register as a change.
+CONTENT_HASH_FIELDS = (
+    'job_title',
+    'company_name',
+    'job_location',
+    'employment_type',
+    'salary_range',
+    'work_location_type',
+    'apply_button_label',
+    'apply_url',
+    'seniority_level',
+    'comp_desc',
+    'full_job_description',
+    'domain_name',
+    'software_name'
+)
+
+
+# Scraped fields outside the hash that an unchanged job still takes from the latest visit:
+# a repost moves posted_date and a logo may only be stored on a later visit
+TOUCH_REFRESH_FIELDS = ('posted_date', 'c_logo')
+
+# Apply button labels that have no external apply URL
+NO_APPLY_URL_LABELS = ('Easy Apply', 'Not Applicable')
+
+
+def hash_value(value):
+    """Field value as hashed: text with its whitespace collapsed, so extraction modes that lay out
+    the same text differently (innerText, Selenium's .text, a parsed snapshot) hash alike."""
+    return ' '.join(value.split()) if isinstance(value, str) else value
+
+
+def compute_content_hash(job_data: Dict) -> str:
+    """Return a stable hash of a job's scraped fields."""
+    content = {field: hash_value(job_data.get(field)) for field in CONTENT_HASH_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class BulkJobWriter:
+    """Buffer job records and flush them to MongoDB as unordered bulk upserts."""
+
+    def __init__(self, collection, history_collection=None, max_batch_size: int = None,
+                 max_buffer_age: float = None, write_concern: Optional[Dict] = None):
+        if max_batch_size is None:
+            max_batch_size = JOB_WRITER_CONFIG['max_batch_size']
+        if max_buffer_age is None:
+            max_buffer_age = JOB_WRITER_CONFIG['max_buffer_age']
+        if write_concern is None:
+            write_concern = {
+                'w': JOB_WRITER_CONFIG['write_concern_w'],
+                'j': JOB_WRITER_CONFIG['write_concern_journal']
+            }
+
+        self.write_concern = WriteConcern(**write_concern)
+        self.max_batch_size = max_batch_size
+        self.max_buffer_age = max_buffer_age
+
+        # Buffered records keyed by job_id so a job seen twice before a flush is only written once
+        self._buffer: Dict[str, Dict] = {}
+        self._oldest_buffered_at = None
+        self._lock = threading.RLock()
+        self.bind(collection, history_collection)
+
+        # Running totals across all flushes
+        self.totals = {'inserted': 0, 'modified': 0, 'unchanged': 0, 'failed': 0}
+
+    def bind(self, collection, history_collection=None):
+        """Point the writer at (possibly reconnected) collections; waits for a flush in progress."""
+        with self._lock:
+            self.collection = collection.with_options(write_concern=self.write_concern)
+            self.history_collection = history_collection
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def add(self, job_data: Dict) -> Optional[Dict]:
+        """Buffer a job record and flush if the size or age limit is reached."""
+        with self._lock:
+            if not self._buffer:
+                self._oldest_buffered_at = time.monotonic()
+            self._buffer[job_data['job_id']] = job_data
+
+            if self.should_flush():
+                return self.flush()
+            return None
+
+    def should_flush(self) -> bool:
+        """Check whether the buffer has reached its size or age limit."""
+        with self._lock:
+            if not self._buffer:
+                return False
+            if len(self._buffer) >= self.max_batch_size:
+                return True
+            return time.monotonic() - self._oldest_buffered_at >= self.max_buffer_age
+
+    def flush_if_due(self) -> Optional[Dict]:
+        """Flush only if the size or age limit has been reached."""
+        with self._lock:
+            if self.should_flush():
+                return self.flush()
+            return None
+
+    def build_touch_operation(self, job_data: Dict, seen_at: str) -> UpdateOne:
+        """Build the operation that only marks an unchanged job as seen.
+
+        The job was still extracted again, so its extract_date moves forward and the incremental
+        refresh TTL starts over. posted_date and c_logo are refreshed without counting as a change.
+        """
+        fields = {
+            "seen": True,
+            "active": True,
+            "content_hash": job_data['content_hash'],
+            "last_seen_run": job_data.get('last_seen_run'),
+            "last_seen_at": seen_at
+        }
+        if job_data.get('extract_date'):
+            fields['extract_date'] = job_data['extract_date']
+        for field in TOUCH_REFRESH_FIELDS:
+            # A value this visit failed to read never replaces a stored one
+            if job_data.get(field) not in (None, 'Not Applicable'):
+                fields[field] = job_data[field]
+        return UpdateOne(
+            {"job_id": job_data['job_id']},
+            {
+                "$set": fields,
+                "$addToSet": {"search_ids": job_data.get('search_id')}
+            }
+        )
+
+    def build_upsert_operation(self, job_data: Dict, seen_at: str, upsert: bool = True) -> UpdateOne:
+        """Build the operation that writes a new or changed job in full.
+
+        search_id keeps the search that first found the job; every search that sees it is added to search_ids.
+        """
+        fields = {k: v for k, v in job_data.items() if k not in ('_id', 'search_id')}
+        fields['seen'] = True
+        fields['active'] = True
+        fields['last_seen_at'] = seen_at
+        return UpdateOne(
+            {"job_id": job_data['job_id']},
+            {
+                "$set": fields,
+                "$setOnInsert": {"search_id": job_data.get('search_id')},
+                "$addToSet": {"search_ids": job_data.get('search_id')},
+                # Changed content goes back to the enrichment queue, even if it was in a submitted batch,
+                # with a fresh set of attempts
+                "$unset": {"llm_batch_id": "", "llm_attempts": ""}
+            },
+            upsert=upsert
+        )
+
+    def build_history_entry(self, previous: Dict, job_data: Dict, replaced_at: str) -> Optional[Dict]:
+        """Build a compact record of the fields a changed job is about to overwrite."""
+        changes = {
+            field: previous.get(field)
+            for field in CONTENT_HASH_FIELDS
+            if hash_value(previous.get(field)) != hash_value(job_data.get(field))
+        }
+        if not changes:
+            return None
+        return {
+            "job_id": job_data['job_id'],
+            "content_hash": previous.get('content_hash'),
+            "replaced_by": job_data['content_hash'],
+            "replaced_at": replaced_at,
+            "changes": changes
+        }
+
+    def classify(self, records: List[Dict]) -> Dict[str, Dict]:
+        """Look up the stored content hash and apply URL of every buffered job in one query."""
+        job_ids = [job_data['job_id'] for job_data in records]
+        return {
+            doc['job_id']: doc
+            for doc in self.collection.find(
+                {"job_id": {"$in": job_ids}}, {"job_id": 1, "content_hash": 1, "apply_url": 1}
+            )
+        }
+
+    def keep_stored_apply_url(self, job_data: Dict, stored: Optional[Dict]):
+        """Keep a stored apply URL when this visit failed to resolve one.
+
+        A failed or timed-out resolution must not register as a content change: that would rewrite the
+        job, add a history entry and reset its LLM fields.
+        """
+        unresolved = job_data.pop('apply_url_unresolved', False)
+        if not stored or stored.get('apply_url') in (None, 'Not Applicable'):
+            return
+        link_missing = (
+            job_data.get('apply_url') == 'Not Applicable'
+            and job_data.get('apply_button_label') not in NO_APPLY_URL_LABELS
+        )
+        if unresolved or link_missing:
+            job_data['apply_url'] = stored['apply_url']
+
+    def flush(self) -> Dict:
+        """Write all buffered records in one unordered bulk_write and report the counts."""
+        with self._lock:
+            return self._flush()
+
+    def retry_as_updates(self, records: List[Dict], indexes: List[int], seen_at: str) -> List[int]:
+        """Write jobs whose upsert lost an insert race (another worker stored them first) as plain updates.
+
+        Returns the indexes that still failed.
+        """
+        operations = [self.build_upsert_operation(records[index], seen_at, upsert=False) for index in indexes]
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+            logger.info(f"Rewrote {len(indexes)} jobs stored concurrently by another worker")
+            return []
+        except BulkWriteError as e:
+            failed = []
+            for error in e.details.get('writeErrors', []):
+                index = indexes[error['index']]
+                failed.append(index)
+                logger.error(f"Failed to write job {records[index].get('job_id')}: {error.get('errmsg')}")
+            return failed
+
+    def _flush(self) -> Dict:
+        counts = {'inserted': 0, 'modified': 0, 'unchanged': 0, 'failed': 0}
+        if not self._buffer:
+            return counts
+
+        records: List[Dict] = list(self._buffer.values())
+        stored = self.classify(records)
+        for job_data in records:
+            self.keep_stored_apply_url(job_data, stored.get(job_data['job_id']))
+            job_data['content_hash'] = compute_content_hash(job_data)
+
+        seen_at = datetime.now().isoformat()
+        stored_hashes = {job_id: doc.get('content_hash') for job_id, doc in stored.items()}
+
+        # Previous versions of changed jobs, fetched only when there is history to record
+        changed_ids = [
+            job_data['job_id'] for job_data in records
+            if stored_hashes.get(job_data['job_id']) not in (None, job_data['content_hash'])
+        ]
+        previous_versions = {}
+        if changed_ids:
+            projection = {field: 1 for field in CONTENT_HASH_FIELDS}
+            projection.update({"job_id": 1, "content_hash": 1})
+            previous_versions = {
+                doc['job_id']: doc
+                for doc in self.collection.find({"job_id": {"$in": changed_ids}}, projection)
+            }
+        # A hash stored before whitespace was normalized differs even when the text has not changed;
+        # rehashing the stored fields tells the two apart
+        new_hashes = {job_data['job_id']: job_data['content_hash'] for job_data in records}
+        rehashed = {
+            job_id for job_id, previous in previous_versions.items()
+            if compute_content_hash(previous) == new_hashes[job_id]
+        }
+
+        operations = []
+        categories = []
+        for job_data in records:
+            job_id = job_data['job_id']
+            if job_id not in stored_hashes:
+                operations.append(self.build_upsert_operation(job_data, seen_at))
+                categories.append('inserted')
+            elif stored_hashes[job_id] == job_data['content_hash'] or job_id in rehashed:
+                operations.append(self.build_touch_operation(job_data, seen_at))
+                categories.append('unchanged')
+            else:
+                operations.append(self.build_upsert_operation(job_data, seen_at))
+                categories.append('modified')
+
+        failed_indexes = set()
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+            self._buffer = {}
+            self._oldest_buffered_at = None
+        except BulkWriteError as e:
+            self._buffer = {}
+            self._oldest_buffered_at = None
+            # Unordered writes keep going past individual failures, so report what did land
+            duplicates = []
+            for error in e.details.get('writeErrors', []):
+                if error.get('code') == DUPLICATE_KEY_ERROR:
+                    duplicates.append(error['index'])
+                    continue
+                failed_indexes.add(error['index'])
+                failed_job = records[error['index']]
+                logger.error(f"Failed to write job {failed_job.get('job_id')}: {error.get('errmsg')}")
+            if duplicates:
+                failed_indexes.update(self.retry_as_updates(records, duplicates, seen_at))
+                for index in duplicates:
+                    if categories[index] == 'inserted':
+                        categories[index] = 'modified'
+        except ConnectionFailure:
+            # Keep the buffer so the flush can be retried once the connection is back
+            logger.error(f"Connection lost while flushing {len(records)} jobs, keeping them buffered")
+            raise
+
+        history = []
+        for index, (job_data, category) in enumerate(zip(records, categories)):
+            if index in failed_indexes:
+                counts['failed'] += 1
+                continue
+            counts[category] += 1
+            previous = previous_versions.get(job_data['job_id'])
+            if category == 'modified' and previous:
+                entry = self.build_history_entry(previous, job_data, seen_at)
+                if entry:
+                    history.append(entry)
+
+        if history:
+            try:
+                self.history_collection.insert_many(history, ordered=False)
+            except Exception as e:
+                logger.error(f"Failed to record job history: {str(e)}")
+
+        for key, value in counts.items():
+            self.totals[key] += value
+
+        logger.info(
+            f"Flushed {len(records)} jobs to MongoDB: {counts['inserted']} inserted, "
+            f"{counts['modified']} modified, {counts['unchanged']} unchanged, {counts['failed']} failed"
+        )
+        return counts
@@ -0,0 +1,155 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from config import INCREMENTAL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class KnownJobIndex:
+    """In-memory job_id -> extract_date index for skipping jobs that were extracted recently.
+
+    Jobs found fresh, and jobs already extracted by another search of this run, are not visited;
+    they are only stamped as seen by this run and tagged with the search, in batches, so the
+    inactive sweep still treats them as present.
+    """
+
+    def __init__(self, collection=None, refresh_ttl_hours: float = None, batch_size: int = None, claims_collection=None):
+        self.collection = collection
+        # run_id/job_id claims shared by the worker processes of a run
+        self.claims_collection = claims_collection
+        self.refresh_ttl = timedelta(hours=refresh_ttl_hours or INCREMENTAL_CONFIG['refresh_ttl_hours'])
+        self.batch_size = batch_size or INCREMENTAL_CONFIG['seen_batch_size']
+        self.extract_dates: Dict[str, Optional[datetime]] = {}
+        self.loaded = False
+        # Job ids extracted by any search of this run; kept across load() calls
+        self.run_job_ids: Set[str] = set()
+        self._seen: List[str] = []
+        self.reset_stats()
+
+    def bind(self, collection, claims_collection=None):
+        self.collection = collection
+        self.claims_collection = claims_collection
+
+    def load(self):
+        """Read every stored job id and its extract date, once per run.
+
+        Later searches reuse the index: add() records every job the run extracts, and jobs skipped
+        as fresh keep their extract date.
+        """
+        if self.loaded:
+            return
+        extract_dates = {}
+        for doc in self.collection.find({}, {"_id": 0, "job_id": 1, "extract_date": 1}):
+            extract_dates[doc['job_id']] = self.parse_date(doc.get('extract_date'))
+        self.extract_dates = extract_dates
+        self.loaded = True
+        logger.info(f"Loaded {len(self.extract_dates)} known job ids")
+
+    def load_run(self, run_id: str):
+        """Seed the run's job ids from jobs already stamped by this run: before an interruption, or by another worker."""
+        for doc in self.collection.find({"last_seen_run": run_id}, {"_id": 0, "job_id": 1, "extract_date": 1}):
+            self.run_job_ids.add(doc['job_id'])
+            if self.loaded:
+                # Keep the once-per-run index current with what other workers extracted since it was loaded
+                self.extract_dates[doc['job_id']] = self.parse_date(doc.get('extract_date'))
+        logger.info(f"Run {run_id} has already seen {len(self.run_job_ids)} jobs")
+
+    def claim(self, job_id: Optional[str], run_id: str, owner: int) -> bool:
+        """Atomically claim a job's detail visit for this run; False if another worker claimed it first."""
+        if not job_id or self.claims_collection is None:
+            return True
+        try:
+            previous = self.claims_collection.find_one_and_update(
+                {"run_id": run_id, "job_id": job_id},
+                {"$setOnInsert": {"owner": owner, "claimed_at": datetime.now()}},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            # Two upserts raced and the other one inserted the claim
+            previous = {"owner": None}
+        if previous is None or previous.get('owner') == owner:
+            return True
+        self.run_job_ids.add(job_id)
+        self.stats['duplicates'] += 1
+        return False
+
+    def release_claims(self, run_id: str) -> int:
+        """Drop a resumed run's claims on jobs that never reached MongoDB, so they are visited again."""
+        if self.claims_collection is None:
+            return 0
+        result = self.claims_collection.delete_many(
+            {"run_id": run_id, "job_id": {"$nin": list(self.run_job_ids)}}
+        )
+        logger.info(f"Released {result.deleted_count} claims of run {run_id} on jobs that were never stored")
+        return result.deleted_count
+
+    def reset_stats(self):
+        self.stats = {'skipped': 0, 'duplicates': 0, 'stale': 0, 'new': 0}
+
+    @staticmethod
+    def parse_date(value) -> Optional[datetime]:
+        if isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+
+    def should_skip(self, job_id: Optional[str], incremental: bool) -> bool:
+        """True for a job this run already extracted, or, in incremental mode, one extracted recently."""
+        if job_id and job_id in self.run_job_ids:
+            self.stats['duplicates'] += 1
+            return True
+        return incremental and self.is_fresh(job_id)
+
+    @property
+    def skipped(self) -> int:
+        return self.stats['skipped'] + self.stats['duplicates']
+
+    def is_fresh(self, job_id: Optional[str]) -> bool:
+        """True if the job is known and was extracted within the refresh TTL; counts the outcome."""
+        if not job_id or job_id not in self.extract_dates:
+            self.stats['new'] += 1
+            return False
+        extract_date = self.extract_dates[job_id]
+        if extract_date is None or datetime.now() - extract_date >= self.refresh_ttl:
+            self.stats['stale'] += 1
+            return False
+        self.stats['skipped'] += 1
+        return True
+
+    def add(self, job_id: str, extract_date: str):
+        """Record a job extracted during this run so a repeat card, in any search, is skipped."""
+        self.extract_dates[job_id] = self.parse_date(extract_date)
+        self.run_job_ids.add(job_id)
+
+    def mark_seen(self, job_id: str, search_id: str, run_id: str):
+        """Queue a seen stamp for a skipped job; flushes once the batch is full."""
+        self._seen.append(job_id)
+        if len(self._seen) >= self.batch_size:
+            self.flush(search_id, run_id)
+
+    def flush(self, search_id: str, run_id: str) -> int:
+        """Stamp all queued jobs as seen by this run and add the search to their search_ids, in one update."""
+        if not self._seen:
+            return 0
+        job_ids = self._seen
+        result = self.collection.update_many(
+            {"job_id": {"$in": job_ids}},
+            {
+                "$set": {
+                    "seen": True,
+                    "active": True,
+                    "last_seen_run": run_id,
+                    "last_seen_at": datetime.now().isoformat()
+                },
+                "$addToSet": {"search_ids": search_id}
+            }
+        )
+        self._seen = []
+        logger.info(f"Marked {len(job_ids)} known jobs as seen for search_id: {search_id}")
+        return result.modified_count
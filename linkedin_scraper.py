@@ -1,11 +1,13 @@
 import os
 import time
+import shutil
+import tempfile
 import random
 import logging
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from urllib.parse import urlparse
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, urljoin
 from dotenv import load_dotenv
 from fake_useragent import UserAgent
 from selenium import webdriver
@@ -22,12 +24,14 @@ from selenium.common.exceptions import (
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.keys import Keys
 from openai import OpenAI
-import requests
+from async_llm_client import AsyncLLMClient
 import json
+import uuid
 import base64
-from pymongo import MongoClient
+from bson import ObjectId
 from pymongo.errors import ConnectionFailure
 import sys
+import argparse
 from config import (
     GENERAL_DELAYS,
     LOGIN_DELAYS,
@@ -39,13 +43,41 @@ from config import (
     SESSION_DELAYS,
     MOUSE_DELAYS,
     TIMEOUTS,
-    RETRY_CONFIG
+    RETRY_CONFIG,
+    LLM_CACHE_CONFIG,
+    ENRICHMENT_CONFIG,
+    RULE_EXTRACTION_CONFIG,
+    EXTRACTION_CONFIG,
+    SELECTOR_REGISTRY_CONFIG,
+    APPLY_URL_CONFIG,
+    INCREMENTAL_CONFIG,
+    SEARCH_URL_CONFIG,
+    SCHEDULER_CONFIG,
+    WORKER_POOL_CONFIG,
+    LLM_RATE_LIMIT_CONFIG
 )
+from job_writer import BulkJobWriter
+from mongo_connection import MongoConnectionManager
+from persistence_worker import PersistenceWorker
+from llm_cache import LLMFieldCache
+from llm_extractor import JobFieldExtractor, LLM_PROMPT_VERSION
+from rule_extractor import RuleBasedExtractor
+from job_detail_parser import parse_job_details, DETAIL_SELECTORS, DETAIL_SNAPSHOT_SCRIPT
+from page_script import InPageExtractor
+from selector_registry import SelectorRegistry
+from job_visit import JobVisit, VisitState, harvest_cards
+from apply_url_resolver import ApplyUrlResolver
+from logo_store import LogoStore
+from known_jobs import KnownJobIndex
+from search_urls import LocationCache, build_search_url, last_page, parse_results_count
+from run_checkpoint import RunCheckpoint, SearchProgress
+from recrawl_scheduler import RecrawlScheduler
+from driver_metrics import WebDriverCommandCounter
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler('scraper.log'),
         logging.StreamHandler()
@@ -54,16 +86,34 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class LinkedInScraper:
-    def __init__(self):
-        """Initialize the LinkedIn scraper with configuration."""
+    def __init__(self, worker_index: int = 0, worker_count: int = 1, rate_limiter=None, start_browser: bool = True):
+        """Initialize the LinkedIn scraper with configuration.
+
+        In a worker pool each worker process builds its own scraper (own browser and MongoDB client),
+        paces its page loads and clicks through the pool's shared rate_limiter and takes an equal
+        share of the OpenAI rate limits. The pool coordinator builds one without a browser.
+        """
         load_dotenv()
+        self.worker_index = worker_index
+        self.worker_count = worker_count
+        self.rate_limiter = rate_limiter
         self.email = os.getenv('LINKEDIN_EMAIL')
         self.password = os.getenv('LINKEDIN_PASSWORD')
         self.base_url = "https://www.linkedin.com"
         self.jobs_url = f"{self.base_url}/jobs"
         self.driver = None
+        # Proxy auth extension files, in a directory of this process's own
+        self.plugin_dir = None
+        # Job id the detail pane last showed, so a stale pane is never mistaken for the next job's
+        self.last_pane_job_id = None
         self.ua = UserAgent()
-        self.openai_client = OpenAI(api_key="your_api_key")
+        self.openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY', 'your_api_key'))
+        # Rate-limited client used for the chat-completions calls themselves
+        self.llm_client = AsyncLLMClient(
+            api_key=os.getenv('OPENAI_API_KEY', 'your_api_key'),
+            requests_per_minute=LLM_RATE_LIMIT_CONFIG['requests_per_minute'] // worker_count,
+            tokens_per_minute=LLM_RATE_LIMIT_CONFIG['tokens_per_minute'] // worker_count
+        )
         
         # ProxyMesh configuration
         self.proxy_username = "yourusername"
@@ -72,66 +122,138 @@ class LinkedInScraper:
             "proxy_1",
             "proxy_2"
         ]
-        self.current_proxy_index = 0
+        # Workers start at different proxies
+        self.current_proxy_index = worker_index % len(self.proxy_list)
         self.proxy_rotation_interval = random.randint(100, 150)  # Rotate every 100-150 jobs
         
         # MongoDB configuration
         try:
             logger.info("Initializing MongoDB connection...")
-            self.mongo_client = MongoClient('mongodb://localhost:27017/', serverSelectionTimeoutMS=5000)
-            self.db = self.mongo_client['linkedin_jobs']
-            self.collection = self.db['jobdetails']
-            self.search_criteria_collection = self.db['search_criteria']
-            
-            # Check MongoDB connection
-            if not self.check_mongodb_connection():
-                raise Exception("Failed to connect to MongoDB")
-            
-            # Create indexes
-            self.collection.create_index("job_id", unique=True)
-            self.collection.create_index("search_id")
-            self.search_criteria_collection.create_index([("job_title", 1), ("location", 1), ("software", 1)], unique=True)
-            logger.info("MongoDB indexes created successfully")
+            self.mongo = MongoConnectionManager(on_reconnect=self.bind_collections)
+            self.mongo.connect()
+            self.bind_collections()
+
+            # Create indexes once at startup
+            self.mongo.ensure_indexes({
+                'jobdetails': [
+                    ("job_id", {'unique': True}),
+                    ("search_id", {}),
+                    ([("search_id", 1), ("last_seen_run", 1)], {}),
+                    ([("search_ids", 1), ("last_seen_run", 1)], {}),
+                    ("llm_converted", {})
+                ],
+                'jobdetails_history': [
+                    ([("job_id", 1), ("replaced_at", -1)], {})
+                ],
+                'search_criteria': [
+                    ([("job_title", 1), ("location", 1), ("software", 1)], {'unique': True})
+                ],
+                'llm_field_cache': [
+                    ("last_used_at", {})
+                ],
+                'scrape_checkpoints': [
+                    ([("search_id", 1), ("started_at", -1)], {})
+                ],
+                'search_runs': [
+                    ([("search_id", 1), ("started_at", -1)], {})
+                ],
+                'run_claims': [
+                    ([("run_id", 1), ("job_id", 1)], {'unique': True}),
+                    ("claimed_at", {'expireAfterSeconds': WORKER_POOL_CONFIG['claim_retention_days'] * 86400})
+                ]
+            })
+
+            # Buffered writer for job records
+            self.job_writer = BulkJobWriter(self.collection, self.history_collection)
+            # Stored job ids for incremental mode, loaded by the first search of the run
+            self.known_jobs = KnownJobIndex(self.collection, claims_collection=self.db['run_claims'])
+            # Location -> geoId learned from form searches, so later searches open results by URL
+            self.location_cache = LocationCache(self.db['search_locations'])
+            # Per-search progress of the current run, for --resume
+            self.checkpoint = RunCheckpoint(self.db['scrape_checkpoints'], self.collection)
+            # Per-search yield history deciding which searches to crawl and how deep
+            self.scheduler = RecrawlScheduler(self.db['search_runs'])
+
+            # Cache of OpenAI extractions keyed by description content
+            self.llm_cache = None
+            if LLM_CACHE_CONFIG['enabled']:
+                self.llm_cache = LLMFieldCache(self.db['llm_field_cache'], LLM_PROMPT_VERSION)
+            rules = RuleBasedExtractor() if RULE_EXTRACTION_CONFIG['enabled'] else None
+            self.field_extractor = JobFieldExtractor(
+                self.openai_client, self.llm_cache, rules=rules, llm=self.llm_client
+            )
+
+            # Selector fallback chains ordered by hit rates from previous runs
+            self.selector_registry = SelectorRegistry(self.db['selector_stats'])
+            self.selector_registry.load()
+
+            # External apply links are resolved over HTTP off the browser thread
+            self.apply_resolver = ApplyUrlResolver(self.db['apply_urls'], pace=self.pace)
+            self.logo_store = LogoStore(self.db['logos'])
+
+            # Persistence runs on its own thread so the browser never waits on it
+            self.persistence = PersistenceWorker(self.persist_job, on_idle=self.flush_jobs_if_due)
                 
         except Exception as e:
             logger.error(f"MongoDB initialization failed: {str(e)}")
             raise
         
-        self.setup_driver()
+        # Generation id stamped on every job seen during this scrape run
+        self.run_id = None
+
+        # Counts chromedriver round trips so extraction modes can be compared
+        self.command_counter = WebDriverCommandCounter()
+        # Versioned in-page extractor, registered with each new driver session
+        self.page_script = InPageExtractor(self.selector_registry)
+
+        if start_browser:
+            self.setup_driver()
+
+    def pace(self):
+        """Wait for a slot under the worker pool's shared rate cap before a page load or click."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+    def navigate(self, url: str):
+        """Load a page once the rate cap allows; every driver.get goes through here."""
+        self.pace()
+        self.driver.get(url)
+
+    def paced_click(self, element):
+        """Click an element once the rate cap allows."""
+        self.pace()
+        element.click()
+
+    def bind_collections(self):
+        """Point collection handles at the current MongoDB client."""
+        self.mongo_client = self.mongo.client
+        self.db = self.mongo.db
+        self.collection = self.db['jobdetails']
+        self.search_criteria_collection = self.db['search_criteria']
+        self.history_collection = self.db['jobdetails_history']
+        if getattr(self, 'job_writer', None):
+            self.job_writer.bind(self.collection, self.history_collection)
+        if getattr(self, 'known_jobs', None):
+            self.known_jobs.bind(self.collection, self.db['run_claims'])
+        if getattr(self, 'location_cache', None):
+            self.location_cache.bind(self.db['search_locations'])
+        if getattr(self, 'checkpoint', None):
+            self.checkpoint.bind(self.db['scrape_checkpoints'], self.collection)
+        if getattr(self, 'scheduler', None):
+            self.scheduler.bind(self.db['search_runs'])
+        if getattr(self, 'llm_cache', None):
+            self.llm_cache.bind(self.db['llm_field_cache'])
+        if getattr(self, 'selector_registry', None):
+            self.selector_registry.bind(self.db['selector_stats'])
+        if getattr(self, 'apply_resolver', None):
+            self.apply_resolver.bind(self.db['apply_urls'])
+        if getattr(self, 'logo_store', None):
+            self.logo_store.bind(self.db['logos'])
 
     def check_mongodb_connection(self):
-        """Check MongoDB connection and collection."""
+        """Check MongoDB connection with a single ping."""
         try:
-            # Test connection
-            self.mongo_client.admin.command('ping')
-            logger.info("MongoDB connection successful")
-            
-            # Test collection
-            try:
-                self.collection.find_one()
-                logger.info("MongoDB collection access successful")
-            except Exception as e:
-                logger.error(f"Failed to access collection: {str(e)}")
-                return False
-            
-            # Drop existing indexes to avoid conflicts
-            try:
-                self.collection.drop_indexes()
-                logger.info("Dropped existing indexes")
-            except Exception as e:
-                logger.error(f"Failed to drop indexes: {str(e)}")
-                return False
-            
-            # Create new indexes with correct field names
-            try:
-                self.collection.create_index("job_id", unique=True)
-                self.collection.create_index("search_id")
-                logger.info("MongoDB indexes created/verified")
-            except Exception as e:
-                logger.error(f"Failed to create indexes: {str(e)}")
-                return False
-            
-            return True
+            return self.mongo.ping()
         except ConnectionFailure as e:
             logger.error(f"MongoDB connection failed: {str(e)}")
             return False
@@ -145,6 +267,16 @@ class LinkedInScraper:
         self.current_proxy_index = (self.current_proxy_index + 1) % len(self.proxy_list)
         return proxy
 
+    def proxy_plugin_dir(self) -> str:
+        """Directory for the proxy auth extension, private to this scraper so pool workers never share one."""
+        if self.plugin_dir is None:
+            self.plugin_dir = tempfile.mkdtemp(prefix=f"proxy_{self.worker_index}_")
+        return self.plugin_dir
+
+    def proxy_url(self, proxy: str) -> str:
+        """Authenticated URL of a proxy, for HTTP requests made outside the browser."""
+        return f"http://{self.proxy_username}:{self.proxy_password}@{proxy}"
+
     def setup_driver(self):
         """Configure and initialize the Chrome WebDriver with proxy."""
         chrome_options = Options()
@@ -166,6 +298,7 @@ class LinkedInScraper:
         
         # Setup proxy with authentication
         proxy = self.get_next_proxy()
+        self.apply_resolver.use_proxy(self.proxy_url(proxy))
         
         # Create a proxy extension
         manifest_json = """
@@ -226,11 +359,8 @@ class LinkedInScraper:
         # Create proxy extension directory
         import os
         import zipfile
-        import tempfile
 
-        plugin_dir = os.path.join(tempfile.gettempdir(), 'proxy_auth_plugin')
-        if not os.path.exists(plugin_dir):
-            os.mkdir(plugin_dir)
+        plugin_dir = self.proxy_plugin_dir()
 
         with open(os.path.join(plugin_dir, "manifest.json"), "w") as f:
             f.write(manifest_json)
@@ -250,6 +380,8 @@ class LinkedInScraper:
         driver_path = os.path.join('drivers', 'chromedriver')
         service = Service(executable_path=driver_path)
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        self.command_counter.install(self.driver)
+        self.page_script.attach(self.driver)
         self.driver.maximize_window()
 
     def calculate_posted_date(self, date_text: str) -> str:
@@ -410,7 +542,7 @@ class LinkedInScraper:
     def login(self):
         """Login to LinkedIn with intelligent captcha/OTP handling."""
         try:
-            self.driver.get(self.base_url)
+            self.navigate(self.base_url)
             self.random_delay(5, 8)  # Increased initial delay
 
             # Try to find and close any popups first
@@ -419,7 +551,7 @@ class LinkedInScraper:
                 popup_close_buttons = self.driver.find_elements(By.CSS_SELECTOR, "button[aria-label='Dismiss']")
                 for button in popup_close_buttons:
                     try:
-                        button.click()
+                        self.paced_click(button)
                         self.random_delay(1, 2)
                     except:
                         pass
@@ -431,7 +563,7 @@ class LinkedInScraper:
                 sign_in_link = WebDriverWait(self.driver, 10).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='login']"))
                 )
-                sign_in_link.click()
+                self.paced_click(sign_in_link)
             except:
                 # If direct link not found, try the button
                 try:
@@ -443,12 +575,12 @@ class LinkedInScraper:
                     self.random_delay(1, 2)
                     # Try JavaScript click if regular click fails
                     try:
-                        sign_in_button.click()
+                        self.paced_click(sign_in_button)
                     except:
                         self.driver.execute_script("arguments[0].click();", sign_in_button)
                 except:
                     # If both methods fail, try going directly to login page
-                    self.driver.get("https://www.linkedin.com/login")
+                    self.navigate("https://www.linkedin.com/login")
             
             self.random_delay(3, 5)
 
@@ -469,7 +601,7 @@ class LinkedInScraper:
             # Click sign in
             sign_in_submit = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
             try:
-                sign_in_submit.click()
+                self.paced_click(sign_in_submit)
             except:
                 self.driver.execute_script("arguments[0].click();", sign_in_submit)
 
@@ -540,7 +672,7 @@ class LinkedInScraper:
                     if "linkedin.com" in self.driver.current_url.lower():
                         # Try to navigate to jobs page
                         try:
-                            self.driver.get(self.jobs_url)
+                            self.navigate(self.jobs_url)
                             self.random_delay(3, 5)
                             # Verify we're on jobs page
                             if "jobs" in self.driver.current_url.lower():
@@ -570,15 +702,35 @@ class LinkedInScraper:
             return False
 
     def search_jobs(self, job_title: str, location: str, software: str = None) -> str:
-        """Navigate to jobs search page and input search parameters."""
+        """Open the search results, by URL when the location's geoId is cached and through the form otherwise."""
         try:
-            # Navigate to jobs page
-            self.driver.get(self.jobs_url)
-            self.random_delay(3, 5)
-
             # Combine software and role for search if software is provided, with a comma between them
             search_query = f"{software}, {job_title}" if software else job_title
 
+            geo_id = self.location_cache.get(location) if SEARCH_URL_CONFIG['direct'] else None
+            if geo_id:
+                logger.info(f"Opening search results for {location} directly (geoId {geo_id})")
+                self.navigate(build_search_url(search_query, geo_id))
+            else:
+                if not self.submit_search_form(search_query, location):
+                    return None
+                # The results URL carries the location's geoId; later searches skip the form
+                self.location_cache.learn(location, self.driver.current_url)
+
+            return self.check_search_results(job_title, location)
+
+        except Exception as e:
+            logger.error(f"Failed to search jobs: {str(e)}")
+            print(f"Failed to search jobs: {str(e)}")
+            return None
+
+    def submit_search_form(self, search_query: str, location: str) -> bool:
+        """Fill and submit the jobs search form; the fallback when no geoId is cached for the location."""
+        try:
+            # Navigate to jobs page
+            self.navigate(self.jobs_url)
+            self.random_delay(3, 5)
+
             # Wait for and fill job title with retry mechanism
             max_retries = 3
             for attempt in range(max_retries):
@@ -593,7 +745,7 @@ class LinkedInScraper:
                     self.random_delay(1, 2)
                     
                     # Click the field to ensure focus
-                    title_field.click()
+                    self.paced_click(title_field)
                     self.random_delay(1, 2)
                     
                     # Send keys with a small delay between each character
@@ -612,7 +764,7 @@ class LinkedInScraper:
                             continue
                         else:
                             logger.error("Failed to enter job title after all attempts")
-                            return None
+                            return False
                             
                 except Exception as e:
                     if attempt < max_retries - 1:
@@ -621,7 +773,7 @@ class LinkedInScraper:
                         continue
                     else:
                         logger.error(f"Failed to enter job title: {str(e)}")
-                        return None
+                        return False
 
             # Wait for and fill location
             try:
@@ -634,7 +786,7 @@ class LinkedInScraper:
                 self.random_delay(1, 2)
                 
                 # Click the field to ensure focus
-                location_field.click()
+                self.paced_click(location_field)
                 self.random_delay(1, 2)
                 
                 # Send keys with a small delay between each character
@@ -647,180 +799,58 @@ class LinkedInScraper:
                 # Verify location was entered
                 if not location_field.get_attribute('value'):
                     logger.error("Failed to enter location")
-                    return None
+                    return False
                     
             except Exception as e:
                 logger.error(f"Failed to enter location: {str(e)}")
-                return None
+                return False
 
             # Try to find and click search button, if not found, press Enter
+            # First try to find the search button by its text
             try:
-                # First try to find the search button by its text
-                try:
-                    search_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Search')]"))
-                    )
-                    
-                    # Scroll button into view
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", search_button)
-                    self.random_delay(1, 2)
-                    
-                    # Try regular click first
-                    try:
-                        search_button.click()
-                    except:
-                        # If regular click fails, try JavaScript click
-                        self.driver.execute_script("arguments[0].click();", search_button)
-                except:
-                    # If button not found or not clickable, press Enter on location field
-                    logger.info("Search button not found, pressing Enter on location field")
-                    location_field.send_keys(Keys.RETURN)
+                search_button = WebDriverWait(self.driver, 5).until(
+                    EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Search')]"))
+                )
                 
-                self.random_delay(3, 5)
+                # Scroll button into view
+                self.driver.execute_script("arguments[0].scrollIntoView(true);", search_button)
+                self.random_delay(1, 2)
                 
-                # Verify we're on search results page
-                if "jobs/search" not in self.driver.current_url:
-                    logger.error("Failed to navigate to search results")
-                    return None
-
-                # Check for "No matching jobs found" message
+                # Try regular click first
                 try:
-                    no_results_banner = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.jobs-search-no-results-banner"))
-                    )
-                    no_results_text = no_results_banner.find_element(By.CSS_SELECTOR, "p.t-24.t-black.t-normal").text.strip()
-                    
-                    if "No matching jobs found" in no_results_text:
-                        logger.warning(f"No jobs found for search: {job_title} in {location}")
-                        print(f"\nNo jobs found for search: {job_title} in {location}")
-                        return None
-                except TimeoutException:
-                    # No "no results" banner found, which means we have results
-                    pass
-                except Exception as e:
-                    logger.error(f"Error checking for no results message: {str(e)}")
-                    return None
-                
-                print(f"Successfully searched for {job_title} in {location}")
-                return self.driver.current_url
-                
-            except Exception as e:
-                logger.error(f"Failed to perform search: {str(e)}")
-                return None
+                    self.paced_click(search_button)
+                except:
+                    # If regular click fails, try JavaScript click
+                    self.driver.execute_script("arguments[0].click();", search_button)
+            except:
+                # If button not found or not clickable, press Enter on location field
+                logger.info("Search button not found, pressing Enter on location field")
+                location_field.send_keys(Keys.RETURN)
+            
+            self.random_delay(3, 5)
+            return True
 
         except Exception as e:
-            logger.error(f"Failed to search jobs: {str(e)}")
-            print(f"Failed to search jobs: {str(e)}")
-            return None
-
-    def extract_fields_from_description(self, job_description: str) -> Dict:
-        """Extract specific fields from job description using OpenAI API."""
-        try:
-            logger.info("Starting OpenAI API extraction...")
-            
-            prompt = f"""Analyze the following job description and extract the following information in a structured format:
-            1. Industry/Domain: The main industry or domain this job belongs to
-            2. Tech Stack/Skills: List of technical skills, programming languages, tools, and technologies required
-            3. Benefits: List of benefits and perks offered
-            4. Qualifications: List of required academic qualifications
-            5. Contract Duration: The duration of the contract if mentioned (e.g., "6 months", "1 year", "Permanent")
-            6. Expected Hours Per Week: The expected working hours per week if mentioned
-            7. Required Skills: List of specific skills required for the job
-
-            Job Description:
-            {job_description}
-
-            Please provide the information in the following format:
-            Industry/Domain: [industry/domain]
-            Tech Stack/Skills: [comma-separated list of skills]
-            Benefits: [comma-separated list of benefits]
-            Qualifications: [comma-separated list of qualifications]
-            Contract Duration: [duration]
-            Expected Hours Per Week: [hours]
-            Required Skills: [comma-separated list of skills]
-
-            If any information is not found in the job description, respond with "Not Applicable" for that field.
-            Do not make assumptions or provide default values. If the information is not explicitly mentioned, use "Not Applicable".
-            For Tech Stack/Skills and Required Skills, make sure to list all technical skills, programming languages, tools, and technologies mentioned in the job description."""
-
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a job description analyzer. Extract specific information from job descriptions in a structured format. If information is not found, respond with 'Not Applicable'. Do not make assumptions or provide default values. For skills fields, make sure to list all technical skills, programming languages, tools, and technologies mentioned."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1000
-            )
-            
-            # Parse the response
-            result = response.choices[0].message.content.strip()
-            logger.info(f"OpenAI API response:\n{result}")
-            
-            # Initialize fields with "Not Applicable"
-            fields = {
-                'industry': 'Not Applicable',
-                'tech_skills': 'Not Applicable',
-                'benefits': 'Not Applicable',
-                'qualifications': 'Not Applicable',
-                'contract_duration': 'Not Applicable',
-                'expected_hours_per_week': 'Not Applicable',
-                'required_skills': 'Not Applicable'
-            }
-            
-            # Extract fields from the response
-            for line in result.split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # Only update if value is not empty and not "Not Applicable"
-                    if value and value.lower() != 'not applicable':
-                        if key == 'Industry/Domain':
-                            fields['industry'] = value
-                            logger.info(f"Found industry: {value}")
-                        elif key == 'Tech Stack/Skills':
-                            fields['tech_skills'] = value
-                            logger.info(f"Found tech skills: {value}")
-                        elif key == 'Benefits':
-                            fields['benefits'] = value
-                            logger.info(f"Found benefits: {value}")
-                        elif key == 'Qualifications':
-                            fields['qualifications'] = value
-                            logger.info(f"Found qualifications: {value}")
-                        elif key == 'Contract Duration':
-                            fields['contract_duration'] = value
-                            logger.info(f"Found contract duration: {value}")
-                        elif key == 'Expected Hours Per Week':
-                            fields['expected_hours_per_week'] = value
-                            logger.info(f"Found expected hours per week: {value}")
-                        elif key == 'Required Skills':
-                            fields['required_skills'] = value
-                            logger.info(f"Found required skills: {value}")
-                    else:
-                        logger.info(f"No value found for {key}, using 'Not Applicable'")
+            logger.error(f"Failed to perform search: {str(e)}")
+            return False
 
-            logger.info("Final fields extracted:")
-            for key, value in fields.items():
-                logger.info(f"{key}: {value}")
+    def check_search_results(self, job_title: str, location: str) -> Optional[str]:
+        """Return the results URL, or None when the search did not land on the results page."""
+        # Verify we're on search results page
+        if "jobs/search" not in self.driver.current_url:
+            logger.error("Failed to navigate to search results")
+            return None
 
-            return fields
+        # An empty result set is recognised by the combined card/empty-state wait in process_search_results
+        print(f"Successfully searched for {job_title} in {location}")
+        return self.driver.current_url
 
-        except Exception as e:
-            logger.error(f"Error extracting fields from description: {str(e)}")
-            return {
-                'industry': 'Not Applicable',
-                'tech_skills': 'Not Applicable',
-                'benefits': 'Not Applicable',
-                'qualifications': 'Not Applicable',
-                'contract_duration': 'Not Applicable',
-                'expected_hours_per_week': 'Not Applicable',
-                'required_skills': 'Not Applicable'
-            }
+    def extract_fields_from_description(self, job_description: str) -> Dict:
+        """Extract specific fields from job description using OpenAI API, reusing cached results."""
+        return self.field_extractor.extract(job_description)
 
-    def extract_job_details(self, job_card, domain: str, software: str) -> Dict:
-        """Extract details from a single job card."""
+    def extract_job_details(self, job_id: Optional[str], domain: str, software: str) -> Dict:
+        """Extract details from the detail pane, which must already show job_id."""
         try:
             job_data = {
                 'job_title': 'Not Applicable',
@@ -851,356 +881,396 @@ class LinkedInScraper:
                 'seen': True
             }
 
-            # Get the job URL and reference ID
-            try:
-                job_link = job_card.find_element(By.CSS_SELECTOR, "a.job-card-container__link, a.base-card__full-link")
-                job_url = job_link.get_attribute('href')
-                # Extract job reference ID from URL's currentJobId parameter
-                if 'currentJobId=' in job_url:
-                    job_data['job_id'] = job_url.split('currentJobId=')[1].split('&')[0]
-                else:
-                    # Try to get it from the current page URL if not in the job link
-                    current_url = self.driver.current_url
-                    if 'currentJobId=' in current_url:
-                        job_data['job_id'] = current_url.split('currentJobId=')[1].split('&')[0]
-            except:
-                pass
+            if job_id:
+                job_data['job_id'] = job_id
 
-            # Click on job card to get more details
-            try:
-                job_link.click()
-                self.random_delay(2, 3)
-            except Exception as e:
-                logger.error(f"Failed to click job card: {str(e)}")
-                return None
+            # Extract every field in one in-page script call, from one DOM snapshot,
+            # or with per-field WebDriver lookups
+            mode = EXTRACTION_CONFIG['mode']
+            if mode == 'script':
+                self.extract_details_with_script(job_data)
+            elif mode == 'snapshot':
+                self.extract_details_from_snapshot(job_data)
+            else:
+                self.extract_details_with_webdriver(job_data)
 
-            # Wait for job description to load
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.jobs-description__content"))
-                )
-            except TimeoutException:
-                logger.error("Timeout waiting for job description to load")
-                return None
+            # Start the logo download now; persist_job collects the stored path
+            if job_data.get('logo_url'):
+                self.logo_store.submit(job_data['logo_url'])
 
-            # Extract job title
-            try:
-                job_data['job_title'] = self.driver.find_element(
-                    By.CSS_SELECTOR, 
-                    "h1.t-24.t-bold.inline"
-                ).text.strip()
-            except NoSuchElementException:
-                pass
+            # Enrich inline only when the deferred enrichment worker is not in use;
+            # otherwise the job is stored with llm_converted = 0 and picked up later
+            if ENRICHMENT_CONFIG['inline'] and job_data['full_job_description'] != 'Not Applicable':
+                extracted_fields = self.extract_fields_from_description(job_data['full_job_description'])
 
-            # Extract company name
-            try:
-                job_data['company_name'] = self.driver.find_element(
-                    By.CSS_SELECTOR, 
-                    "div.job-details-jobs-unified-top-card__company-name a"
-                ).text.strip()
-            except NoSuchElementException:
-                pass
+                # Map the extracted fields to job_data
+                job_data.update({
+                    'industry': extracted_fields.get('industry', 'Not Applicable'),
+                    'tech_skills': extracted_fields.get('tech_skills', 'Not Applicable'),
+                    'benefits': extracted_fields.get('benefits', 'Not Applicable'),
+                    'qualifications': extracted_fields.get('qualifications', 'Not Applicable'),
+                    'contract_duration': extracted_fields.get('contract_duration', 'Not Applicable'),
+                    'expected_hours_per_week': extracted_fields.get('expected_hours_per_week', 'Not Applicable'),
+                    'required_skills': extracted_fields.get('required_skills', 'Not Applicable'),
+                    'llm_converted': extracted_fields.get('llm_converted', 0),
+                    'description_tokens_raw': extracted_fields.get('description_tokens_raw', 0),
+                    'description_tokens_sent': extracted_fields.get('description_tokens_sent', 0)
+                })
 
-            # Extract location
-            try:
-                location_element = self.driver.find_element(
-                    By.CSS_SELECTOR, 
-                    "div.job-details-jobs-unified-top-card__tertiary-description-container span.tvm__text.tvm__text--low-emphasis"
-                )
-                job_data['job_location'] = location_element.text.strip()
-            except NoSuchElementException:
-                pass
+            return job_data
 
-            # Extract work mode, employment type, and seniority level
-            try:
-                # Find all preference pills
-                preference_pills = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    "div.job-details-preferences-and-skills__pill span.ui-label"
-                )
-                
-                logger.info(f"Found {len(preference_pills)} preference pills")
-                
-                for pill in preference_pills:
-                    text = pill.text.strip()
-                    logger.info(f"Processing preference pill: {text}")
-                    
-                    # Check for employment type
-                    if any(emp_type in text for emp_type in ['Full-time', 'Contract', 'Part-time', 'Temporary']):
-                        job_data['employment_type'] = text
-                        logger.info(f"Found employment type: {text}")
-                    
-                    # Check for work mode
-                    if any(mode in text for mode in ['Remote', 'Hybrid', 'On-site']):
-                        job_data['work_location_type'] = text
-                        logger.info(f"Found work mode: {text}")
-                    
-                    # Check for seniority level with expanded list
-                    seniority_keywords = [
-                        'Entry level', 'Mid-Senior level', 'Senior level', 'Associate',
-                        'Mid level', 'Senior', 'Lead', 'Architect', 'Principal',
-                        'Junior', 'Intermediate', 'Expert', 'Director', 'Manager',
-                        'Staff', 'Senior Staff', 'Executive'
-                    ]
-                    
-                    if any(keyword.lower() in text.lower() for keyword in seniority_keywords):
-                        job_data['seniority_level'] = text
-                        logger.info(f"Found seniority level: {text}")
-                        
-            except Exception as e:
-                logger.error(f"Failed to extract work preferences: {str(e)}")
-                pass
+        except Exception as e:
+            logger.error(f"Failed to extract job details: {str(e)}")
+            print(f"Failed to extract job details: {str(e)}")
+            return None
 
-            # Extract salary range
-            try:
-                # Find all spans that might contain salary information
-                salary_spans = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    "span[dir='ltr']"
-                )
-                
-                for span in salary_spans:
-                    text = span.text.strip()
-                    if '/yr' in text or '/hr' in text:
-                        job_data['salary_range'] = text
-                        break
-                        
-            except NoSuchElementException:
-                pass
+    def extract_details_with_webdriver(self, job_data: Dict):
+        """Fill job_data with one WebDriver lookup per field."""
+        # Extract job title
+        try:
+            job_data['job_title'] = self.driver.find_element(
+                By.CSS_SELECTOR, 
+                "h1.t-24.t-bold.inline"
+            ).text.strip()
+        except NoSuchElementException:
+            pass
 
-            # Extract posted date
-            try:
-                date_elements = self.driver.find_elements(
-                    By.CSS_SELECTOR, 
-                    "div.job-details-jobs-unified-top-card__tertiary-description-container span.tvm__text"
-                )
-                for element in date_elements:
-                    text = element.text.strip()
-                    if any(x in text.lower() for x in ['hour', 'day', 'month', 'ago']):
-                        job_data['posted_date'] = self.calculate_posted_date(text)
-                        break
-            except NoSuchElementException:
-                pass
+        # Extract company name
+        try:
+            job_data['company_name'] = self.driver.find_element(
+                By.CSS_SELECTOR, 
+                "div.job-details-jobs-unified-top-card__company-name a"
+            ).text.strip()
+        except NoSuchElementException:
+            pass
 
-            # Extract apply button information
-            try:
-                # First check if apply button exists
-                apply_buttons = self.driver.find_elements(
-                    By.CSS_SELECTOR, 
-                    "button.jobs-apply-button"
-                )
-                
-                if not apply_buttons:
-                    # No apply button found
-                    job_data['apply_button_label'] = 'Not Applicable'
-                    job_data['apply_url'] = 'Not Applicable'
-                else:
-                    apply_button = apply_buttons[0]
-                    job_data['apply_button_label'] = apply_button.text.strip()
-                    
-                    # Only proceed with URL extraction if it's not an Easy Apply button
-                    if job_data['apply_button_label'] != "Easy Apply":
-                        try:
-                            # Store the current window handle
-                            main_window = self.driver.current_window_handle
-                            
-                            # Click the apply button
-                            apply_button.click()
-                            self.random_delay(2, 3)
-                            
-                            # Wait for new tab to open and switch to it
-                            WebDriverWait(self.driver, 10).until(
-                                lambda d: len(d.window_handles) > 1
-                            )
-                            
-                            # Switch to the new tab
-                            new_window = [handle for handle in self.driver.window_handles if handle != main_window][0]
-                            self.driver.switch_to.window(new_window)
-                            
-                            # Get the URL from the new tab
-                            job_data['apply_url'] = self.driver.current_url
-                            
-                            # Close the new tab
-                            self.driver.close()
-                            
-                            # Switch back to the main window
-                            self.driver.switch_to.window(main_window)
-                            
-                        except Exception as e:
-                            logger.error(f"Failed to get Apply URL: {str(e)}")
-                            job_data['apply_url'] = 'Not Applicable'
-                    else:
-                        job_data['apply_url'] = 'Not Applicable'
-                    
-            except Exception as e:
-                logger.error(f"Error processing apply button: {str(e)}")
+        # Extract location
+        try:
+            location_element = self.driver.find_element(
+                By.CSS_SELECTOR, 
+                "div.job-details-jobs-unified-top-card__tertiary-description-container span.tvm__text.tvm__text--low-emphasis"
+            )
+            job_data['job_location'] = location_element.text.strip()
+        except NoSuchElementException:
+            pass
+
+        # Extract work mode, employment type, and seniority level
+        try:
+            # Find all preference pills
+            preference_pills = self.driver.find_elements(
+                By.CSS_SELECTOR,
+                "div.job-details-preferences-and-skills__pill span.ui-label"
+            )
+
+            logger.info(f"Found {len(preference_pills)} preference pills")
+
+            for pill in preference_pills:
+                text = pill.text.strip()
+                logger.info(f"Processing preference pill: {text}")
+
+                # Check for employment type
+                if any(emp_type in text for emp_type in ['Full-time', 'Contract', 'Part-time', 'Temporary']):
+                    job_data['employment_type'] = text
+                    logger.info(f"Found employment type: {text}")
+
+                # Check for work mode
+                if any(mode in text for mode in ['Remote', 'Hybrid', 'On-site']):
+                    job_data['work_location_type'] = text
+                    logger.info(f"Found work mode: {text}")
+
+                # Check for seniority level with expanded list
+                seniority_keywords = [
+                    'Entry level', 'Mid-Senior level', 'Senior level', 'Associate',
+                    'Mid level', 'Senior', 'Lead', 'Architect', 'Principal',
+                    'Junior', 'Intermediate', 'Expert', 'Director', 'Manager',
+                    'Staff', 'Senior Staff', 'Executive'
+                ]
+
+                if any(keyword.lower() in text.lower() for keyword in seniority_keywords):
+                    job_data['seniority_level'] = text
+                    logger.info(f"Found seniority level: {text}")
+
+        except Exception as e:
+            logger.error(f"Failed to extract work preferences: {str(e)}")
+            pass
+
+        # Extract salary range
+        try:
+            # Find all spans that might contain salary information
+            salary_spans = self.driver.find_elements(
+                By.CSS_SELECTOR,
+                "span[dir='ltr']"
+            )
+
+            for span in salary_spans:
+                text = span.text.strip()
+                if '/yr' in text or '/hr' in text:
+                    job_data['salary_range'] = text
+                    break
+
+        except NoSuchElementException:
+            pass
+
+        # Extract posted date
+        try:
+            date_elements = self.driver.find_elements(
+                By.CSS_SELECTOR, 
+                "div.job-details-jobs-unified-top-card__tertiary-description-container span.tvm__text"
+            )
+            for element in date_elements:
+                text = element.text.strip()
+                if any(x in text.lower() for x in ['hour', 'day', 'month', 'ago']):
+                    job_data['posted_date'] = self.calculate_posted_date(text)
+                    break
+        except NoSuchElementException:
+            pass
+
+        # Extract apply button information
+        try:
+            # First check if apply button exists
+            apply_buttons = self.driver.find_elements(
+                By.CSS_SELECTOR, 
+                "button.jobs-apply-button"
+            )
+
+            if not apply_buttons:
+                # No apply button found
                 job_data['apply_button_label'] = 'Not Applicable'
                 job_data['apply_url'] = 'Not Applicable'
+            else:
+                apply_button = apply_buttons[0]
+                job_data['apply_button_label'] = apply_button.text.strip()
 
-            # Extract and save company logo
-            try:
-                logo_element = self.driver.find_element(
-                    By.CSS_SELECTOR, 
-                    "img.ivm-view-attr__img--centered"
-                )
-                logo_url = logo_element.get_attribute('src')
-                if logo_url:
-                    # Create logos directory if it doesn't exist
-                    os.makedirs('logos', exist_ok=True)
-                    
-                    # Generate filename using company name and job reference ID
-                    company_name = job_data['company_name'].replace(' ', '_').lower()
-                    job_id = job_data['job_id']
-                    logo_filename = f"logos/{company_name}_{job_id}.png"
-                    
-                    # Download and save the image
-                    response = requests.get(logo_url)
-                    if response.status_code == 200:
-                        with open(logo_filename, 'wb') as f:
-                            f.write(response.content)
-                        job_data['c_logo'] = logo_filename
-                    else:
-                        job_data['c_logo'] = 'Not Applicable'
-            except Exception as e:
-                logger.error(f"Failed to save company logo: {str(e)}")
-                job_data['c_logo'] = 'Not Applicable'
+                # Only proceed with URL extraction if it's not an Easy Apply button
+                job_data['apply_url'] = 'Not Applicable'
+                if job_data['apply_button_label'] != "Easy Apply":
+                    self.queue_apply_url(job_data, self.find_apply_link())
 
-            # Extract company description
-            try:
-                logger.info("Starting company description extraction...")
-                
-                # Try multiple selectors for company description
-                company_desc_selectors = [
-                    "p.jobs-company__company-description div.DSkFjPIRUfGDmNnMiGtRQTFCGOMZBo",  # Primary selector
-                    "div.DSkFjPIRUfGDmNnMiGtRQTFCGOMZBo",  # Direct div selector
-                    "p.jobs-company__company-description",  # Parent paragraph
-                    "div.jobs-company__company-description",  # Alternative container
-                    "div.jobs-company__description"  # Another alternative
-                ]
-                
-                company_desc = None
-                for selector in company_desc_selectors:
-                    try:
-                        logger.info(f"Trying company description selector: {selector}")
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        logger.info(f"Found {len(elements)} elements with selector: {selector}")
-                        
-                        for element in elements:
-                            if element.is_displayed() and element.text.strip():
-                                company_desc = element
-                                logger.info(f"Found visible company description with selector: {selector}")
-                                logger.info(f"Element text length: {len(element.text.strip())}")
-                                logger.info(f"Complete element text:\n{element.text.strip()}")
-                                break
-                        if company_desc:
+        except Exception as e:
+            logger.error(f"Error processing apply button: {str(e)}")
+            job_data['apply_button_label'] = 'Not Applicable'
+            job_data['apply_url'] = 'Not Applicable'
+
+        # Capture the company logo URL; the persistence stage downloads it
+        try:
+            logo_element = self.driver.find_element(
+                By.CSS_SELECTOR, 
+                "img.ivm-view-attr__img--centered"
+            )
+            job_data['logo_url'] = logo_element.get_attribute('src')
+        except Exception as e:
+            logger.error(f"Failed to find company logo: {str(e)}")
+
+        # Extract company description
+        try:
+            logger.info("Starting company description extraction...")
+
+            # Try the company description selectors, best first
+            company_desc_selectors = self.selector_registry.ordered('comp_desc')
+
+            company_desc = None
+            for selector in company_desc_selectors:
+                try:
+                    logger.info(f"Trying company description selector: {selector}")
+                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    logger.info(f"Found {len(elements)} elements with selector: {selector}")
+
+                    for element in elements:
+                        if element.is_displayed() and element.text.strip():
+                            company_desc = element
+                            self.selector_registry.record('comp_desc', selector, company_desc_selectors)
+                            logger.info(f"Found visible company description with selector: {selector}")
+                            logger.info(f"Element text length: {len(element.text.strip())}")
+                            logger.info(f"Complete element text:\n{element.text.strip()}")
                             break
-                    except Exception as e:
-                        logger.warning(f"Failed with selector {selector}: {str(e)}")
-                        continue
+                    if company_desc:
+                        break
+                except Exception as e:
+                    logger.warning(f"Failed with selector {selector}: {str(e)}")
+                    continue
 
-                if company_desc:
-                    # Get the complete text
-                    full_text = company_desc.text.strip()
-                    logger.info(f"Raw company description text length: {len(full_text)}")
-                    logger.info(f"Complete raw company description text:\n{full_text}")
-                    
-                    # Remove the "show more" button text if present
-                    if '…' in full_text:
-                        full_text = full_text.split('…')[0].strip()
-                        logger.info("Removed 'show more' button text")
-                    
-                    # Clean up any extra whitespace and line breaks
-                    full_text = ' '.join(full_text.split())
-                    logger.info("Cleaned up whitespace and line breaks")
-                    
-                    # Remove any suspicious URLs
-                    full_text = full_text.replace('https://www.linkedin.com/redir/suspicious-page?url=', '')
-                    logger.info("Removed suspicious URLs")
-                    
-                    # Clean up any remaining HTML-like tags
-                    full_text = full_text.replace('<br>', ' ').replace('<br><br>', '\n')
-                    logger.info("Cleaned up HTML tags")
-                    
-                    # Remove any extra spaces around newlines
-                    full_text = '\n'.join(line.strip() for line in full_text.split('\n'))
-                    logger.info("Cleaned up newlines")
-                    
-                    # Verify we have actual content
-                    if len(full_text.strip()) > 0:
-                        job_data['comp_desc'] = full_text
-                        logger.info(f"Successfully extracted company description. Final length: {len(full_text)}")
-                        logger.info(f"Final company description text:\n{full_text}")
-                    else:
-                        logger.warning("Company description text is empty after cleaning")
-                        job_data['comp_desc'] = 'Not Applicable'
+            if company_desc:
+                # Get the complete text
+                full_text = company_desc.text.strip()
+                logger.info(f"Raw company description text length: {len(full_text)}")
+                logger.info(f"Complete raw company description text:\n{full_text}")
+
+                # Remove the "show more" button text if present
+                if '…' in full_text:
+                    full_text = full_text.split('…')[0].strip()
+                    logger.info("Removed 'show more' button text")
+
+                # Clean up any extra whitespace and line breaks
+                full_text = ' '.join(full_text.split())
+                logger.info("Cleaned up whitespace and line breaks")
+
+                # Remove any suspicious URLs
+                full_text = full_text.replace('https://www.linkedin.com/redir/suspicious-page?url=', '')
+                logger.info("Removed suspicious URLs")
+
+                # Clean up any remaining HTML-like tags
+                full_text = full_text.replace('<br>', ' ').replace('<br><br>', '\n')
+                logger.info("Cleaned up HTML tags")
+
+                # Remove any extra spaces around newlines
+                full_text = '\n'.join(line.strip() for line in full_text.split('\n'))
+                logger.info("Cleaned up newlines")
+
+                # Verify we have actual content
+                if len(full_text.strip()) > 0:
+                    job_data['comp_desc'] = full_text
+                    logger.info(f"Successfully extracted company description. Final length: {len(full_text)}")
+                    logger.info(f"Final company description text:\n{full_text}")
                 else:
-                    logger.warning("Company description element not found with any selector")
+                    logger.warning("Company description text is empty after cleaning")
                     job_data['comp_desc'] = 'Not Applicable'
-                    
-            except Exception as e:
-                logger.error(f"Failed to extract company description: {str(e)}")
+            else:
+                logger.warning("Company description element not found with any selector")
                 job_data['comp_desc'] = 'Not Applicable'
 
-            # Extract benefits
-            try:
-                benefits_section = self.driver.find_element(
-                    By.XPATH,
-                    "//strong[contains(text(), 'Benefits')]/following-sibling::ul"
-                )
-                job_data['benefits'] = benefits_section.text.strip()
-            except NoSuchElementException:
-                pass
+        except Exception as e:
+            logger.error(f"Failed to extract company description: {str(e)}")
+            job_data['comp_desc'] = 'Not Applicable'
 
-            # Extract qualifications
-            try:
-                qualifications_section = self.driver.find_element(
-                    By.XPATH,
-                    "//strong[contains(text(), 'Qualifications')]/following-sibling::ul"
-                )
-                job_data['qualifications'] = qualifications_section.text.strip()
-            except NoSuchElementException:
-                pass
+        # Extract benefits
+        try:
+            benefits_section = self.driver.find_element(
+                By.XPATH,
+                "//strong[contains(text(), 'Benefits')]/following-sibling::ul"
+            )
+            job_data['benefits'] = benefits_section.text.strip()
+        except NoSuchElementException:
+            pass
+
+        # Extract qualifications
+        try:
+            qualifications_section = self.driver.find_element(
+                By.XPATH,
+                "//strong[contains(text(), 'Qualifications')]/following-sibling::ul"
+            )
+            job_data['qualifications'] = qualifications_section.text.strip()
+        except NoSuchElementException:
+            pass
+
+        # Extract full job description
+        try:
+            job_desc = self.driver.find_element(
+                By.CSS_SELECTOR,
+                "div.jobs-description__content div.jobs-box__html-content"
+            )
+            job_data['full_job_description'] = job_desc.text.strip()
+        except NoSuchElementException:
+            pass
+
+    def extract_details_from_snapshot(self, job_data: Dict):
+        """Fill job_data from a single HTML snapshot of the detail pane, parsed locally."""
+        html = None
+        try:
+            html = self.driver.execute_script(
+                DETAIL_SNAPSHOT_SCRIPT,
+                EXTRACTION_CONFIG['snapshot_selector'],
+                self.selector_registry.ordered('comp_desc')
+            )
+        except Exception as e:
+            logger.warning(f"Failed to snapshot the job detail pane: {str(e)}")
+        if not html:
+            html = self.driver.page_source
+
+        selectors = self.selector_registry.ordered_groups(DETAIL_SELECTORS)
+        self.apply_detail_fields(job_data, parse_job_details(html, selectors))
 
-            # Extract full job description
+    def extract_details_with_script(self, job_data: Dict):
+        """Fill job_data from a single execute_script call to the in-page extractor."""
+        fields = None
+        try:
+            fields = self.page_script.extract_details()
+        except Exception as e:
+            logger.error(f"In-page extraction failed: {str(e)}")
+        if fields is None:
+            logger.info("Falling back to snapshot extraction")
+            self.extract_details_from_snapshot(job_data)
+            return
+        self.apply_detail_fields(job_data, fields)
+
+    def apply_detail_fields(self, job_data: Dict, fields: Dict):
+        """Copy parsed detail pane fields into job_data and resolve the apply URL."""
+        posted_text = fields.pop('posted_text', None)
+        if posted_text:
+            job_data['posted_date'] = self.calculate_posted_date(posted_text)
+        apply_link = fields.pop('apply_link', None)
+        job_data.update(fields)
+
+        job_data['apply_url'] = 'Not Applicable'
+        if job_data['apply_button_label'] not in ('Easy Apply', 'Not Applicable'):
+            self.queue_apply_url(job_data, apply_link)
+
+    def find_apply_link(self) -> Optional[str]:
+        """The external apply link target from the live DOM, without clicking."""
+        selectors = self.selector_registry.ordered('apply_link')
+        for selector in selectors:
+            for element in self.driver.find_elements(By.CSS_SELECTOR, selector):
+                href = element.get_attribute('href')
+                if href:
+                    self.selector_registry.record('apply_link', selector, selectors)
+                    return href
+        return None
+
+    def queue_apply_url(self, job_data: Dict, apply_link: Optional[str]):
+        """Hand an external apply link to the resolver; persist_job collects the result."""
+        job_id = job_data['job_id']
+        if apply_link:
+            self.apply_resolver.submit(job_id, urljoin(self.base_url, apply_link))
+        elif self.apply_resolver.cached(job_id):
+            job_data['apply_url'] = self.apply_resolver.cached(job_id)
+        elif APPLY_URL_CONFIG['click_fallback']:
+            # No link in the DOM: fall back to opening the apply tab in the browser
             try:
-                job_desc = self.driver.find_element(
-                    By.CSS_SELECTOR,
-                    "div.jobs-description__content div.jobs-box__html-content"
-                )
-                job_data['full_job_description'] = job_desc.text.strip()
-                
-                # Extract additional fields using OpenAI
-                extracted_fields = self.extract_fields_from_description(job_data['full_job_description'])
-                
-                # Map the extracted fields to job_data
-                job_data.update({
-                    'industry': extracted_fields.get('industry', 'Not Applicable'),
-                    'tech_skills': extracted_fields.get('tech_skills', 'Not Applicable'),
-                    'benefits': extracted_fields.get('benefits', 'Not Applicable'),
-                    'qualifications': extracted_fields.get('qualifications', 'Not Applicable'),
-                    'contract_duration': extracted_fields.get('contract_duration', 'Not Applicable'),
-                    'expected_hours_per_week': extracted_fields.get('expected_hours_per_week', 'Not Applicable'),
-                    'required_skills': extracted_fields.get('required_skills', 'Not Applicable')
-                })
-                
+                apply_button = self.driver.find_element(By.CSS_SELECTOR, "button.jobs-apply-button")
+                job_data['apply_url'] = self.resolve_apply_url(apply_button)
             except NoSuchElementException:
                 pass
+        else:
+            logger.info(f"No apply link found in the page for job {job_id}")
 
-            # Print job details to terminal
-            self.print_job_details(job_data)
-
-            return job_data
-
+    def resolve_apply_url(self, apply_button) -> str:
+        """Click an external apply button and read the URL of the tab it opens."""
+        try:
+            # Store the current window handle
+            main_window = self.driver.current_window_handle
+            
+            # Click the apply button
+            self.paced_click(apply_button)
+            self.random_delay(2, 3)
+            
+            # Wait for new tab to open and switch to it
+            WebDriverWait(self.driver, 10).until(
+                lambda d: len(d.window_handles) > 1
+            )
+            
+            # Switch to the new tab
+            new_window = [handle for handle in self.driver.window_handles if handle != main_window][0]
+            self.driver.switch_to.window(new_window)
+            
+            # Get the URL from the new tab
+            apply_url = self.driver.current_url
+            
+            # Close the new tab
+            self.driver.close()
+            
+            # Switch back to the main window
+            self.driver.switch_to.window(main_window)
+            return apply_url
+            
         except Exception as e:
-            logger.error(f"Failed to extract job details: {str(e)}")
-            print(f"Failed to extract job details: {str(e)}")
-            return None
+            logger.error(f"Failed to get Apply URL: {str(e)}")
+            return 'Not Applicable'
 
     def rotate_proxy(self):
         """Rotate to the next proxy with natural delays."""
         try:
             # Get next proxy
             proxy = self.get_next_proxy()
+            self.apply_resolver.use_proxy(self.proxy_url(proxy))
             
             # Add natural delay before rotation
             self.random_delay(5, 10)
@@ -1264,11 +1334,8 @@ class LinkedInScraper:
             # Create proxy extension directory
             import os
             import zipfile
-            import tempfile
 
-            plugin_dir = os.path.join(tempfile.gettempdir(), 'proxy_auth_plugin')
-            if not os.path.exists(plugin_dir):
-                os.mkdir(plugin_dir)
+            plugin_dir = self.proxy_plugin_dir()
 
             with open(os.path.join(plugin_dir, "manifest.json"), "w") as f:
                 f.write(manifest_json)
@@ -1291,7 +1358,7 @@ class LinkedInScraper:
             
             # Refresh the page
             current_url = self.driver.current_url
-            self.driver.get(current_url)
+            self.navigate(current_url)
             
             # Add longer delay after rotation
             self.random_delay(8, 15)
@@ -1347,16 +1414,36 @@ class LinkedInScraper:
             logger.error(f"Data validation error: {str(e)}")
             return False
 
-    def process_search_results(self, search_url: str, output_file: str, domain: str, software: str, search_id: str, job_limit: Optional[int] = None) -> List[Dict]:
-        """Process all job listings from search results."""
+    def process_search_results(self, search_url: str, output_file: str, domain: str, software: str, search_id: str,
+                               job_limit: Optional[int] = None, progress: Optional[SearchProgress] = None,
+                               max_pages: Optional[int] = None) -> List[Dict]:
+        """Process job listings from search results, starting from a checkpoint when resuming.
+
+        Stops after max_pages when the scheduler limits the depth; self.search_stats describes the pass.
+        """
         jobs_data = []
-        max_retries = 2  # Reduced retries
-        jobs_per_page = 25
-        page = 1
+        jobs_per_page = SEARCH_URL_CONFIG['jobs_per_page']
+        # Set from the results count on the first page loaded, so pagination stops without an empty page
+        final_page = None
+        progress = progress or SearchProgress(1, 0, {}, False)
+        page = progress.page
         jobs_processed = 0
-        total_jobs_processed = 0
+        total_jobs_processed = len(progress.handled)
         current_url = search_url
 
+        self.search_stats = {'pages': 0, 'last_new_page': 0, 'depth_capped': False}
+        self.known_jobs.reset_stats()
+
+        # Incremental mode only opens cards for jobs that are new or past the refresh TTL;
+        # the scheduler uses the same index to find the deepest page holding new jobs
+        incremental = INCREMENTAL_CONFIG['enabled']
+        if incremental or SCHEDULER_CONFIG['enabled']:
+            try:
+                self.mongo.execute(self.known_jobs.load)
+            except Exception as e:
+                logger.error(f"Failed to load known jobs, visiting every card: {str(e)}")
+                incremental = False
+
         while True:
             try:
                 # Check if we've reached the job limit
@@ -1388,49 +1475,41 @@ class LinkedInScraper:
                 if self.driver.current_url != current_url:
                     try:
                         logger.info(f"Navigating to page {page} with URL: {current_url}")
-                        self.driver.get(current_url)
+                        self.navigate(current_url)
                         self.random_delay(3, 5)
                     except Exception as e:
                         logger.error(f"Failed to navigate to page {page}: {str(e)}")
                         if not self.handle_error("navigation"):
                             return jobs_data
 
-                # Wait for job cards to load with multiple possible selectors
+                # Wait for job cards or an empty-results marker; every selector is raced in one condition
                 job_cards = []
-                selectors = [
-                    "li.ember-view.aUvdHPFertpnIJPPQuqaOLBKDiHTTANo.occludable-update.p0.relative.scaffold-layout__list-item",
-                    "li.ember-view.occludable-update.p0.relative.scaffold-layout__list-item",
-                    "li.ember-view.job-card-container",
-                    "div.job-card-container",
-                    "div.base-card"
-                ]
-                
-                for selector in selectors:
-                    try:
-                        logger.info(f"Trying to find job cards with selector: {selector}")
-                        job_cards = WebDriverWait(self.driver, 15).until(
-                            EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                        )
-                        if job_cards:
-                            logger.info(f"Found {len(job_cards)} job cards with selector: {selector}")
-                            break
-                    except TimeoutException:
-                        logger.warning(f"Timeout with selector: {selector}")
-                        continue
-                    except Exception as e:
-                        logger.warning(f"Error with selector {selector}: {str(e)}")
-                        continue
+                try:
+                    group, selector, job_cards = self.selector_registry.wait_for_any_group(
+                        self.driver, ('job_cards', 'empty_results'), SELECTOR_REGISTRY_CONFIG['wait_timeout']
+                    )
+                    if group == 'empty_results':
+                        logger.info(f"Page {page} has no results ({selector}), stopping pagination")
+                        if page == 1:
+                            print(f"\nNo jobs found for search: {search_url}")
+                        break
+                    logger.info(f"Found {len(job_cards)} job cards with selector: {selector}")
+                except TimeoutException:
+                    logger.warning("Timeout waiting for job cards with any selector")
+                except Exception as e:
+                    logger.warning(f"Error waiting for job cards: {str(e)}")
 
                 if not job_cards:
                     logger.error("No job cards found with any selector")
                     # Try to refresh the page once
                     try:
                         logger.info("Attempting to refresh the page...")
+                        self.pace()
                         self.driver.refresh()
                         self.random_delay(5, 7)
-                        # Try the first selector again after refresh
-                        job_cards = WebDriverWait(self.driver, 15).until(
-                            EC.presence_of_all_elements_located((By.CSS_SELECTOR, selectors[0]))
+                        # Wait for any selector again after refresh
+                        selector, job_cards = self.selector_registry.wait_for_any(
+                            self.driver, 'job_cards', SELECTOR_REGISTRY_CONFIG['wait_timeout']
                         )
                         if not job_cards:
                             logger.error("Still no job cards found after refresh")
@@ -1440,117 +1519,90 @@ class LinkedInScraper:
                         return jobs_data
 
                 print(f"\nProcessing page {page}...")
+
+                if final_page is None:
+                    total_results = self.read_results_count()
+                    if total_results is not None:
+                        final_page = last_page(total_results)
+                        logger.info(f"{total_results} results, {final_page} pages to scrape")
                 
                 # Natural scroll through the page
                 self.natural_scroll()
                 
-                # Process each job card
-                for index, job_card in enumerate(job_cards):
+                # Harvest every card up front; the detail stage then works through this queue
+                # and re-locates each card by job id only to click it
+                cards = harvest_cards(self.driver, self.selector_registry, selector)
+                visits = [JobVisit(self, card, selector) for card in cards]
+                # The job id comes from the card itself, so a job another search of this run already
+                # extracted (or, in incremental mode, a recently extracted one) costs no click
+                for visit in visits:
+                    if self.known_jobs.should_skip(visit.job_id, incremental):
+                        visit.skip()
+                        self.mongo.execute(self.known_jobs.mark_seen, visit.job_id, search_id, self.run_id)
+                # Cards handed off before an interruption are not visited again
+                pending = [
+                    visit for visit in visits
+                    if visit.state == VisitState.CARD and visit.job_id not in progress.handled
+                    and not (visit.job_id is None and page == progress.page and visit.card.index < progress.card_offset)
+                ]
+                logger.info(f"Page {page}: harvested {len(cards)} cards, {len(pending)} to visit")
+                self.save_checkpoint(search_id, page, progress.card_offset if page == progress.page else 0)
+
+                for visit in pending:
                     # Check if we've reached the job limit
                     if job_limit is not None and total_jobs_processed >= job_limit:
                         logger.info(f"Reached job limit of {job_limit} jobs")
                         return jobs_data
 
-                    retry_count = 0
-                    while retry_count < max_retries:
-                        try:
-                            # Natural scroll to the job card
-                            self.natural_scroll(job_card)
-                            self.random_delay(1, 2)
-
-                            # Get job title before clicking (for logging)
-                            try:
-                                job_title = job_card.find_element(By.CSS_SELECTOR, "h3.base-search-card__title").text.strip()
-                            except:
-                                try:
-                                    job_title = job_card.find_element(By.CSS_SELECTOR, "a.job-card-container__link strong").text.strip()
-                                except:
-                                    job_title = f"Job {index + 1}"
+                    try:
+                        # Workers share the run's searches, so the same job can show up on two of them at once;
+                        # only the worker that claims it first visits it
+                        if self.worker_count > 1 and not self.mongo.execute(
+                                self.known_jobs.claim, visit.job_id, self.run_id, self.worker_index):
+                            visit.skip("claimed by another worker")
+                            self.mongo.execute(self.known_jobs.mark_seen, visit.job_id, search_id, self.run_id)
+                            continue
 
-                            print(f"\nProcessing job: {job_title}")
+                        # One click, one readiness check on the job id, one extraction
+                        is_new = visit.job_id not in self.known_jobs.extract_dates
+                        job_data = visit.run(domain, software)
+                        if visit.state == VisitState.FAILED:
+                            self.save_checkpoint(search_id, page, visit.card.index + 1)
+                            continue
 
-                            # Click the job card
+                        # Validate job data
+                        if job_data and self.validate_job_data(job_data):
+                            # Add search_id and the run generation to job data
+                            job_data['search_id'] = search_id
+                            job_data['last_seen_run'] = self.run_id
+                            # Hand off to the persistence stage and move on to the next card
                             try:
-                                # Try multiple selectors for the clickable element
-                                clickable_selectors = [
-                                    "a.base-card__full-link",
-                                    "a.job-card-container__link",
-                                    "div.job-card-container__primary-description"
-                                ]
-                                
-                                clickable_element = None
-                                for selector in clickable_selectors:
-                                    try:
-                                        clickable_element = job_card.find_element(By.CSS_SELECTOR, selector)
-                                        if clickable_element:
-                                            break
-                                    except:
-                                        continue
-                                
-                                if not clickable_element:
-                                    logger.error(f"Could not find clickable element for job: {job_title}")
-                                    break
-
-                                # Natural scroll to the element
-                                self.natural_scroll(clickable_element)
-                                self.random_delay(1, 2)
-                                
-                                # Try multiple click methods
-                                try:
-                                    clickable_element.click()
-                                except:
-                                    try:
-                                        self.driver.execute_script("arguments[0].click();", clickable_element)
-                                    except:
-                                        # Try moving to element and clicking
-                                        actions = webdriver.ActionChains(self.driver)
-                                        actions.move_to_element(clickable_element).click().perform()
-                                
-                                self.random_delay(2, 3)
-                                
-                                # Verify the job description loaded
-                                try:
-                                    WebDriverWait(self.driver, 10).until(
-                                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.jobs-description__content"))
-                                    )
-                                except TimeoutException:
-                                    logger.error(f"Job description did not load for: {job_title}")
-                                    break
-                                    
+                                self.persistence.submit(job_data)
+                                self.known_jobs.add(job_data['job_id'], job_data['extract_date'])
+                                if is_new:
+                                    self.search_stats['last_new_page'] = page
+                                self.save_checkpoint(search_id, page, visit.card.index + 1, job_data['job_id'])
+                                jobs_data.append(job_data)
+                                jobs_processed += 1
+                                total_jobs_processed += 1
+                                print(f"Successfully extracted details for: {job_data['job_title']}")
                             except Exception as e:
-                                logger.error(f"Failed to click job card: {str(e)}")
-                                break
+                                logger.error(f"Failed to queue job for persistence: {str(e)}")
+                            self.report_persistence_errors()
+                        else:
+                            logger.warning(f"Invalid job data for job {visit.card.index + 1}")
 
-                            # Extract job details
-                            job_data = self.extract_job_details(job_card, domain, software)
-                            
-                            # Validate job data
-                            if job_data and self.validate_job_data(job_data):
-                                # Add search_id to job data
-                                job_data['search_id'] = search_id
-                                # Save to MongoDB
-                                try:
-                                    self.save_job_to_mongodb(job_data)
-                                    jobs_data.append(job_data)
-                                    jobs_processed += 1
-                                    total_jobs_processed += 1
-                                    print(f"Successfully extracted and saved details for: {job_data['job_title']}")
-                                except Exception as e:
-                                    logger.error(f"Failed to save job to MongoDB: {str(e)}")
-                                break  # Success, exit retry loop
-                            else:
-                                logger.warning(f"Invalid job data for job {index + 1}")
-                                break
+                    except Exception as e:
+                        logger.error(f"Failed to process job card {visit.job_title}: {str(e)}")
 
-                        except Exception as e:
-                            logger.error(f"Failed to process job card: {str(e)}")
-                            retry_count += 1
-                            if retry_count < max_retries:
-                                logger.info(f"Retrying job card (attempt {retry_count + 1}/{max_retries})")
-                                self.random_delay(2, 4)
-                            else:
-                                logger.error(f"Max retries reached for job card")
-                                break
+                self.search_stats['pages'] += 1
+                if final_page is not None and page >= final_page:
+                    logger.info(f"Page {page} is the last results page")
+                    break
+                if max_pages is not None and page >= max_pages:
+                    logger.info(f"Reached the scheduled depth of {max_pages} pages")
+                    self.search_stats['depth_capped'] = True
+                    break
 
                 # Add natural delay between pages
                 self.random_delay(5, 10)
@@ -1565,28 +1617,71 @@ class LinkedInScraper:
 
         return jobs_data
 
-    def set_existing_jobs_unseen(self, search_id: str):
-        """Set all existing jobs for a search criteria to unseen without changing active status."""
+    def read_results_count(self) -> Optional[int]:
+        """Total number of results shown above the results list, or None if it cannot be read."""
         try:
-            update_result = self.collection.update_many(
-                {"search_id": search_id},
-                {"$set": {"seen": False}}
-            )
-            logger.info(f"Set {update_result.modified_count} existing jobs to unseen for search_id: {search_id}")
-            return update_result.modified_count
+            selector, elements = self.selector_registry.find_any(self.driver, 'results_count')
+            if elements:
+                return parse_results_count(elements[0].text)
         except Exception as e:
-            logger.error(f"Error setting jobs to unseen: {str(e)}")
-            return 0
+            logger.warning(f"Failed to read the results count: {str(e)}")
+        return None
+
+    def start_run(self, input_file: str, resume: bool = False) -> str:
+        """Start a new scrape run, or resume the latest run if it did not finish, and return its generation id."""
+        if resume:
+            run_id = self.mongo.execute(self.checkpoint.resumable_run)
+            if run_id:
+                # Keeping the generation id means jobs saved before the interruption still count as seen
+                self.run_id = run_id
+                self.checkpoint.resume(run_id)
+                self.mongo.execute(self.known_jobs.load_run, run_id)
+                self.mongo.execute(self.known_jobs.release_claims, run_id)
+                return self.run_id
+            logger.warning("No unfinished latest run to resume, starting a new one")
+
+        self.run_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        logger.info(f"Starting scrape run {self.run_id}")
+        self.mongo.execute(self.checkpoint.start, self.run_id, input_file)
+        return self.run_id
+
+    def join_run(self, run_id: str, resuming: bool = False):
+        """Take part in a run another process started; the jobs it saves carry the same generation id."""
+        self.run_id = run_id
+        self.checkpoint.join(run_id, resuming)
+
+    def save_checkpoint(self, search_id: str, page: int, card_offset: int, job_id: str = None):
+        """Record search progress; a failed write only costs resume precision, so it is not fatal."""
+        try:
+            self.mongo.execute(self.checkpoint.record, search_id, page, card_offset, job_id)
+        except Exception as e:
+            logger.warning(f"Failed to save checkpoint for search_id {search_id}: {str(e)}")
 
     def set_unseen_jobs_inactive(self, search_id: str):
-        """Set active to false for all jobs that were not seen in the current scrape."""
+        """Drop a search from the jobs it no longer shows; deactivate jobs no search shows any more."""
         try:
+            not_seen_this_run = {"last_seen_run": {"$ne": self.run_id}, "active": {"$ne": False}}
+            # Served by the (search_ids, last_seen_run) index; only the dropped jobs are touched after this
+            dropped_ids = [
+                job['job_id'] for job in self.collection.find(
+                    {"search_ids": search_id, **not_seen_this_run}, {"job_id": 1, "_id": 0}
+                )
+            ]
+            if dropped_ids:
+                self.collection.update_many(
+                    {"job_id": {"$in": dropped_ids}, **not_seen_this_run},
+                    {"$pull": {"search_ids": search_id}}
+                )
             update_result = self.collection.update_many(
                 {
-                    "search_id": search_id,
-                    "seen": False
+                    "$or": [
+                        {"job_id": {"$in": dropped_ids}, "search_ids": []},
+                        # Jobs stored before search_ids existed belong to search_id alone
+                        {"search_id": search_id, "search_ids": {"$exists": False}}
+                    ],
+                    **not_seen_this_run
                 },
-                {"$set": {"active": False}}
+                {"$set": {"active": False, "seen": False}}
             )
             logger.info(f"Set {update_result.modified_count} unseen jobs to inactive for search_id: {search_id}")
             return update_result.modified_count
@@ -1594,21 +1689,45 @@ class LinkedInScraper:
             logger.error(f"Error setting unseen jobs to inactive: {str(e)}")
             return 0
 
+    def persist_job(self, job_data: Dict):
+        """Download the logo, print and save one job; runs on the persistence thread."""
+        logo_url = job_data.pop('logo_url', None)
+        if logo_url:
+            job_data['c_logo'] = self.logo_store.result(logo_url)
+
+        if self.apply_resolver.is_pending(job_data['job_id']):
+            job_data['apply_url'] = self.apply_resolver.result(job_data['job_id'])
+            if self.apply_resolver.was_unresolved(job_data['job_id']):
+                # The writer keeps an already stored apply_url instead of this fallback
+                job_data['apply_url_unresolved'] = True
+
+        # Print job details to terminal
+        self.print_job_details(job_data)
+
+        self.save_job_to_mongodb(job_data)
+
+    def flush_jobs_if_due(self):
+        """Flush buffered jobs once the writer's age limit passes; runs when the persistence thread is idle."""
+        self.mongo.execute(self.job_writer.flush_if_due)
+
+    def report_persistence_errors(self):
+        """Log errors raised on the persistence thread since the last check."""
+        for job_data, error in self.persistence.pop_errors():
+            job_id = job_data.get('job_id', 'unknown') if job_data else 'n/a'
+            logger.error(f"Persistence failed for job {job_id}: {str(error)}")
+            print(f"Failed to save job {job_id}: {str(error)}")
+
+    def finish_persistence(self):
+        """Wait for queued jobs to be persisted and flush the writer."""
+        self.persistence.drain()
+        self.mongo.execute(self.job_writer.flush)
+        self.report_persistence_errors()
+
     def save_job_to_mongodb(self, job_data: Dict):
-        """Save or update job in MongoDB."""
+        """Queue a job for a buffered bulk upsert into MongoDB."""
         try:
             logger.info(f"Attempting to save job {job_data.get('job_id', 'unknown')} to MongoDB")
             
-            # Verify MongoDB connection before saving
-            if not self.check_mongodb_connection():
-                logger.error("MongoDB connection lost, attempting to reconnect...")
-                self.mongo_client = MongoClient('mongodb://localhost:27017/')
-                self.db = self.mongo_client['linkedin_jobs']
-                self.collection = self.db['jobdetails']
-                if not self.check_mongodb_connection():
-                    raise Exception("Failed to reconnect to MongoDB")
-                logger.info("Successfully reconnected to MongoDB")
-
             # Ensure job_id is not None
             if not job_data.get('job_id'):
                 logger.error("Cannot save job with null job_id")
@@ -1619,71 +1738,9 @@ class LinkedInScraper:
                 logger.error("Cannot save job without search_id")
                 return
 
-            # Log the job data being saved
-            logger.info(f"Job data to save: {json.dumps(job_data, indent=2)}")
-
-            # Check if job already exists
-            existing_job = self.collection.find_one(
-                {"job_id": job_data['job_id']}
-            )
-
-            if existing_job:
-                logger.info(f"Job {job_data['job_id']} already exists in database")
-                
-                # Update existing job and set seen and active to true
-                update_result = self.collection.update_one(
-                    {"job_id": job_data['job_id']},
-                    {
-                        "$set": {
-                            "seen": True,
-                            "active": True,
-                            "search_id": job_data['search_id'],
-                            "job_title": job_data['job_title'],
-                            "job_location": job_data['job_location'],
-                            "company_name": job_data['company_name'],
-                            "employment_type": job_data['employment_type'],
-                            "salary_range": job_data['salary_range'],
-                            "work_location_type": job_data['work_location_type'],
-                            "posted_date": job_data['posted_date'],
-                            "apply_button_label": job_data['apply_button_label'],
-                            "apply_url": job_data['apply_url'],
-                            "seniority_level": job_data['seniority_level'],
-                            "industry": job_data['industry'],
-                            "comp_desc": job_data['comp_desc'],
-                            "tech_skills": job_data['tech_skills'],
-                            "benefits": job_data['benefits'],
-                            "qualifications": job_data['qualifications'],
-                            "full_job_description": job_data['full_job_description'],
-                            "c_logo": job_data['c_logo'],
-                            "extract_date": job_data['extract_date'],
-                            "domain_name": job_data['domain_name'],
-                            "software_name": job_data['software_name'],
-                            "contract_duration": job_data['contract_duration'],
-                            "expected_hours_per_week": job_data['expected_hours_per_week'],
-                            "required_skills": job_data['required_skills'],
-                            "llm_converted": job_data['llm_converted']
-                        }
-                    }
-                )
-                logger.info(f"Update result: {update_result.modified_count} documents modified")
-                logger.info(f"Updated existing job {job_data['job_id']}")
-            else:
-                logger.info(f"Job {job_data['job_id']} is new, inserting into database")
-                # For new jobs, set seen and active to true
-                job_data['seen'] = True
-                job_data['active'] = True
-                
-                # Insert the job data
-                insert_result = self.collection.insert_one(job_data)
-                logger.info(f"Insert result: {insert_result.inserted_id}")
-                logger.info(f"Added new job {job_data['job_id']}")
-
-            # Verify the save operation
-            saved_job = self.collection.find_one({"job_id": job_data['job_id']})
-            if saved_job:
-                logger.info(f"Successfully verified job {job_data['job_id']} in database")
-            else:
-                logger.error(f"Failed to verify job {job_data['job_id']} in database")
+            # Buffer the job; the writer flushes in bulk once its size or age limit is reached
+            self.mongo.execute(self.job_writer.add, job_data)
+            logger.info(f"Buffered job {job_data['job_id']} for MongoDB ({len(self.job_writer)} pending)")
 
         except Exception as e:
             logger.error(f"Error saving job to MongoDB: {str(e)}")
@@ -1736,11 +1793,6 @@ class LinkedInScraper:
             
             if search_criteria:
                 logger.info(f"Found existing search criteria with ID: {search_criteria['_id']}")
-                # Increment iteration count
-                self.search_criteria_collection.update_one(
-                    {"_id": search_criteria['_id']},
-                    {"$inc": {"iteration": 1}}
-                )
                 return str(search_criteria['_id'])
             
             # Create new search criteria if not found
@@ -1750,7 +1802,7 @@ class LinkedInScraper:
                 "domain": domain,
                 "software": software,
                 "created_at": datetime.now().isoformat(),
-                "iteration": 1  # Start with iteration 1
+                "iteration": 0  # Counted by count_iteration when the search actually runs
             }
             
             result = self.search_criteria_collection.insert_one(new_search)
@@ -1761,63 +1813,148 @@ class LinkedInScraper:
             logger.error(f"Error in get_or_create_search_criteria: {str(e)}")
             raise
 
-    def scrape_jobs(self, input_file: str, output_file: str):
-        """Main method to scrape jobs based on input CSV."""
+    def count_iteration(self, search_id: str):
+        """Increment the search's iteration count; called only for searches that are crawled."""
         try:
-            # Read input CSV
-            input_df = pd.read_csv(input_file)
+            self.search_criteria_collection.update_one({"_id": ObjectId(search_id)}, {"$inc": {"iteration": 1}})
+        except Exception as e:
+            logger.error(f"Failed to count iteration for search_id {search_id}: {str(e)}")
+
+    def plan_searches(self, input_file: str) -> List[Tuple]:
+        """Resolve the CSV rows to search criteria and return the searches due this run, best first.
+
+        Each entry is (search_id, job_title, location, domain, software, job_limit, plan).
+        """
+        input_df = pd.read_csv(input_file)
+
+        searches = {}
+        for _, row in input_df.iterrows():
+            job_title = row['Role']
+            location = row['Location']
+            domain = row['Domain']
+            software = row['Software']
             
+            # Get job limit from CSV (if specified)
+            job_limit = None
+            if 'Limit' in row and pd.notna(row['Limit']):
+                try:
+                    job_limit = int(row['Limit'])
+                    logger.info(f"Job limit set to {job_limit} for {job_title} in {location}")
+                except ValueError:
+                    logger.warning(f"Invalid job limit value for {job_title} in {location}, will scrape all jobs")
+
+            # Get or create search criteria and get search_id
+            search_id = self.get_or_create_search_criteria(job_title, location, domain, software)
+            searches[search_id] = (job_title, location, domain, software, job_limit)
+
+        plans = {search_id: self.mongo.execute(self.scheduler.plan, search_id) for search_id in searches}
+        for search_id, plan in plans.items():
+            if not plan.crawl:
+                job_title, location, _, software, _ = searches[search_id]
+                logger.info(f"Not crawling {software} {job_title} in {location} this run: {plan.reason}")
+
+        # Highest expected yield first, so a time budget is spent where new postings appear
+        return [(search_id, *searches[search_id], plans[search_id]) for search_id in self.scheduler.order(plans)]
+
+    def run_search(self, search: Tuple, output_file: str) -> List[Dict]:
+        """Scrape one planned search, sweep its unseen jobs and record its statistics."""
+        search_id, job_title, location, domain, software, job_limit, plan = search
+
+        # When resuming, searches this run already finished are skipped
+        progress = self.mongo.execute(self.checkpoint.begin_search, search_id)
+        if progress.done:
+            logger.info(f"Skipping {software} {job_title} in {location}, finished before the interruption")
+            return []
+
+        logger.info(f"Searching for: {software} {job_title} in {location} ({plan.reason})")
+        print(f"\nSearching for: {software} {job_title} in {location}")
+        
+        search_started_at = datetime.now().isoformat()
+        search_started = time.monotonic()
+        totals_before = dict(self.job_writer.totals)
+        search_url = self.search_jobs(job_title, location, software)
+        if not search_url:
+            return []
+
+        # A search resumed part-way was already counted before the interruption
+        if progress.page == 1 and not progress.handled:
+            self.mongo.execute(self.count_iteration, search_id)
+
+        try:
+            jobs_data = self.process_search_results(
+                search_url, output_file, domain, software, search_id, job_limit, progress, plan.max_pages
+            )
+
+            # Write any queued and buffered jobs before the sweep reads their run stamps
+            self.mongo.execute(self.known_jobs.flush, search_id, self.run_id)
+            self.finish_persistence()
+            self.selector_registry.save()
+
+            skipped = self.known_jobs.skipped
+            logger.info(
+                f"Known jobs: {self.known_jobs.stats['new']} new, {self.known_jobs.stats['stale']} stale, "
+                f"{self.known_jobs.stats['skipped']} skipped as fresh, "
+                f"{self.known_jobs.stats['duplicates']} already extracted this run"
+            )
+
+            inactivated = 0
+            if jobs_data or skipped or progress.handled:
+                # After scraping, set active to false for any jobs this run did not stamp;
+                # a depth-limited pass did not see the deeper pages, so it cannot judge them
+                if not self.search_stats['depth_capped']:
+                    inactivated = self.set_unseen_jobs_inactive(search_id)
+            self.mongo.execute(self.checkpoint.finish_search, search_id)
+
+            totals = self.job_writer.totals
+            self.mongo.execute(self.scheduler.record, search_id, self.run_id, search_started_at, {
+                'new': totals['inserted'] - totals_before['inserted'],
+                'changed': totals['modified'] - totals_before['modified'],
+                'unchanged': totals['unchanged'] - totals_before['unchanged'],
+                'inactivated': inactivated,
+                'visited': len(jobs_data),
+                'skipped': skipped,
+                'pages': self.search_stats['pages'],
+                'last_new_page': self.search_stats['last_new_page'],
+                'depth_capped': self.search_stats['depth_capped'],
+                'minutes': (time.monotonic() - search_started) / 60
+            })
+            return jobs_data
+        except Exception as e:
+            logger.error(f"Error processing search results: {str(e)}")
+            return []
+
+    def scrape_jobs(self, input_file: str, output_file: str, resume: bool = False):
+        """Main method to scrape jobs based on input CSV; with resume, continue the last unfinished run."""
+        try:
             # Initialize output DataFrame
             all_jobs_data = []
 
+            # Every job saved from here on is stamped with this run's generation id
+            self.start_run(input_file, resume)
+            self.persistence.start()
+
             # Login to LinkedIn
             if not self.login():
                 raise Exception("Failed to login to LinkedIn")
 
-            # Process each job title and location combination
-            for _, row in input_df.iterrows():
-                job_title = row['Role']
-                location = row['Location']
-                domain = row['Domain']
-                software = row['Software']
-                
-                # Get job limit from CSV (if specified)
-                job_limit = None
-                if 'Limit' in row and pd.notna(row['Limit']):
-                    try:
-                        job_limit = int(row['Limit'])
-                        logger.info(f"Job limit set to {job_limit} for {job_title} in {location}")
-                    except ValueError:
-                        logger.warning(f"Invalid job limit value for {job_title} in {location}, will scrape all jobs")
-
-                # Get or create search criteria and get search_id
-                search_id = self.get_or_create_search_criteria(job_title, location, domain, software)
-                
-                # Check if this is first iteration (no existing jobs)
-                existing_jobs_count = self.collection.count_documents({"search_id": search_id})
-                
-                if existing_jobs_count > 0:
-                    # Subsequent iteration: Set all jobs to unseen
-                    self.set_existing_jobs_unseen(search_id)
+            run_started = time.monotonic()
+            time_budget = SCHEDULER_CONFIG['time_budget_minutes']
+            searches = self.plan_searches(input_file)
+            for position, search in enumerate(searches):
+                if time_budget is not None and time.monotonic() - run_started >= time_budget * 60:
+                    logger.info(f"Time budget of {time_budget} minutes used, leaving {len(searches) - position} searches")
+                    break
+                all_jobs_data.extend(self.run_search(search, output_file))
 
-                logger.info(f"Searching for: {software} {job_title} in {location}")
-                print(f"\nSearching for: {software} {job_title} in {location}")
-                
-                search_url = self.search_jobs(job_title, location, software)
-                if search_url:
-                    try:
-                        jobs_data = self.process_search_results(search_url, output_file, domain, software, search_id, job_limit)
-                        if jobs_data:
-                            all_jobs_data.extend(jobs_data)
-                            
-                            # After scraping, set active to false for any jobs that weren't seen
-                            if existing_jobs_count > 0:
-                                self.set_unseen_jobs_inactive(search_id)
-                    except Exception as e:
-                        logger.error(f"Error processing search results: {str(e)}")
+            self.mongo.execute(self.checkpoint.finish_run)
+            self.log_run_summary()
 
+            minutes = (time.monotonic() - run_started) / 60
             if all_jobs_data:
-                logger.info(f"Successfully scraped {len(all_jobs_data)} jobs")
+                logger.info(
+                    f"Successfully scraped {len(all_jobs_data)} jobs in {minutes:.1f} minutes "
+                    f"({len(all_jobs_data) / max(minutes, 0.01):.1f} jobs/min)"
+                )
                 print(f"\nSuccessfully scraped {len(all_jobs_data)} jobs")
             else:
                 logger.warning("No jobs were scraped successfully")
@@ -1826,19 +1963,70 @@ class LinkedInScraper:
             logger.error(f"An error occurred during scraping: {str(e)}")
             print(f"An error occurred during scraping: {str(e)}")
         finally:
-            try:
-                if self.driver:
-                    self.driver.quit()
-            except:
-                pass
+            self.close()
+
+    def log_run_summary(self):
+        """Log cache, WebDriver command and selector statistics for this scraper."""
+        if self.llm_cache:
+            cache_stats = self.llm_cache.stats()
+            logger.info(
+                f"LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.0%} hit rate)"
+            )
+
+        for mode, average in self.command_counter.summary().items():
+            logger.info(f"WebDriver commands per job ({mode} extraction): {average:.1f}")
+
+        for group, rows in self.selector_registry.summary().items():
+            best = rows[0]
+            logger.info(
+                f"Selectors for {group}: best {best['selector']} "
+                f"({best['hit_rate']:.0%} hit rate, {best['mean_latency']:.2f}s mean wait)"
+            )
+
+    def close(self):
+        """Flush pending work and shut down the background workers and the browser."""
+        try:
+            self.persistence.close()
+            self.mongo.execute(self.job_writer.flush)
+            self.report_persistence_errors()
+        except Exception as e:
+            logger.error(f"Failed to flush buffered jobs: {str(e)}")
+        self.selector_registry.save()
+        self.apply_resolver.close()
+        self.logo_store.close()
+        logger.info(f"Company logos: {self.logo_store.stats}")
+        resolver_stats = self.apply_resolver.stats
+        logger.info(
+            f"Apply URLs: {resolver_stats['resolved']} resolved, {resolver_stats['cached']} cached, "
+            f"{resolver_stats['failed']} failed"
+        )
+        self.llm_client.close()
+        try:
+            if self.driver:
+                self.driver.quit()
+        except:
+            pass
+        if self.plugin_dir:
+            shutil.rmtree(self.plugin_dir, ignore_errors=True)
+            self.plugin_dir = None
 
     def __del__(self):
         """Cleanup when the scraper is destroyed."""
         try:
+            if self.persistence.is_alive():
+                self.persistence.close()
+                self.job_writer.flush()
+        except:
+            pass
+        try:
+            self.apply_resolver.close()
+            self.logo_store.close()
+            self.llm_client.close()
             if self.driver:
                 self.driver.quit()
-            if self.mongo_client:
-                self.mongo_client.close()
+            if self.mongo:
+                self.mongo.close()
         except:
             pass
 
@@ -1851,6 +2039,16 @@ if __name__ == "__main__":
         logger.info("Created .env file. Please update with your LinkedIn credentials.")
         print("Created .env file. Please update with your LinkedIn credentials.")
 
-    # Initialize and run scraper
-    scraper = LinkedInScraper()
-    scraper.scrape_jobs('Input-csv-input-v01.csv', 'linkedin_jobs_output.csv') 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape LinkedIn jobs for the searches in the input CSV")
+    parser.add_argument('--resume', action='store_true', help="Continue the last unfinished run from its checkpoints")
+    parser.add_argument('--workers', type=int, default=WORKER_POOL_CONFIG['workers'],
+                        help="Browser processes to run the searches on, sharing one rate cap")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        from worker_pool import run_pool
+        run_pool('Input-csv-input-v01.csv', 'linkedin_jobs_output.csv', workers=args.workers, resume=args.resume)
+    else:
+        # Initialize and run scraper
+        scraper = LinkedInScraper()
+        scraper.scrape_jobs('Input-csv-input-v01.csv', 'linkedin_jobs_output.csv', resume=args.resume)
\ No newline at end of file
@@ -0,0 +1,110 @@
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+from pymongo import ASCENDING, ReturnDocument
+from config import LLM_CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_description(description: str) -> str:
+    """Collapse whitespace so trivially reformatted reposts share a cache entry."""
+    return ' '.join(description.split())
+
+
+class LLMFieldCache:
+    """Content-addressed MongoDB cache of LLM-extracted job fields with size-based LRU eviction."""
+
+    def __init__(self, collection, prompt_version: int, max_size_mb: float = None):
+        if max_size_mb is None:
+            max_size_mb = LLM_CACHE_CONFIG['max_size_mb']
+
+        self.prompt_version = prompt_version
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_eviction = 0
+        self._lock = threading.Lock()
+        self.bind(collection)
+
+    def bind(self, collection):
+        """Point the cache at a (possibly reconnected) collection."""
+        self.collection = collection
+
+    def make_key(self, description: str) -> str:
+        """Hash the normalized description together with the prompt version."""
+        content = f"v{self.prompt_version}\n{normalize_description(description)}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def get(self, description: str) -> Optional[Dict]:
+        """Return cached fields for a description, refreshing its LRU timestamp."""
+        entry = self.collection.find_one_and_update(
+            {"_id": self.make_key(description)},
+            {"$set": {"last_used_at": datetime.now().isoformat()}, "$inc": {"hits": 1}},
+            projection={"fields": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        with self._lock:
+            if entry:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry['fields'] if entry else None
+
+    def put(self, description: str, fields: Dict):
+        """Store extracted fields and evict least recently used entries when over budget."""
+        now = datetime.now().isoformat()
+        self.collection.update_one(
+            {"_id": self.make_key(description)},
+            {
+                "$set": {
+                    "fields": fields,
+                    "prompt_version": self.prompt_version,
+                    "size": len(json.dumps(fields).encode('utf-8')),
+                    "last_used_at": now
+                },
+                "$setOnInsert": {"created_at": now, "hits": 0}
+            },
+            upsert=True
+        )
+
+        with self._lock:
+            self._puts_since_eviction += 1
+            due = self._puts_since_eviction >= LLM_CACHE_CONFIG['eviction_check_interval']
+            if due:
+                self._puts_since_eviction = 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache is back under its size budget."""
+        totals = list(self.collection.aggregate([{"$group": {"_id": None, "bytes": {"$sum": "$size"}}}]))
+        total_bytes = totals[0]['bytes'] if totals else 0
+        if total_bytes <= self.max_bytes:
+            return 0
+
+        target = self.max_bytes * LLM_CACHE_CONFIG['eviction_target_ratio']
+        evict_ids = []
+        for entry in self.collection.find({}, {"size": 1}).sort("last_used_at", ASCENDING):
+            if total_bytes <= target:
+                break
+            evict_ids.append(entry['_id'])
+            total_bytes -= entry.get('size', 0)
+
+        if evict_ids:
+            self.collection.delete_many({"_id": {"$in": evict_ids}})
+            logger.info(f"Evicted {len(evict_ids)} LLM cache entries to stay under {self.max_bytes} bytes")
+        return len(evict_ids)
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters for this process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,373 @@
+import io
+import json
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence
+from llm_cache import LLMFieldCache
+from rule_extractor import RuleBasedExtractor
+from description_preprocessor import prepare_description, token_counts
+from config import LLM_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the extraction prompt or model changes so cached results are not reused
+LLM_PROMPT_VERSION = 3
+
+# Job fields filled in by the extractor, with the instruction given to the model for each
+LLM_FIELD_DESCRIPTIONS = {
+    'industry': "The main industry or domain this job belongs to",
+    'tech_skills': "Comma-separated technical skills, programming languages, tools, and technologies required",
+    'benefits': "Comma-separated benefits and perks offered",
+    'qualifications': "Comma-separated required academic qualifications",
+    'contract_duration': "The duration of the contract if mentioned (e.g. \"6 months\", \"1 year\", \"Permanent\")",
+    'expected_hours_per_week': "The expected working hours per week if mentioned",
+    'required_skills': "Comma-separated specific skills required for the job"
+}
+LLM_FIELDS = tuple(LLM_FIELD_DESCRIPTIONS)
+
+SYSTEM_PROMPT = (
+    "You are a job description analyzer. Extract specific information from job descriptions and reply "
+    "with JSON only. If information is not found, use \"Not Applicable\". Do not make assumptions or provide "
+    "default values. For skills fields, make sure to list all technical skills, programming languages, tools, "
+    "and technologies mentioned."
+)
+
+
+def default_fields() -> Dict:
+    """Return every extracted field set to 'Not Applicable'."""
+    return {field: 'Not Applicable' for field in LLM_FIELDS}
+
+
+def job_fields_schema(fields: Sequence[str] = LLM_FIELDS) -> Dict:
+    """JSON schema for the fields extracted from one job description."""
+    return {
+        "type": "object",
+        "properties": {
+            field: {"type": "string", "description": LLM_FIELD_DESCRIPTIONS[field]}
+            for field in fields
+        },
+        "required": list(fields),
+        "additionalProperties": False
+    }
+
+
+def packed_fields_schema(fields: Sequence[str] = LLM_FIELDS) -> Dict:
+    """JSON schema for several job descriptions answered in one response."""
+    job_schema = job_fields_schema(fields)
+    job_schema["properties"] = {"job_id": {"type": "string"}, **job_schema["properties"]}
+    job_schema["required"] = ["job_id"] + job_schema["required"]
+    return {
+        "type": "object",
+        "properties": {"jobs": {"type": "array", "items": job_schema}},
+        "required": ["jobs"],
+        "additionalProperties": False
+    }
+
+
+def parse_fields(data: Dict, requested: Sequence[str] = LLM_FIELDS) -> Dict:
+    """Normalize one job's JSON answer into the stored field shape."""
+    fields = default_fields()
+    for field in requested:
+        value = data.get(field)
+        if isinstance(value, list):
+            value = ', '.join(str(item).strip() for item in value if str(item).strip())
+        if value is None:
+            continue
+        value = str(value).strip()
+        if value and value.lower() != 'not applicable':
+            fields[field] = value
+    return fields
+
+
+class JobFieldExtractor:
+    """Extract structured fields from job descriptions with OpenAI, backed by an optional cache."""
+
+    def __init__(self, client, cache: Optional[LLMFieldCache] = None, model: str = None,
+                 rules: Optional[RuleBasedExtractor] = None, llm=None):
+        self.client = client
+        self.llm = llm
+        self.cache = cache
+        self.model = model or LLM_CONFIG['model']
+        self.rules = rules
+        self.stats = {'rule_only': 0, 'llm_requests': 0, 'fields_from_rules': 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def pack_size(self) -> int:
+        """Descriptions per packed request, so each keeps its full completion budget within the model's limit."""
+        per_request = LLM_CONFIG['completion_token_limit'] // LLM_CONFIG['max_tokens']
+        return max(1, min(LLM_CONFIG['pack_size'], per_request))
+
+    def field_list_prompt(self, fields: Sequence[str] = LLM_FIELDS) -> str:
+        return '\n'.join(f"- {field}: {LLM_FIELD_DESCRIPTIONS[field]}" for field in fields)
+
+    def resolve_locally(self, job_description: str) -> Dict[str, str]:
+        """Fields the rule-based extractor resolved with enough confidence to skip the LLM."""
+        if not self.rules:
+            return {}
+        try:
+            return self.rules.resolve(job_description)
+        except Exception as e:
+            logger.warning(f"Rule-based extraction failed: {str(e)}")
+            return {}
+
+    def count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def missing_fields(self, resolved: Dict[str, str]) -> List[str]:
+        return [field for field in LLM_FIELDS if field not in resolved]
+
+    def response_format(self, name: str, schema: Dict) -> Dict:
+        """Build the response_format argument for the configured structured output mode."""
+        if LLM_CONFIG['structured_output'] == 'json_schema':
+            return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": True}}
+        return {"type": "json_object"}
+
+    def build_single_request(self, job_description: str, fields: Sequence[str] = LLM_FIELDS) -> Dict:
+        """Build the chat-completions request body for one description."""
+        prompt = (
+            "Analyze the following job description and return a JSON object with these keys:\n"
+            f"{self.field_list_prompt(fields)}\n\n"
+            "Use \"Not Applicable\" for any key whose information is not explicitly mentioned.\n\n"
+            f"Job Description:\n{prepare_description(job_description).text}"
+        )
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": LLM_CONFIG['temperature'],
+            "max_tokens": min(LLM_CONFIG['max_tokens'], LLM_CONFIG['completion_token_limit']),
+            "response_format": self.response_format("job_fields", job_fields_schema(fields))
+        }
+
+    def build_packed_request(self, jobs: List[Dict], fields: Sequence[str] = LLM_FIELDS) -> Dict:
+        """Build one request that covers several short descriptions, answered by job_id."""
+        descriptions = '\n\n'.join(
+            f"### job_id: {job['job_id']}\n{prepare_description(job['full_job_description']).text}" for job in jobs
+        )
+        prompt = (
+            "Analyze each of the following job descriptions. Return a JSON object with a \"jobs\" array "
+            "holding one object per description, each with its \"job_id\" and these keys:\n"
+            f"{self.field_list_prompt(fields)}\n\n"
+            "Use \"Not Applicable\" for any key whose information is not explicitly mentioned.\n\n"
+            f"{descriptions}"
+        )
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": LLM_CONFIG['temperature'],
+            "max_tokens": min(LLM_CONFIG['max_tokens'] * len(jobs), LLM_CONFIG['completion_token_limit']),
+            "response_format": self.response_format("packed_job_fields", packed_fields_schema(fields))
+        }
+
+    def complete(self, request: Dict) -> str:
+        """Send a chat-completions request through the rate-limited client when one is configured."""
+        self.count('llm_requests')
+        if self.llm:
+            return self.llm.complete(request)
+        response = self.client.chat.completions.create(**request)
+        return response.choices[0].message.content
+
+    def cached(self, job_description: str) -> Optional[Dict]:
+        if not self.cache:
+            return None
+        try:
+            return self.cache.get(job_description)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {str(e)}")
+            return None
+
+    def store(self, job_description: str, fields: Dict):
+        if not self.cache:
+            return
+        try:
+            self.cache.put(job_description, fields)
+        except Exception as e:
+            logger.warning(f"Failed to cache OpenAI extraction: {str(e)}")
+
+    def extract(self, job_description: str) -> Dict:
+        """Extract specific fields from job description using OpenAI API, reusing cached results."""
+        cached_fields = self.cached(job_description)
+        if cached_fields:
+            logger.info("Using cached OpenAI extraction for this description")
+            return {**cached_fields, 'llm_converted': 1, **token_counts(job_description)}
+        return {**self.request_fields(job_description), **token_counts(job_description)}
+
+    def request_fields(self, job_description: str) -> Dict:
+        """Resolve what the rules can, call the API for the rest and cache the merged fields."""
+        resolved = self.resolve_locally(job_description)
+        missing = self.missing_fields(resolved)
+        if not missing:
+            logger.info("All fields resolved by rule-based extraction, skipping OpenAI API")
+            return self.finish(job_description, resolved, {})
+
+        try:
+            logger.info(f"Starting OpenAI API extraction for {len(missing)} fields...")
+            result = self.complete(self.build_single_request(job_description, missing))
+            logger.info(f"OpenAI API response:\n{result}")
+            return self.finish(job_description, resolved, parse_fields(json.loads(result), missing))
+
+        except Exception as e:
+            logger.error(f"Error extracting fields from description: {str(e)}")
+            return {**default_fields(), 'llm_converted': 0}
+
+    def finish(self, job_description: str, resolved: Dict[str, str], llm_fields: Dict) -> Dict:
+        """Merge rule-based and LLM fields, cache them and mark the job as converted."""
+        fields = default_fields()
+        fields.update(llm_fields)
+        fields.update(resolved)
+        self.count('fields_from_rules', len(resolved))
+        if not llm_fields:
+            self.count('rule_only')
+        self.store(job_description, fields)
+        return {**fields, 'llm_converted': 1}
+
+    def extract_many(self, jobs: List[Dict]) -> Dict[str, Dict]:
+        """Extract fields for several jobs, packing short descriptions into shared requests."""
+        results = {}
+        short_jobs = []
+        for job in jobs:
+            description = job['full_job_description']
+            cached_fields = self.cached(description)
+            if cached_fields:
+                results[job['job_id']] = {**cached_fields, 'llm_converted': 1}
+            elif len(prepare_description(description).text) <= LLM_CONFIG['pack_max_chars']:
+                short_jobs.append(job)
+            else:
+                results[job['job_id']] = self.request_fields(description)
+
+        for start in range(0, len(short_jobs), self.pack_size):
+            pack = short_jobs[start:start + self.pack_size]
+            results.update(self.extract_pack(pack))
+
+        for job in jobs:
+            results[job['job_id']].update(token_counts(job['full_job_description']))
+        return results
+
+    def extract_pack(self, jobs: List[Dict]) -> Dict[str, Dict]:
+        """Send several short descriptions in one request and map the answers back by job_id."""
+        results = {}
+        resolved_by_id = {}
+        remaining = []
+        for job in jobs:
+            resolved = self.resolve_locally(job['full_job_description'])
+            if self.missing_fields(resolved):
+                resolved_by_id[job['job_id']] = resolved
+                remaining.append(job)
+            else:
+                results[job['job_id']] = self.finish(job['full_job_description'], resolved, {})
+
+        if len(remaining) == 1:
+            results[remaining[0]['job_id']] = self.request_fields(remaining[0]['full_job_description'])
+            return results
+        if not remaining:
+            return results
+
+        # Ask only for the fields that at least one job in the pack still needs
+        missing = [
+            field for field in LLM_FIELDS
+            if any(field not in resolved for resolved in resolved_by_id.values())
+        ]
+        try:
+            logger.info(f"Starting packed OpenAI API extraction for {len(remaining)} descriptions...")
+            answers = json.loads(self.complete(self.build_packed_request(remaining, missing))).get('jobs', [])
+            answers_by_id = {str(answer.get('job_id')): answer for answer in answers if isinstance(answer, dict)}
+
+            for job in remaining:
+                answer = answers_by_id.get(str(job['job_id']))
+                if answer is None:
+                    continue
+                results[job['job_id']] = self.finish(
+                    job['full_job_description'],
+                    resolved_by_id[job['job_id']],
+                    parse_fields(answer, missing)
+                )
+        except Exception as e:
+            logger.error(f"Error in packed extraction, falling back to single requests: {str(e)}")
+
+        # Anything the packed answer missed is retried on its own
+        for job in remaining:
+            if job['job_id'] not in results:
+                results[job['job_id']] = self.request_fields(job['full_job_description'])
+        return results
+
+    def resolve_without_api(self, job_description: str) -> Optional[Dict]:
+        """Finished fields from the cache or the rules alone, or None if the description needs the API."""
+        cached_fields = self.cached(job_description)
+        if cached_fields:
+            return {**cached_fields, 'llm_converted': 1, **token_counts(job_description)}
+        resolved = self.resolve_locally(job_description)
+        if self.missing_fields(resolved):
+            return None
+        return {**self.finish(job_description, resolved, {}), **token_counts(job_description)}
+
+    def submit_batch(self, jobs: List[Dict]) -> str:
+        """Submit descriptions through the OpenAI Batch API and return the batch id.
+
+        Like the streaming path, each request only asks for the fields the rules did not resolve.
+        """
+        lines = []
+        for job in jobs:
+            missing = self.missing_fields(self.resolve_locally(job['full_job_description']))
+            lines.append(json.dumps({
+                "custom_id": str(job['job_id']),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self.build_single_request(job['full_job_description'], missing)
+            }))
+        self.count('llm_requests', len(lines))
+        payload = io.BytesIO('\n'.join(lines).encode('utf-8'))
+        payload.name = 'job_fields_batch.jsonl'
+
+        batch_file = self.client.files.create(file=payload, purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=LLM_CONFIG['batch_completion_window']
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} with {len(jobs)} descriptions")
+        return batch.id
+
+    def collect_batch(self, batch_id: str, jobs: List[Dict]) -> Optional[Dict[str, Dict]]:
+        """Return fields by job_id for a finished batch, None while it is still running.
+
+        Answers are merged with the rule-based fields, cached and counted through the same
+        finish() path as streamed requests.
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ('validating', 'in_progress', 'finalizing'):
+            return None
+        if batch.status != 'completed' or not batch.output_file_id:
+            logger.error(f"OpenAI batch {batch_id} ended with status {batch.status}")
+            return {}
+
+        descriptions = {str(job['job_id']): job['full_job_description'] for job in jobs}
+        results = {}
+        content = self.client.files.content(batch.output_file_id).text
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                description = descriptions.get(record['custom_id'])
+                if description is None:
+                    logger.warning(f"Batch result for unknown job {record['custom_id']}")
+                    continue
+                body = record['response']['body']
+                resolved = self.resolve_locally(description)
+                missing = self.missing_fields(resolved)
+                answer = parse_fields(json.loads(body['choices'][0]['message']['content']), missing)
+                results[record['custom_id']] = {
+                    **self.finish(description, resolved, answer),
+                    **token_counts(description)
+                }
+            except Exception as e:
+                logger.error(f"Failed to parse batch result line: {str(e)}")
+        logger.info(f"Collected {len(results)} results from OpenAI batch {batch_id}")
+        return results
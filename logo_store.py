@@ -0,0 +1,168 @@
+import os
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from config import LOGO_STORE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_EXTENSIONS = {
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+    'image/svg+xml': '.svg'
+}
+
+
+def url_key(url: str) -> str:
+    """Index key for a logo URL."""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+class LogoStore:
+    """Content-addressed company logo store.
+
+    Each logo URL is fetched once per run on a bounded pool over a keep-alive session. The bytes are
+    written to a file named after their SHA-256, so companies sharing a logo share one file. The
+    URL -> file index, with ETag/Last-Modified validators, lives in MongoDB so later runs revalidate
+    with a conditional GET instead of downloading again.
+    """
+
+    def __init__(self, collection=None, directory: str = None, max_workers: int = None, user_agent: str = None):
+        self.collection = collection
+        self.directory = directory or LOGO_STORE_CONFIG['directory']
+        self.session = requests.Session()
+        pool_size = max_workers or LOGO_STORE_CONFIG['max_workers']
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='logo')
+        self.pending = {}
+        self.stats = {'downloaded': 0, 'not_modified': 0, 'reused': 0, 'deduplicated': 0, 'failed': 0}
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def bind(self, collection):
+        self.collection = collection
+
+    def submit(self, logo_url: str) -> Future:
+        """Start storing a logo; concurrent and repeated requests for one URL share a single fetch."""
+        with self._lock:
+            future = self.pending.get(logo_url)
+            if future is None:
+                future = self.executor.submit(self._store, logo_url)
+                self.pending[logo_url] = future
+            return future
+
+    def result(self, logo_url: str, timeout: float = None) -> str:
+        """Local path of the stored logo, or 'Not Applicable' if it could not be stored."""
+        future = self.submit(logo_url)
+        try:
+            return future.result(timeout=timeout or LOGO_STORE_CONFIG['result_timeout'])
+        except Exception as e:
+            logger.error(f"Failed to store company logo: {str(e)}")
+            return 'Not Applicable'
+        finally:
+            # A later request for the URL finds it in the logo index, so the future need not be kept
+            with self._lock:
+                if self.pending.get(logo_url) is future:
+                    del self.pending[logo_url]
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def lookup(self, logo_url: str) -> Optional[Dict]:
+        """Index entry for a URL whose file still exists on disk."""
+        if self.collection is None:
+            return None
+        try:
+            entry = self.collection.find_one({"_id": url_key(logo_url)})
+        except Exception as e:
+            logger.warning(f"Logo index lookup failed: {str(e)}")
+            return None
+        if entry and os.path.exists(entry.get('path', '')):
+            return entry
+        return None
+
+    def _store(self, logo_url: str) -> str:
+        entry = self.lookup(logo_url)
+        if entry:
+            fetched_at = datetime.fromisoformat(entry['fetched_at'])
+            if datetime.now() - fetched_at < timedelta(hours=LOGO_STORE_CONFIG['revalidate_after_hours']):
+                self.count('reused')
+                return entry['path']
+
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = self.session.get(logo_url, headers=headers, timeout=LOGO_STORE_CONFIG['request_timeout'])
+        except Exception as e:
+            self.count('failed')
+            logger.error(f"Failed to download company logo: {str(e)}")
+            return entry['path'] if entry else 'Not Applicable'
+
+        if response.status_code == 304 and entry:
+            self.count('not_modified')
+            self._index(
+                logo_url, entry['path'], entry['content_hash'],
+                response.headers.get('ETag') or entry.get('etag'),
+                response.headers.get('Last-Modified') or entry.get('last_modified')
+            )
+            return entry['path']
+        if response.status_code != 200 or not response.content:
+            self.count('failed')
+            logger.error(f"Failed to download company logo: HTTP {response.status_code}")
+            return entry['path'] if entry else 'Not Applicable'
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        path = os.path.join(self.directory, content_hash[:32] + CONTENT_TYPE_EXTENSIONS.get(content_type, '.png'))
+        if os.path.exists(path):
+            self.count('deduplicated')
+        else:
+            # Write then rename so a concurrent reader never sees a partial file
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(response.content)
+            os.replace(temp_path, path)
+            self.count('downloaded')
+
+        self._index(logo_url, path, content_hash, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return path
+
+    def _index(self, logo_url: str, path: str, content_hash: str, etag: Optional[str], last_modified: Optional[str]):
+        if self.collection is None:
+            return
+        try:
+            self.collection.update_one(
+                {"_id": url_key(logo_url)},
+                {"$set": {
+                    "url": logo_url,
+                    "path": path,
+                    "content_hash": content_hash,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "fetched_at": datetime.now().isoformat()
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to index company logo: {str(e)}")
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
@@ -0,0 +1,134 @@
+import time
+import random
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from pymongo import MongoClient, monitoring
+from pymongo.errors import ConnectionFailure
+from config import MONGODB_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class ServerHealthMonitor(monitoring.ServerHeartbeatListener):
+    """Track server health from pymongo's background heartbeats."""
+
+    def __init__(self):
+        self.healthy = True
+        self.last_success = None
+        self.last_failure = None
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        if not self.healthy:
+            logger.info(f"MongoDB server {event.connection_id} is reachable again")
+        self.healthy = True
+        self.last_success = time.monotonic()
+
+    def failed(self, event):
+        if self.healthy:
+            logger.warning(f"MongoDB heartbeat to {event.connection_id} failed: {event.reply}")
+        self.healthy = False
+        self.last_failure = time.monotonic()
+
+
+class MongoConnectionManager:
+    """Own the MongoDB client, create indexes once and reconnect with backoff on connection failures."""
+
+    def __init__(self, uri: str = None, database_name: str = None,
+                 on_reconnect: Optional[Callable[[], None]] = None):
+        self.uri = uri or MONGODB_CONFIG['uri']
+        self.database_name = database_name or MONGODB_CONFIG['database']
+        self.on_reconnect = on_reconnect
+        self.monitor = ServerHealthMonitor()
+        self.client = None
+        self.db = None
+        # Bumped on every reconnect, so a thread that failed on an older client reuses the new one
+        self.generation = 0
+        self._reconnect_lock = threading.Lock()
+        self._indexes_ready = False
+
+    def connect(self):
+        """Create the client and confirm the server answers a ping."""
+        self.client = MongoClient(
+            self.uri,
+            serverSelectionTimeoutMS=MONGODB_CONFIG['server_selection_timeout_ms'],
+            heartbeatFrequencyMS=MONGODB_CONFIG['heartbeat_frequency_ms'],
+            event_listeners=[self.monitor]
+        )
+        self.db = self.client[self.database_name]
+        self.ping()
+        logger.info("MongoDB connection successful")
+
+    def ping(self) -> bool:
+        """Run a single cheap ping against the server."""
+        self.client.admin.command('ping')
+        return True
+
+    def is_healthy(self) -> bool:
+        """Report health from the heartbeat monitor without a round trip."""
+        return self.client is not None and self.monitor.healthy
+
+    def ensure_indexes(self, index_specs: Dict[str, List[Tuple[object, Dict]]]):
+        """Create the given indexes once for the lifetime of this manager."""
+        if self._indexes_ready:
+            return
+        for collection_name, indexes in index_specs.items():
+            for keys, options in indexes:
+                self.db[collection_name].create_index(keys, **options)
+        self._indexes_ready = True
+        logger.info("MongoDB indexes created/verified")
+
+    def reconnect(self, failed_generation: Optional[int] = None):
+        """Replace the client, retrying with exponential backoff until the server answers.
+
+        Reconnects are serialized. A caller whose failure happened on a client that another thread
+        has already replaced (failed_generation is stale) just uses the new client.
+        """
+        with self._reconnect_lock:
+            if failed_generation is not None and failed_generation != self.generation:
+                logger.info("MongoDB client already replaced by another thread, reusing it")
+                return
+            self._reconnect()
+
+    def _reconnect(self):
+        max_attempts = MONGODB_CONFIG['reconnect_attempts']
+        for attempt in range(1, max_attempts + 1):
+            try:
+                if self.client:
+                    self.client.close()
+                self.connect()
+                self.generation += 1
+                if self.on_reconnect:
+                    self.on_reconnect()
+                logger.info(f"Reconnected to MongoDB on attempt {attempt}")
+                return
+            except ConnectionFailure as e:
+                if attempt == max_attempts:
+                    logger.error(f"Failed to reconnect to MongoDB after {max_attempts} attempts: {str(e)}")
+                    raise
+                delay = min(
+                    MONGODB_CONFIG['reconnect_backoff_max'],
+                    MONGODB_CONFIG['reconnect_backoff_base'] * (2 ** (attempt - 1))
+                )
+                delay += random.uniform(0, delay / 2)
+                logger.warning(f"MongoDB reconnect attempt {attempt} failed, retrying in {delay:.1f}s: {str(e)}")
+                time.sleep(delay)
+
+    def execute(self, operation: Callable, *args, **kwargs):
+        """Run a database operation, reconnecting and retrying once on a connection failure."""
+        generation = self.generation
+        try:
+            return operation(*args, **kwargs)
+        except ConnectionFailure as e:
+            logger.error(f"MongoDB connection lost: {str(e)}")
+            self.reconnect(generation)
+            return operation(*args, **kwargs)
+
+    def close(self):
+        """Close the underlying client."""
+        if self.client:
+            self.client.close()
+            self.client = None
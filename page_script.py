@@ -0,0 +1,78 @@
+import os
+import logging
+from typing import Dict, Optional
+from job_detail_parser import DETAIL_SELECTORS, normalize_detail_fields
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever job_extractor.js changes so pages holding an older copy reload it
+SCRIPT_VERSION = 3
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_extractor.js')
+
+CALL_TEMPLATE = (
+    "var extractor = window.__jobExtractor;"
+    "if (!extractor || extractor.version !== %d) { return {missing: true}; }"
+    "return %s;"
+)
+
+
+def load_script_source() -> str:
+    with open(SCRIPT_PATH, encoding='utf-8') as f:
+        return f.read().replace('__EXTRACTOR_VERSION__', str(SCRIPT_VERSION))
+
+
+class InPageExtractor:
+    """Run the versioned job extractor script inside the page with one execute_script per call."""
+
+    def __init__(self, registry=None):
+        self.source = load_script_source()
+        self.registry = registry
+        self.driver = None
+        self.session_id = None
+
+    def attach(self, driver):
+        """Register the script for every document this driver session loads."""
+        self.driver = driver
+        self.session_id = driver.session_id
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': self.source})
+            logger.info(f"Registered in-page extractor v{SCRIPT_VERSION} for the driver session")
+        except Exception as e:
+            # Without CDP the script is injected into each document the first time it is needed
+            logger.warning(f"Could not register in-page extractor, injecting on demand: {str(e)}")
+
+    def call(self, expression: str, *args):
+        """Evaluate an expression against window.__jobExtractor, loading the script if the page lacks it."""
+        if self.driver is None:
+            raise RuntimeError("InPageExtractor is not attached to a driver")
+        if self.driver.session_id != self.session_id:
+            self.attach(self.driver)
+
+        script = CALL_TEMPLATE % (SCRIPT_VERSION, expression)
+        result = self.driver.execute_script(script, *args)
+        if isinstance(result, dict) and result.get('missing'):
+            # Documents loaded before registration (or without CDP) get the script once here
+            self.driver.execute_script(self.source)
+            result = self.driver.execute_script(script, *args)
+        return result
+
+    def selectors(self, group: str):
+        if self.registry:
+            return self.registry.ordered(group)
+        return DETAIL_SELECTORS[group]
+
+    def extract_details(self) -> Optional[Dict]:
+        """Return job_data fields from the open detail pane, or None if the script failed."""
+        selectors = {group: self.selectors(group) for group in DETAIL_SELECTORS}
+        result = self.call("extractor.extractDetails(arguments[0])", selectors)
+        if not isinstance(result, dict) or 'fields' not in result:
+            logger.error(f"In-page extractor returned no fields: {result}")
+            return None
+        matched = result.get('matched') or {}
+        logger.debug(f"In-page extractor selectors matched: {matched}")
+        if self.registry:
+            for group, selector in matched.items():
+                if selector:
+                    self.registry.record(group, selector, selectors[group])
+        return normalize_detail_fields(result['fields'])
+
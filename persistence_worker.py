@@ -0,0 +1,108 @@
+import queue
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from config import PERSISTENCE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class PersistenceWorker:
+    """Run job persistence on its own thread, fed by a bounded queue."""
+
+    def __init__(self, handler: Callable[[Dict], None], on_idle: Optional[Callable[[], None]] = None,
+                 max_queue_size: int = None, name: str = 'persistence'):
+        if max_queue_size is None:
+            max_queue_size = PERSISTENCE_CONFIG['max_queue_size']
+
+        self.handler = handler
+        self.on_idle = on_idle
+        self.name = name
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._errors = deque()
+        self._thread = None
+        self.processed = 0
+        self.failed = 0
+
+    def start(self):
+        """Start the background thread if it is not already running."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f"Started {self.name} worker")
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, item: Dict):
+        """Hand an item to the worker, blocking while the queue is full."""
+        if not self.is_alive():
+            raise RuntimeError(f"{self.name} worker is not running")
+        while True:
+            try:
+                self._queue.put(item, timeout=PERSISTENCE_CONFIG['put_timeout'])
+                return
+            except queue.Full:
+                logger.warning(f"{self.name} queue is full ({self._queue.qsize()} pending), waiting for it to drain")
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def drain(self):
+        """Block until every submitted item has been handled."""
+        if self.is_alive():
+            self._queue.join()
+
+    def pop_errors(self) -> List[Tuple[Dict, Exception]]:
+        """Return and clear the errors raised by the handler since the last call."""
+        errors = []
+        while self._errors:
+            errors.append(self._errors.popleft())
+        return errors
+
+    def close(self, timeout: float = None):
+        """Drain the queue and stop the background thread."""
+        if timeout is None:
+            timeout = PERSISTENCE_CONFIG['shutdown_timeout']
+        if not self.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error(f"{self.name} worker did not stop within {timeout}s, {self._queue.qsize()} items left")
+        else:
+            logger.info(f"Stopped {self.name} worker after {self.processed} items ({self.failed} failed)")
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=PERSISTENCE_CONFIG['idle_interval'])
+            except queue.Empty:
+                self._idle()
+                continue
+
+            try:
+                if item is _STOP:
+                    self._idle()
+                    return
+                self.handler(item)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"{self.name} worker failed to handle item: {str(e)}")
+                self._errors.append((item, e))
+            finally:
+                self._queue.task_done()
+
+    def _idle(self):
+        if not self.on_idle:
+            return
+        try:
+            self.on_idle()
+        except Exception as e:
+            logger.error(f"{self.name} worker idle callback failed: {str(e)}")
+            self._errors.append((None, e))
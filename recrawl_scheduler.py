@@ -0,0 +1,101 @@
+import logging
+from datetime import datetime
+from statistics import mean
+from typing import Dict, List, NamedTuple, Optional
+from config import SCHEDULER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlPlan(NamedTuple):
+    """Whether to crawl a search this run, how many pages deep, and its expected yield for ordering."""
+    crawl: bool
+    max_pages: Optional[int]
+    priority: float
+    reason: str
+
+
+class RecrawlScheduler:
+    """Decide per search criteria how often and how deep to crawl from the yield of its recent runs.
+
+    Each finished search records one `search_runs` document (new, changed and inactivated jobs,
+    minutes spent, deepest page with a new job). Searches that keep producing new postings are
+    revisited sooner and ranked first; low-churn searches wait longer and are crawled shallower.
+    """
+
+    def __init__(self, collection=None):
+        self.collection = collection
+
+    def bind(self, collection):
+        self.collection = collection
+
+    def history(self, search_id: str) -> List[Dict]:
+        return list(self.collection.find(
+            {"search_id": search_id},
+            sort=[("started_at", -1)],
+            limit=SCHEDULER_CONFIG['history_runs']
+        ))
+
+    def interval_hours(self, runs: List[Dict]) -> float:
+        """Revisit interval: the base interval scaled by how far the recent yield is from the target."""
+        average_yield = mean(run['new'] + run['changed'] for run in runs)
+        ratio = max(average_yield / SCHEDULER_CONFIG['target_new_per_run'], 0.05)
+        interval = SCHEDULER_CONFIG['base_interval_hours'] / ratio
+        return min(max(interval, SCHEDULER_CONFIG['min_interval_hours']), SCHEDULER_CONFIG['max_interval_hours'])
+
+    def plan(self, search_id: str) -> CrawlPlan:
+        if not SCHEDULER_CONFIG['enabled']:
+            return CrawlPlan(True, None, 0.0, "scheduler disabled")
+        try:
+            runs = self.history(search_id)
+        except Exception as e:
+            logger.error(f"Failed to read crawl history, crawling in full: {str(e)}")
+            return CrawlPlan(True, None, 0.0, "crawl history unavailable")
+        if not runs:
+            return CrawlPlan(True, None, float('inf'), "no crawl history")
+
+        interval = self.interval_hours(runs)
+        hours_since = (datetime.now() - datetime.fromisoformat(runs[0]['started_at'])).total_seconds() / 3600
+        # New or changed jobs per minute spent, the figure the time budget is spent by
+        priority = mean(run['new'] + run['changed'] for run in runs) / max(mean(run['minutes'] for run in runs), 0.1)
+        if hours_since < interval:
+            return CrawlPlan(False, None, priority, f"crawled {hours_since:.1f}h ago, next due after {interval:.1f}h")
+
+        # A depth-limited pass skips the inactive sweep and cannot find new depth, so every so
+        # often the search is crawled in full
+        if self.full_pass_due(runs):
+            return CrawlPlan(True, None, priority, f"due after {interval:.1f}h, periodic full-depth pass")
+
+        # Go a little past the deepest page that has recently held a new job
+        deepest = max(run.get('last_new_page') or 0 for run in runs)
+        max_pages = deepest + SCHEDULER_CONFIG['depth_margin_pages']
+        return CrawlPlan(True, max_pages, priority, f"due after {interval:.1f}h, up to {max_pages} pages")
+
+    def full_pass_due(self, runs: List[Dict]) -> bool:
+        """True once the last full_depth_every_runs - 1 runs, or max_interval_hours, were all depth-limited."""
+        # Runs recorded before depth_capped existed are counted as limited
+        capped_runs = 0
+        for run in runs:
+            if not run.get('depth_capped', True):
+                hours_since = (datetime.now() - datetime.fromisoformat(run['started_at'])).total_seconds() / 3600
+                return hours_since >= SCHEDULER_CONFIG['max_interval_hours']
+            capped_runs += 1
+            if capped_runs >= SCHEDULER_CONFIG['full_depth_every_runs'] - 1:
+                return True
+        return True
+
+    def order(self, plans: Dict[str, CrawlPlan]) -> List[str]:
+        """Search ids due this run, highest expected yield first."""
+        due = [search_id for search_id, plan in plans.items() if plan.crawl]
+        return sorted(due, key=lambda search_id: -plans[search_id].priority)
+
+    def record(self, search_id: str, run_id: str, started_at: str, stats: Dict):
+        """Store one search's outcome for this run."""
+        try:
+            self.collection.update_one(
+                {"_id": f"{run_id}|{search_id}"},
+                {"$set": {"search_id": search_id, "run_id": run_id, "started_at": started_at, **stats}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to record search run statistics: {str(e)}")
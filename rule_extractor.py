@@ -0,0 +1,392 @@
+import re
+import logging
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Tuple
+from config import RULE_EXTRACTION_CONFIG
+from description_preprocessor import BULLET, is_heading
+
+logger = logging.getLogger(__name__)
+
+# Skills vocabulary: lowercase keyword -> canonical name. Aliases map onto the same canonical name.
+SKILLS_VOCABULARY = {
+    # SAP / ERP
+    'sap': 'SAP', 'sap erp': 'SAP ERP', 's/4hana': 'SAP S/4HANA', 's4hana': 'SAP S/4HANA',
+    'sap s/4hana': 'SAP S/4HANA', 'sap ecc': 'SAP ECC', 'abap': 'ABAP', 'sap fiori': 'SAP Fiori',
+    'fiori': 'SAP Fiori', 'sapui5': 'SAPUI5', 'sap bw': 'SAP BW', 'sap hana': 'SAP HANA', 'hana': 'SAP HANA',
+    'sap fico': 'SAP FICO', 'sap fi/co': 'SAP FICO', 'sap mm': 'SAP MM', 'sap sd': 'SAP SD', 'sap pp': 'SAP PP',
+    'sap basis': 'SAP Basis', 'sap successfactors': 'SAP SuccessFactors', 'successfactors': 'SAP SuccessFactors',
+    'sap ariba': 'SAP Ariba', 'idoc': 'IDoc', 'bapi': 'BAPI', 'sap pi/po': 'SAP PI/PO', 'sap cpi': 'SAP CPI',
+    'oracle ebs': 'Oracle EBS', 'oracle e-business suite': 'Oracle EBS', 'netsuite': 'NetSuite',
+    'dynamics 365': 'Microsoft Dynamics 365', 'workday': 'Workday', 'salesforce': 'Salesforce',
+    'servicenow': 'ServiceNow',
+    # Languages
+    'python': 'Python', 'java': 'Java', 'javascript': 'JavaScript', 'typescript': 'TypeScript',
+    'c++': 'C++', 'c#': 'C#', '.net': '.NET', 'golang': 'Go', 'rust': 'Rust', 'scala': 'Scala',
+    'kotlin': 'Kotlin', 'swift': 'Swift', 'ruby': 'Ruby', 'php': 'PHP', 'perl': 'Perl',
+    'sql': 'SQL', 'pl/sql': 'PL/SQL', 't-sql': 'T-SQL', 'bash': 'Bash', 'powershell': 'PowerShell',
+    'html': 'HTML', 'css': 'CSS',
+    # Frameworks and libraries
+    'react': 'React', 'angular': 'Angular', 'vue.js': 'Vue.js', 'node.js': 'Node.js', 'nodejs': 'Node.js',
+    'django': 'Django', 'flask': 'Flask', 'fastapi': 'FastAPI', 'spring boot': 'Spring Boot',
+    'spring': 'Spring', 'hibernate': 'Hibernate', 'pandas': 'pandas', 'numpy': 'NumPy',
+    'tensorflow': 'TensorFlow', 'pytorch': 'PyTorch', 'scikit-learn': 'scikit-learn', 'spark': 'Apache Spark',
+    'hadoop': 'Hadoop', 'kafka': 'Kafka', 'airflow': 'Airflow', 'graphql': 'GraphQL', 'rest api': 'REST APIs',
+    'rest apis': 'REST APIs', 'soap': 'SOAP', 'microservices': 'Microservices',
+    # Data stores
+    'mongodb': 'MongoDB', 'postgresql': 'PostgreSQL', 'postgres': 'PostgreSQL', 'mysql': 'MySQL',
+    'oracle database': 'Oracle Database', 'sql server': 'SQL Server', 'redis': 'Redis',
+    'elasticsearch': 'Elasticsearch', 'snowflake': 'Snowflake', 'bigquery': 'BigQuery', 'redshift': 'Redshift',
+    'cassandra': 'Cassandra', 'dynamodb': 'DynamoDB',
+    # Cloud and DevOps
+    'aws': 'AWS', 'amazon web services': 'AWS', 'azure': 'Azure', 'gcp': 'GCP',
+    'google cloud': 'GCP', 'docker': 'Docker', 'kubernetes': 'Kubernetes', 'k8s': 'Kubernetes',
+    'terraform': 'Terraform', 'ansible': 'Ansible', 'jenkins': 'Jenkins', 'git': 'Git', 'github': 'GitHub',
+    'gitlab': 'GitLab', 'ci/cd': 'CI/CD', 'linux': 'Linux', 'unix': 'Unix',
+    # Tools and BI
+    'jira': 'Jira', 'confluence': 'Confluence', 'tableau': 'Tableau', 'power bi': 'Power BI',
+    'excel': 'Excel', 'microsoft excel': 'Excel', 'ms excel': 'Excel', 'selenium': 'Selenium', 'etl': 'ETL', 'informatica': 'Informatica',
+}
+
+# Benefits vocabulary: lowercase keyword -> canonical benefit
+BENEFITS_VOCABULARY = {
+    'health insurance': 'Health insurance', 'medical insurance': 'Health insurance', 'medical': 'Health insurance',
+    'dental': 'Dental insurance', 'vision insurance': 'Vision insurance', 'vision': 'Vision insurance', '401(k)': '401(k)', '401k': '401(k)',
+    'retirement plan': 'Retirement plan', 'pension': 'Retirement plan', 'paid time off': 'Paid time off',
+    'pto': 'Paid time off', 'paid holidays': 'Paid holidays', 'parental leave': 'Parental leave',
+    'maternity leave': 'Parental leave', 'life insurance': 'Life insurance', 'disability insurance': 'Disability insurance',
+    'tuition reimbursement': 'Tuition reimbursement', 'stock options': 'Stock options', 'equity grant': 'Equity',
+    'rsus': 'Equity', 'annual bonus': 'Bonus', 'performance bonus': 'Bonus', 'signing bonus': 'Bonus', 'flexible hours': 'Flexible hours', 'flexible schedule': 'Flexible hours',
+    'remote work': 'Remote work', 'work from home': 'Remote work', 'wellness program': 'Wellness program',
+    'gym membership': 'Wellness program', 'employee assistance program': 'Employee assistance program',
+    'professional development': 'Professional development', 'training budget': 'Professional development',
+}
+
+# Bare coverage words also name industries and company visions, so they only count as benefits
+# inside a benefits section or on a line that talks about coverage
+SECTION_ONLY_BENEFITS = {'medical', 'dental', 'vision'}
+BENEFITS_HEADING = re.compile(
+    r"^\W*(?:benefits|what we offer|perks|compensation|total rewards|why join us)\b.*$", re.I
+)
+BENEFIT_CONTEXT = re.compile(r"\b(?:insurance|coverage|benefits?|plans?)\b", re.I)
+
+# Industry vocabulary: lowercase keyword -> canonical industry
+INDUSTRY_VOCABULARY = {
+    'healthcare': 'Healthcare', 'hospital': 'Healthcare', 'clinical': 'Healthcare', 'pharmaceutical': 'Pharmaceuticals',
+    'life sciences': 'Pharmaceuticals', 'biotech': 'Pharmaceuticals', 'banking': 'Financial Services',
+    'financial services': 'Financial Services', 'fintech': 'Financial Services',
+    # Bare "insurance" is usually a benefit, so only company-context phrases count
+    'insurance company': 'Insurance', 'insurance companies': 'Insurance', 'insurance provider': 'Insurance',
+    'insurance carrier': 'Insurance', 'insurance industry': 'Insurance', 'insurance claims': 'Insurance',
+    'insurer': 'Insurance', 'insurers': 'Insurance',
+    'retail': 'Retail', 'e-commerce': 'Retail', 'ecommerce': 'Retail', 'manufacturing': 'Manufacturing',
+    'automotive': 'Automotive', 'aerospace': 'Aerospace & Defense', 'defense': 'Aerospace & Defense',
+    'oil and gas': 'Energy', 'energy sector': 'Energy', 'renewable energy': 'Energy', 'utilities': 'Utilities', 'telecommunications': 'Telecommunications',
+    'telecom': 'Telecommunications', 'logistics': 'Logistics & Supply Chain', 'supply chain': 'Logistics & Supply Chain',
+    'consulting': 'IT Services & Consulting', 'it services': 'IT Services & Consulting', 'saas': 'Software',
+    'software company': 'Software', 'government': 'Government', 'public sector': 'Government',
+    'higher education': 'Education', 'university': 'Education', 'hospitality': 'Hospitality',
+    'food and beverage': 'Food & Beverage', 'consumer goods': 'Consumer Goods', 'cpg': 'Consumer Goods',
+    'construction': 'Construction', 'real estate': 'Real Estate', 'media and entertainment': 'Media & Entertainment',
+}
+
+# Keywords that are also everyday words are only matched in one of these forms
+# (capitalized, "Microsoft Excel", or as an item of a comma/bullet list)
+AMBIGUOUS_KEYWORDS = {
+    'excel': (
+        re.compile(r"Excel\b(?!\s+(?:in|at|as|on|with)\b)"),
+        re.compile(r"(?:^|[,;/(]|^\s*(?:[-*•●▪]|\d+[.)]))\s*(?:(?:and|or)\s+)?excel(?:\s*[,;/)]|\s*$|\s+(?:and|or)\b)", re.I | re.M)
+    ),
+}
+
+# Headings of sections left out of industry scoring: benefits and qualifications mention
+# insurance, degrees and past domains that say nothing about the hiring company
+INDUSTRY_EXCLUDED_HEADING = re.compile(
+    r"^\W*(?:benefits|what we offer|perks|compensation|requirements|qualifications|required skills|"
+    r"minimum qualifications|basic qualifications|preferred|nice to have|bonus points|"
+    r"what you(?:'|\u2019)?ll need|what you bring|must[- ]haves?|skills (?:and|&) experience)\b.*$",
+    re.I
+)
+
+# Headings that open and close the requirements section of a posting
+REQUIREMENTS_HEADING = re.compile(
+    r"^\W*(?:requirements|qualifications|required skills|minimum qualifications|basic qualifications|"
+    r"what you(?:'|\u2019)?ll need|what you bring|must[- ]haves?|skills (?:and|&) experience)\b.*$",
+    re.I | re.M
+)
+SECTION_END_HEADING = re.compile(
+    r"^\W*(?:preferred|nice to have|bonus points|benefits|what we offer|perks|about us|about the company|"
+    r"compensation|equal opportunity)\b.*$",
+    re.I | re.M
+)
+
+# The LLM is told to answer "Not Applicable" for anything not explicitly mentioned, so a field whose
+# trigger words never appear in the posting can be resolved locally without asking it
+ABSENCE_TRIGGERS = {
+    'contract_duration': re.compile(r"contract|duration|months?|weeks?|years?|temporary|temp\b|permanent|"
+                                    r"fixed[- ]term|assignment|engagement|extension", re.I),
+    'expected_hours_per_week': re.compile(r"hours?|hrs|part[- ]time|full[- ]time|per week|/\s*week|shift", re.I),
+    'benefits': re.compile(r"benefit|insurance|medical|dental|vision|401|pto|paid|leave|holiday|bonus|perk|"
+                           r"pension|retirement|stock|equity|reimburse|wellness|we offer|compensation package", re.I),
+    'qualifications': re.compile(r"degree|bachelor|master|diploma|ph\.?\s?d|mba|b\.?tech|m\.?tech|graduate|"
+                                 r"certific|education", re.I),
+}
+
+# Degree patterns: compiled regex -> canonical qualification
+DEGREE_PATTERNS = [
+    (re.compile(r"\bbachelor'?s?\b|\bb\.?\s?(?:s|a|sc)\.?(?=\s+(?:degree|in)\b)|\bb\.?tech\b|\bb\.?e\.?(?=\s+in\b)", re.I),
+     "Bachelor's degree"),
+    (re.compile(r"\bmaster'?s?\b|\bm\.?\s?(?:s|a|sc)\.?(?=\s+(?:degree|in)\b)|\bm\.?tech\b", re.I), "Master's degree"),
+    (re.compile(r"\bmba\b", re.I), "MBA"),
+    (re.compile(r"\bph\.?\s?d\b|\bdoctorate\b", re.I), "PhD"),
+    (re.compile(r"\bassociate'?s? degree\b", re.I), "Associate's degree"),
+    (re.compile(r"\bhigh school diploma\b|\bged\b", re.I), "High school diploma"),
+]
+
+_NUMBER = r"(\d{1,2}(?:\.\d)?)"
+_DURATION_UNIT = r"(months?|weeks?|years?|yrs?|mos?)"
+
+CONTRACT_DURATION_PATTERNS = [
+    # "6 month contract", "12-month contract-to-hire"
+    re.compile(_NUMBER + r"(?:\s*(?:-|to)\s*" + _NUMBER + r")?\s*[- ]?\s*" + _DURATION_UNIT
+               + r"\s+(?:\w+\s+)?(?:contract|assignment|engagement|project)", re.I),
+    # "contract duration: 6 months", "length of contract - 12 months", "duration: 9+ months"
+    re.compile(r"(?:contract\s+(?:duration|length|term)|duration|length\s+of\s+(?:contract|assignment))\s*[:\-]?\s*"
+               + _NUMBER + r"(?:\s*(?:-|to)\s*" + _NUMBER + r")?\+?\s*" + _DURATION_UNIT, re.I),
+]
+PERMANENT_PATTERN = re.compile(r"\b(?:permanent|direct[- ]hire)\s+(?:role|position|opportunity|job|employment)\b", re.I)
+
+HOURS_PATTERN = re.compile(
+    _NUMBER + r"(?:\s*(?:-|to)\s*" + _NUMBER + r")?\+?\s*(?:hours|hrs)\s*(?:per|/|a|each)\s*(?:week|wk)\b", re.I
+)
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds every vocabulary keyword in one pass over the text."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        for keyword in keywords:
+            self._add(keyword.lower())
+        self._build()
+
+    def _add(self, keyword: str):
+        state = 0
+        for char in keyword:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._output[state].append(keyword)
+
+    def _build(self):
+        # Breadth-first over the trie; depth-one states keep the root as their failure link
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """Return (start, keyword) for every whole-word keyword occurrence."""
+        lowered = text.lower()
+        matches = []
+        state = 0
+        for index, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for keyword in self._output[state]:
+                start = index - len(keyword) + 1
+                before = lowered[start - 1] if start > 0 else ' '
+                after = lowered[index + 1] if index + 1 < len(lowered) else ' '
+                if not before.isalnum() and not (after.isalnum() or after in '+#'):
+                    if keyword in AMBIGUOUS_KEYWORDS and not self._unambiguous(text, start, keyword):
+                        continue
+                    matches.append((start, keyword))
+        return matches
+
+    @staticmethod
+    def _unambiguous(text: str, start: int, keyword: str) -> bool:
+        cased, listed = AMBIGUOUS_KEYWORDS[keyword]
+        if cased.match(text, start):
+            return True
+        line_start = text.rfind('\n', 0, start) + 1
+        line_end = text.find('\n', start)
+        line = text[line_start:line_end if line_end >= 0 else len(text)]
+        return any(m.start() <= start - line_start < m.end() for m in listed.finditer(line))
+
+
+class RuleBasedExtractor:
+    """Resolve job fields locally with regexes and a skills matcher before falling back to the LLM."""
+
+    def __init__(self, vocabulary: Dict[str, str] = None, min_confidence: float = None):
+        self.vocabulary = vocabulary or SKILLS_VOCABULARY
+        self.min_confidence = min_confidence if min_confidence is not None else RULE_EXTRACTION_CONFIG['min_confidence']
+        self.matcher = KeywordMatcher(self.vocabulary)
+        self.benefits_matcher = KeywordMatcher(BENEFITS_VOCABULARY)
+        self.industry_matcher = KeywordMatcher(INDUSTRY_VOCABULARY)
+
+    def extract(self, description: str) -> Dict[str, Dict]:
+        """Return every field found in the description with a confidence score."""
+        found = {}
+
+        duration = self.extract_contract_duration(description)
+        if duration:
+            found['contract_duration'] = duration
+
+        hours = self.extract_hours(description)
+        if hours:
+            found['expected_hours_per_week'] = hours
+
+        qualifications = [name for pattern, name in DEGREE_PATTERNS if pattern.search(description)]
+        if qualifications:
+            found['qualifications'] = {'value': ', '.join(qualifications), 'confidence': 0.8}
+
+        skills = self.extract_skills(description)
+        if skills:
+            # A handful of distinct hits means the posting lists its stack; one or two may be incidental
+            confidence = 0.8 if len(skills) >= RULE_EXTRACTION_CONFIG['min_skill_matches'] else 0.5
+            found['tech_skills'] = {'value': ', '.join(skills), 'confidence': confidence}
+
+        required = self.extract_required_skills(description)
+        if required:
+            confidence = 0.8 if len(required) >= RULE_EXTRACTION_CONFIG['min_skill_matches'] else 0.5
+            found['required_skills'] = {'value': ', '.join(required), 'confidence': confidence}
+
+        benefits = self.extract_benefits(description)
+        if benefits:
+            confidence = 0.8 if len(benefits) >= RULE_EXTRACTION_CONFIG['min_benefit_matches'] else 0.5
+            found['benefits'] = {'value': ', '.join(benefits), 'confidence': confidence}
+
+        industry = self.extract_industry(description)
+        if industry:
+            found['industry'] = industry
+
+        for field, trigger in ABSENCE_TRIGGERS.items():
+            if field not in found and not trigger.search(description):
+                found[field] = {'value': 'Not Applicable', 'confidence': 0.85}
+
+        return found
+
+    def resolve(self, description: str) -> Dict[str, str]:
+        """Return only the fields found with enough confidence to skip the LLM for them."""
+        return {
+            field: result['value']
+            for field, result in self.extract(description).items()
+            if result['confidence'] >= self.min_confidence
+        }
+
+    def extract_contract_duration(self, description: str) -> Dict:
+        for pattern in CONTRACT_DURATION_PATTERNS:
+            match = pattern.search(description)
+            if match:
+                low, high, unit = match.group(1), match.group(2), match.group(3).lower()
+                unit = {'yr': 'year', 'yrs': 'years', 'mo': 'month', 'mos': 'months'}.get(unit, unit)
+                amount = f"{low}-{high}" if high else low
+                if not unit.endswith('s') and amount != '1':
+                    unit += 's'
+                return {'value': f"{amount} {unit}", 'confidence': 0.9}
+        if PERMANENT_PATTERN.search(description):
+            return {'value': 'Permanent', 'confidence': 0.8}
+        return {}
+
+    def extract_hours(self, description: str) -> Dict:
+        match = HOURS_PATTERN.search(description)
+        if not match:
+            return {}
+        low, high = match.group(1), match.group(2)
+        return {'value': f"{low}-{high}" if high else low, 'confidence': 0.9}
+
+    def extract_skills(self, description: str) -> List[str]:
+        return self.canonical_matches(self.matcher, self.vocabulary, description)
+
+    def extract_required_skills(self, description: str) -> List[str]:
+        """Vocabulary skills that appear inside the requirements section of the posting."""
+        heading = REQUIREMENTS_HEADING.search(description)
+        if not heading:
+            return []
+        section = description[heading.end():]
+        end = SECTION_END_HEADING.search(section)
+        if end:
+            section = section[:end.start()]
+        return self.canonical_matches(self.matcher, self.vocabulary, section)
+
+    def extract_industry(self, description: str) -> Dict:
+        """Pick the industry mentioned most often, confident only when it clearly dominates."""
+        text = self.industry_text(description)
+        counts = Counter(INDUSTRY_VOCABULARY[keyword] for _, keyword in self.industry_matcher.find(text))
+        if not counts:
+            return {}
+        ranked = counts.most_common(2)
+        industry, hits = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0
+        # A client's industry often shows up beside the employer's, so a close runner-up means it is unclear
+        confidence = 0.8 if hits >= 2 and hits > 2 * runner_up else 0.5
+        return {'value': industry, 'confidence': confidence}
+
+    def extract_benefits(self, description: str) -> List[str]:
+        """Canonical benefits, counting bare coverage words only where the posting talks about benefits."""
+        lines = description.split('\n')
+        in_section = self.section_lines(description, BENEFITS_HEADING)
+        benefit_lines = [inside or bool(BENEFIT_CONTEXT.search(line)) for line, inside in zip(lines, in_section)]
+        names = []
+        for start, keyword in sorted(self.benefits_matcher.find(description)):
+            if keyword in SECTION_ONLY_BENEFITS and not benefit_lines[description.count('\n', 0, start)]:
+                continue
+            canonical = BENEFITS_VOCABULARY[keyword]
+            if canonical not in names:
+                names.append(canonical)
+        return names
+
+    @classmethod
+    def industry_text(cls, description: str) -> str:
+        """The description without its benefits and qualifications sections."""
+        lines = description.split('\n')
+        excluded = cls.section_lines(description, INDUSTRY_EXCLUDED_HEADING)
+        return '\n'.join(line for line, inside in zip(lines, excluded) if not inside)
+
+    @staticmethod
+    def section_lines(description: str, heading) -> List[bool]:
+        """For each line, whether it belongs to a section opened by a heading matching `heading`."""
+        inside = []
+        in_section = False
+        section_has_content = False
+        after_blank = False
+        for line in description.split('\n'):
+            stripped = line.strip()
+            if heading.match(stripped):
+                in_section, section_has_content, after_blank = True, False, False
+                inside.append(True)
+                continue
+            if in_section:
+                if not stripped:
+                    after_blank = section_has_content
+                    inside.append(True)
+                    continue
+                # A section runs to the next heading or the first paragraph break after its content
+                if is_heading(line) or (after_blank and not BULLET.match(line)):
+                    in_section = False
+                else:
+                    section_has_content = True
+                    inside.append(True)
+                    continue
+            inside.append(False)
+        return inside
+
+    def canonical_matches(self, matcher: KeywordMatcher, vocabulary: Dict[str, str], text: str) -> List[str]:
+        """Canonical names of every vocabulary match, in order of first appearance."""
+        names = []
+        for _, keyword in sorted(matcher.find(text)):
+            canonical = vocabulary[keyword]
+            if canonical not in names:
+                names.append(canonical)
+        return names
@@ -0,0 +1,120 @@
+import logging
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SearchProgress(NamedTuple):
+    """Where a search stopped: the page to reopen, the next card on it and the jobs already handed off."""
+    page: int
+    card_offset: int
+    handled: Dict[str, int]
+    done: bool
+
+
+class RunCheckpoint:
+    """Per-run, per-search progress in MongoDB so an interrupted run can resume where it stopped.
+
+    Each search has one document, `{run_id}|{search_id}`, updated in place with the current page,
+    the card offset and a `handled` map of job_id -> page. The run itself has a document keyed by
+    run_id that is closed when the run finishes.
+    """
+
+    def __init__(self, collection=None, jobs_collection=None):
+        self.collection = collection
+        self.jobs_collection = jobs_collection
+        self.run_id = None
+        self.resuming = False
+
+    def bind(self, collection, jobs_collection):
+        self.collection = collection
+        self.jobs_collection = jobs_collection
+
+    def resumable_run(self) -> Optional[str]:
+        """The newest run, if it did not finish; older unfinished runs are marked abandoned.
+
+        Only the newest run can be resumed: a later run that finished has already covered the
+        searches an older crashed run left open.
+        """
+        doc = self.collection.find_one({"search_id": None}, sort=[("started_at", -1)])
+        if not doc:
+            return None
+        resumable = doc['run_id'] if doc.get('finished_at') is None else None
+        abandoned = self.collection.update_many(
+            {"search_id": None, "finished_at": None, "_id": {"$ne": resumable}},
+            {"$set": {"finished_at": datetime.now().isoformat(), "abandoned": True}}
+        )
+        if abandoned.modified_count:
+            logger.info(f"Marked {abandoned.modified_count} older unfinished runs as abandoned")
+        return resumable
+
+    def start(self, run_id: str, input_file: str):
+        self.run_id = run_id
+        self.resuming = False
+        self.collection.update_one(
+            {"_id": run_id},
+            {"$set": {"run_id": run_id, "search_id": None, "input_file": input_file,
+                      "started_at": datetime.now().isoformat(), "finished_at": None}},
+            upsert=True
+        )
+
+    def resume(self, run_id: str):
+        self.run_id = run_id
+        self.resuming = True
+        logger.info(f"Resuming scrape run {run_id}")
+
+    def join(self, run_id: str, resuming: bool):
+        """Share a run started elsewhere, as a worker process does with its coordinator's run."""
+        self.run_id = run_id
+        self.resuming = resuming
+
+    def begin_search(self, search_id: str) -> SearchProgress:
+        """Progress to resume from; page 1 unless this run already worked on the search."""
+        if not self.resuming:
+            return SearchProgress(1, 0, {}, False)
+        doc = self.collection.find_one({"_id": f"{self.run_id}|{search_id}"})
+        if not doc:
+            return SearchProgress(1, 0, {}, False)
+        if doc.get('done'):
+            return SearchProgress(doc.get('page', 1), 0, {}, True)
+
+        handled = doc.get('handled', {})
+        page = doc.get('page', 1)
+        card_offset = doc.get('card_offset', 0)
+        # Jobs still buffered for a bulk write when the run stopped never reached jobdetails; forget
+        # them and go back to the earliest page one of them was on
+        stored = {
+            d['job_id'] for d in self.jobs_collection.find({"job_id": {"$in": list(handled)}}, {"job_id": 1})
+        }
+        lost = {job_id: job_page for job_id, job_page in handled.items() if job_id not in stored}
+        if lost:
+            logger.info(f"{len(lost)} jobs handled before the interruption were not saved, revisiting them")
+            handled = {job_id: job_page for job_id, job_page in handled.items() if job_id in stored}
+            if min(lost.values()) <= page:
+                page, card_offset = min(lost.values()), 0
+        logger.info(f"Resuming search {search_id} at page {page}, card {card_offset + 1}, {len(handled)} jobs done")
+        return SearchProgress(page, card_offset, handled, False)
+
+    def record(self, search_id: str, page: int, card_offset: int, job_id: str = None):
+        """Move the search's checkpoint forward; one small in-place update."""
+        fields = {
+            "run_id": self.run_id,
+            "search_id": search_id,
+            "page": page,
+            "card_offset": card_offset,
+            "updated_at": datetime.now().isoformat()
+        }
+        if job_id:
+            fields[f"handled.{job_id}"] = page
+        self.collection.update_one({"_id": f"{self.run_id}|{search_id}"}, {"$set": fields}, upsert=True)
+
+    def finish_search(self, search_id: str):
+        self.collection.update_one(
+            {"_id": f"{self.run_id}|{search_id}"},
+            {"$set": {"done": True, "updated_at": datetime.now().isoformat()}},
+            upsert=True
+        )
+
+    def finish_run(self):
+        self.collection.update_one({"_id": self.run_id}, {"$set": {"finished_at": datetime.now().isoformat()}})
@@ -0,0 +1,91 @@
+import re
+import math
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+from config import SEARCH_URL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def build_search_url(keywords: str, geo_id: str, start: int = 0) -> str:
+    """LinkedIn job search results URL for a query and a location geoId."""
+    params = {'keywords': keywords, 'geoId': geo_id}
+    if start:
+        params['start'] = start
+    return f"{SEARCH_URL_CONFIG['search_url']}?{urlencode(params)}"
+
+
+def geo_id_from_url(url: str) -> Optional[str]:
+    """The geoId LinkedIn put in a search results URL, if any."""
+    values = parse_qs(urlparse(url).query).get('geoId')
+    return values[0] if values else None
+
+
+def parse_results_count(text: str) -> Optional[int]:
+    """Total from a results subtitle such as '1,234 results', '1K+ results' or '1.5K+ results'."""
+    match = re.search(r'(\d[\d,.]*)\s*(K)?\+?\s*results?', text or '', re.IGNORECASE)
+    if not match:
+        return None
+    if match.group(2):
+        # The point is a decimal point in abbreviated counts
+        return int(float(match.group(1).replace(',', '')) * 1000)
+    return int(re.sub(r'[,.]', '', match.group(1)))
+
+
+def last_page(total_results: int) -> int:
+    """Number of result pages LinkedIn serves for a total, capped at the pages it will paginate to."""
+    pages = math.ceil(total_results / SEARCH_URL_CONFIG['jobs_per_page'])
+    return max(1, min(pages, SEARCH_URL_CONFIG['max_pages']))
+
+
+def location_key(location: str) -> str:
+    return ' '.join(location.lower().split())
+
+
+class LocationCache:
+    """Location text -> LinkedIn geoId, learned from form searches and kept in MongoDB."""
+
+    def __init__(self, collection=None):
+        self.collection = collection
+        self.geo_ids: Dict[str, str] = {}
+
+    def bind(self, collection):
+        self.collection = collection
+
+    def get(self, location: str) -> Optional[str]:
+        key = location_key(location)
+        if key in self.geo_ids:
+            return self.geo_ids[key]
+        if self.collection is None:
+            return None
+        try:
+            doc = self.collection.find_one({"_id": key}, {"geo_id": 1})
+        except Exception as e:
+            logger.warning(f"Location cache lookup failed: {str(e)}")
+            return None
+        if doc:
+            self.geo_ids[key] = doc['geo_id']
+            return doc['geo_id']
+        return None
+
+    def learn(self, location: str, results_url: str) -> Optional[str]:
+        """Remember the geoId of a search results URL reached through the form."""
+        geo_id = geo_id_from_url(results_url)
+        if not geo_id:
+            logger.warning(f"No geoId in search results URL for location {location}")
+            return None
+        key = location_key(location)
+        self.geo_ids[key] = geo_id
+        if self.collection is not None:
+            try:
+                self.collection.update_one(
+                    {"_id": key},
+                    {"$set": {"location": location, "geo_id": geo_id, "learned_at": datetime.now().isoformat()}},
+                    upsert=True
+                )
+            except Exception as e:
+                logger.warning(f"Failed to cache geoId for {location}: {str(e)}")
+        logger.info(f"Learned geoId {geo_id} for location {location}")
+        return geo_id
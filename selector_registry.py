@@ -0,0 +1,240 @@
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from pymongo import UpdateOne
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from config import SELECTOR_REGISTRY_CONFIG
+from job_detail_parser import CARD_COMPANY_SELECTORS, CARD_TITLE_SELECTORS, DETAIL_SELECTORS
+
+logger = logging.getLogger(__name__)
+
+# Fallback chains in their original order; the registry reorders them by observed hit rate
+DEFAULT_SELECTOR_GROUPS = {
+    'job_cards': [
+        "li.ember-view.aUvdHPFertpnIJPPQuqaOLBKDiHTTANo.occludable-update.p0.relative.scaffold-layout__list-item",
+        "li.ember-view.occludable-update.p0.relative.scaffold-layout__list-item",
+        "li.ember-view.job-card-container",
+        "div.job-card-container",
+        "div.base-card"
+    ],
+    # Empty-state markers, waited on together with the job cards so an empty page is recognised at once
+    'empty_results': [
+        "div.jobs-search-no-results-banner",
+        "div.jobs-search-two-pane__no-results-banner--expand",
+        "section.jobs-search-no-results"
+    ],
+    'results_count': [
+        "div.jobs-search-results-list__subtitle span",
+        "small.jobs-search-results-list__text",
+        "div.jobs-search-results-list__subtitle"
+    ],
+    'card_link': [
+        "a.base-card__full-link",
+        "a.job-card-container__link",
+        "div.job-card-container__primary-description"
+    ],
+    'card_title': CARD_TITLE_SELECTORS,
+    'card_company': CARD_COMPANY_SELECTORS,
+    # The detail pane's own link to the job it shows, which tells a re-rendered pane from a stale one
+    'pane_job_link': [
+        "div.job-details-jobs-unified-top-card__job-title a",
+        "h1.t-24 a[href*=\"/jobs/view/\"]",
+        "div.jobs-unified-top-card__content--two-pane a[href*=\"/jobs/view/\"]",
+        "div.jobs-details__main-content a[href*=\"/jobs/view/\"]"
+    ],
+    **DETAIL_SELECTORS
+}
+
+# Returns [selector, elements] for the first selector in the chain matching anything, in one round trip
+ANY_OF_SCRIPT = (
+    "var scope = arguments[1] || document;"
+    "for (var i = 0; i < arguments[0].length; i++) {"
+    "  var found = scope.querySelectorAll(arguments[0][i]);"
+    "  if (found.length) { return [arguments[0][i], Array.prototype.slice.call(found)]; }"
+    "}"
+    "return null;"
+)
+
+
+class AnySelectorPresent:
+    """Expected condition satisfied as soon as any selector in the chain matches.
+
+    Every poll checks the whole chain in a single execute_script, so fallbacks are waited on
+    together instead of one timeout after another.
+    """
+
+    def __init__(self, selectors: List[str], scope=None):
+        self.selectors = selectors
+        self.scope = scope
+
+    def __call__(self, driver):
+        result = driver.execute_script(ANY_OF_SCRIPT, self.selectors, self.scope)
+        if result and result[1]:
+            return result[0], result[1]
+        return False
+
+
+class SelectorRegistry:
+    """Selector fallback chains ordered by per-selector hit rate and latency, persisted in MongoDB."""
+
+    def __init__(self, collection=None, groups: Dict[str, List[str]] = None):
+        self.collection = collection
+        self.groups = {name: list(selectors) for name, selectors in (groups or DEFAULT_SELECTOR_GROUPS).items()}
+        self.stats = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def bind(self, collection):
+        self.collection = collection
+
+    def _entry(self, group: str, selector: str) -> Dict:
+        return self.stats.setdefault((group, selector), {'hits': 0.0, 'misses': 0.0, 'latency_total': 0.0})
+
+    def load(self):
+        """Load persisted statistics, down-weighting previous runs so markup changes are picked up."""
+        if self.collection is None:
+            return
+        decay = SELECTOR_REGISTRY_CONFIG['history_decay']
+        try:
+            with self._lock:
+                for doc in self.collection.find({}):
+                    if doc.get('group') not in self.groups:
+                        continue
+                    self.stats[(doc['group'], doc['selector'])] = {
+                        'hits': doc.get('hits', 0) * decay,
+                        'misses': doc.get('misses', 0) * decay,
+                        'latency_total': doc.get('latency_total', 0) * decay
+                    }
+            logger.info(f"Loaded statistics for {len(self.stats)} selectors")
+        except Exception as e:
+            logger.error(f"Failed to load selector statistics: {str(e)}")
+
+    def save(self):
+        """Persist statistics for the selectors used since the last save."""
+        if self.collection is None:
+            return
+        with self._lock:
+            operations = [
+                UpdateOne(
+                    {"_id": f"{group}|{selector}"},
+                    {"$set": {
+                        "group": group,
+                        "selector": selector,
+                        **self.stats[(group, selector)],
+                        "updated_at": datetime.now().isoformat()
+                    }},
+                    upsert=True
+                )
+                for group, selector in self._dirty
+            ]
+            self._dirty.clear()
+        if not operations:
+            return
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to save selector statistics: {str(e)}")
+
+    def score(self, group: str, selector: str) -> Tuple[float, float]:
+        """Smoothed hit rate (higher first), then mean latency of hits (lower first)."""
+        entry = self.stats.get((group, selector))
+        if not entry:
+            return 0.5, 0.0
+        hit_rate = (entry['hits'] + 1) / (entry['hits'] + entry['misses'] + 2)
+        mean_latency = entry['latency_total'] / entry['hits'] if entry['hits'] else 0.0
+        return hit_rate, mean_latency
+
+    def ordered(self, group: str) -> List[str]:
+        """The group's selectors, currently best first; ties keep the original order."""
+        selectors = self.groups[group]
+        with self._lock:
+            scores = {selector: self.score(group, selector) for selector in selectors}
+        return sorted(selectors, key=lambda selector: (-scores[selector][0], scores[selector][1]))
+
+    def ordered_groups(self, names) -> Dict[str, List[str]]:
+        return {name: self.ordered(name) for name in names}
+
+    def record(self, group: str, selector: Optional[str], tried: List[str], latency: float = 0.0):
+        """Record a hit for `selector` and misses for the selectors tried before it (all of them on a miss)."""
+        with self._lock:
+            for candidate in tried:
+                if candidate == selector:
+                    entry = self._entry(group, candidate)
+                    entry['hits'] += 1
+                    entry['latency_total'] += latency
+                    self._dirty.add((group, candidate))
+                    break
+                self._entry(group, candidate)['misses'] += 1
+                self._dirty.add((group, candidate))
+
+    def wait_for_any(self, driver, group: str, timeout: float, scope=None) -> Tuple[str, List]:
+        """Wait until any selector of the group matches; return it with its elements.
+
+        Raises TimeoutException if none matched within `timeout`.
+        """
+        selectors = self.ordered(group)
+        started = time.monotonic()
+        try:
+            selector, elements = WebDriverWait(driver, timeout).until(AnySelectorPresent(selectors, scope))
+        except TimeoutException:
+            self.record(group, None, selectors)
+            raise
+        self.record(group, selector, selectors, time.monotonic() - started)
+        return selector, elements
+
+    def wait_for_any_group(self, driver, groups: Tuple[str, ...], timeout: float) -> Tuple[str, str, List]:
+        """Wait until a selector of any of the groups matches; return the group, the selector and its elements.
+
+        All chains are checked in one script per poll, in the order the groups are given.
+        Raises TimeoutException if nothing matched within `timeout`.
+        """
+        chains = self.ordered_groups(groups)
+        owners = {}
+        for group in groups:
+            for selector in chains[group]:
+                owners.setdefault(selector, group)
+        started = time.monotonic()
+        try:
+            selector, elements = WebDriverWait(driver, timeout).until(AnySelectorPresent(list(owners)))
+        except TimeoutException:
+            for group in groups:
+                self.record(group, None, chains[group])
+            raise
+        group = owners[selector]
+        self.record(group, selector, chains[group], time.monotonic() - started)
+        return group, selector, elements
+
+    def find_any(self, driver, group: str, scope=None) -> Tuple[Optional[str], List]:
+        """Match the group's selectors once, without waiting."""
+        selectors = self.ordered(group)
+        started = time.monotonic()
+        result = AnySelectorPresent(selectors, scope)(driver)
+        if not result:
+            self.record(group, None, selectors)
+            return None, []
+        self.record(group, result[0], selectors, time.monotonic() - started)
+        return result
+
+    def summary(self) -> Dict[str, List[Dict]]:
+        """Per-group selector statistics in the current order, for logging."""
+        report = {}
+        for group in self.groups:
+            rows = []
+            for selector in self.ordered(group):
+                entry = self.stats.get((group, selector))
+                if not entry:
+                    continue
+                hit_rate, mean_latency = self.score(group, selector)
+                rows.append({
+                    'selector': selector,
+                    'hits': round(entry['hits'], 1),
+                    'misses': round(entry['misses'], 1),
+                    'hit_rate': hit_rate,
+                    'mean_latency': mean_latency
+                })
+            if rows:
+                report[group] = rows
+        return report
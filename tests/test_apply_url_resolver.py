@@ -0,0 +1,34 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from apply_url_resolver import ApplyUrlResolver
+
+
+class ApplyUrlPacingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pace = mock.Mock()
+        self.resolver = ApplyUrlResolver(pace=self.pace)
+        self.addCleanup(self.resolver.close)
+
+    def respond(self, final_url):
+        return mock.patch.object(
+            self.resolver.session, 'request', return_value=SimpleNamespace(status_code=200, url=final_url)
+        )
+
+    def test_offsite_resolve_does_not_use_linkedin_pacing(self):
+        link = 'https://www.linkedin.com/redir/redirect?url=https%3A%2F%2Fboards.greenhouse.io%2Facme%2Fjobs%2F1'
+        with self.respond('https://boards.greenhouse.io/acme/jobs/1?gh_src=li'):
+            self.assertEqual(self.resolver.resolve(link), 'https://boards.greenhouse.io/acme/jobs/1?gh_src=li')
+        self.pace.assert_not_called()
+
+    def test_linkedin_request_is_paced(self):
+        link = 'https://www.linkedin.com/jobs/view/externalApply/3901000001'
+        with self.respond('https://jobs.lever.co/acme/1'):
+            self.assertEqual(self.resolver.resolve(link), 'https://jobs.lever.co/acme/1')
+        self.pace.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import json
+import asyncio
+import time
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+
+from async_llm_client import AsyncLLMClient, TokenBucket
+from config import LLM_RATE_LIMIT_CONFIG
+
+
+class StandInChatServer:
+    """Local chat-completions stand-in that replays queued error responses, then answers 200."""
+
+    def __init__(self, failures=(), delay: float = 0.0):
+        self.failures = list(failures)
+        self.delay = delay
+        self.arrivals = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with stand_in.lock:
+                    stand_in.arrivals.append(time.monotonic())
+                    stand_in.in_flight += 1
+                    stand_in.max_in_flight = max(stand_in.max_in_flight, stand_in.in_flight)
+                    failure = stand_in.failures.pop(0) if stand_in.failures else None
+                try:
+                    time.sleep(stand_in.delay)
+                    if failure:
+                        status, headers = failure
+                        body = {'error': {'message': 'Rate limit reached', 'type': 'requests', 'code': 'rate_limit'}}
+                    else:
+                        status, headers = 200, {}
+                        body = {
+                            'id': 'chatcmpl-test',
+                            'object': 'chat.completion',
+                            'created': int(time.time()),
+                            'model': 'gpt-3.5-turbo',
+                            'choices': [{
+                                'index': 0,
+                                'message': {'role': 'assistant', 'content': 'ok'},
+                                'finish_reason': 'stop'
+                            }],
+                            'usage': {'prompt_tokens': 5, 'completion_tokens': 1, 'total_tokens': 6}
+                        }
+                    payload = json.dumps(body).encode('utf-8')
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(payload)))
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with stand_in.lock:
+                        stand_in.in_flight -= 1
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def chat_request(max_tokens: int = 10):
+    return {
+        'model': 'gpt-3.5-turbo',
+        'messages': [{'role': 'user', 'content': 'hi'}],
+        'max_tokens': max_tokens
+    }
+
+
+class AsyncLLMClientTest(unittest.TestCase):
+
+    def setUp(self):
+        # Keep the jitter added on top of Retry-After negligible
+        patcher = mock.patch.dict(LLM_RATE_LIMIT_CONFIG, {'backoff_base': 0.01, 'backoff_max': 0.05})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def client(self, server, **kwargs):
+        client = AsyncLLMClient(api_key='test', base_url=server.base_url, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_retries_429_honouring_retry_after(self):
+        failures = [(429, {'retry-after-ms': '300'}), (429, {'Retry-After': '1'})]
+        with StandInChatServer(failures) as server:
+            client = self.client(server, max_retries=3)
+            self.assertEqual(client.complete(chat_request()), 'ok')
+
+        self.assertEqual(len(server.arrivals), 3)
+        self.assertEqual(client.stats['retries'], 2)
+        self.assertEqual(client.stats['rate_limited'], 2)
+        self.assertEqual(client.stats['failures'], 0)
+        first_gap, second_gap = (b - a for a, b in zip(server.arrivals, server.arrivals[1:]))
+        self.assertGreaterEqual(first_gap, 0.3)
+        self.assertGreaterEqual(second_gap, 1.0)
+
+    def test_gives_up_after_max_retries(self):
+        failures = [(429, {'retry-after-ms': '10'})] * 3
+        with StandInChatServer(failures) as server:
+            client = self.client(server, max_retries=2)
+            with self.assertRaises(Exception):
+                client.complete(chat_request())
+
+        self.assertEqual(len(server.arrivals), 3)
+        self.assertEqual(client.stats['retries'], 2)
+        self.assertEqual(client.stats['failures'], 1)
+
+    def test_backoff_never_below_retry_after(self):
+        client = AsyncLLMClient(api_key='test')
+        error = SimpleNamespace(response=SimpleNamespace(headers={'retry-after': '5'}))
+        for attempt in range(8):
+            self.assertGreaterEqual(client.backoff_delay(attempt, error), 5.0)
+        error = SimpleNamespace(response=SimpleNamespace(headers={'retry-after-ms': '2500'}))
+        self.assertGreaterEqual(client.backoff_delay(0, error), 2.5)
+
+    def test_request_bucket_paces_requests_per_minute(self):
+        with StandInChatServer() as server:
+            client = self.client(server, requests_per_minute=600)
+            client.start()
+            client._loop.call_soon_threadsafe(client._request_bucket.drain)
+            for _ in range(4):
+                client.complete(chat_request())
+
+        # 600 RPM from an empty bucket is one request per 0.1s
+        gaps = [b - a for a, b in zip(server.arrivals, server.arrivals[1:])]
+        self.assertEqual(len(server.arrivals), 4)
+        for gap in gaps:
+            self.assertGreaterEqual(gap, 0.08)
+
+    def test_token_bucket_paces_tokens_per_minute(self):
+        with StandInChatServer() as server:
+            client = self.client(server, tokens_per_minute=60000)
+            client.start()
+            client._loop.call_soon_threadsafe(client._token_bucket.drain)
+            estimated = client.estimate_request_tokens(chat_request(200))
+            started = time.monotonic()
+            for _ in range(3):
+                client.complete(chat_request(200))
+            elapsed = time.monotonic() - started
+
+        # 60000 TPM from an empty bucket refills 1000 tokens a second
+        self.assertGreaterEqual(elapsed, 3 * estimated / 1000 * 0.9)
+
+    def test_token_bucket_lets_a_full_bucket_burst(self):
+        async def burst():
+            bucket = TokenBucket(600)
+            return [await bucket.acquire(1) for _ in range(600)]
+
+        self.assertEqual(sum(asyncio.run(burst())), 0.0)
+
+    def test_in_flight_limit(self):
+        with StandInChatServer(delay=0.2) as server:
+            client = self.client(server, max_in_flight=2)
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                results = list(pool.map(lambda _: client.complete(chat_request()), range(6)))
+
+        self.assertEqual(results, ['ok'] * 6)
+        self.assertEqual(server.max_in_flight, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
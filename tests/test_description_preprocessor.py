@@ -0,0 +1,41 @@
+import unittest
+
+from description_preprocessor import strip_boilerplate
+
+
+class StripBoilerplateTest(unittest.TestCase):
+
+    def test_drops_boilerplate_paragraphs(self):
+        text = (
+            "Build data pipelines in Python.\n\n"
+            "We are an equal opportunity employer and value diversity."
+        )
+        self.assertEqual(strip_boilerplate(text), "Build data pipelines in Python.")
+
+    def test_single_paragraph_keeps_the_job_lines(self):
+        text = (
+            "Senior Data Engineer\n"
+            "Build and run batch and streaming pipelines.\n"
+            "5+ years of Python and SQL experience.\n"
+            "Experience with Spark and Airflow.\n"
+            "We are an equal opportunity employer and value diversity."
+        )
+        result = strip_boilerplate(text)
+        self.assertIn("5+ years of Python and SQL experience.", result)
+        self.assertIn("Experience with Spark and Airflow.", result)
+        self.assertNotIn("equal opportunity", result)
+
+    def test_single_line_drops_boilerplate_sentences(self):
+        text = (
+            "Maintain our React frontend. Work closely with design. "
+            "Applicants will receive consideration without regard to race or religion."
+        )
+        self.assertEqual(strip_boilerplate(text), "Maintain our React frontend. Work closely with design.")
+
+    def test_all_boilerplate_keeps_the_original(self):
+        text = "We are an equal opportunity employer.\nReasonable accommodation is available."
+        self.assertEqual(strip_boilerplate(text), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
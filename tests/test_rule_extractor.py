@@ -0,0 +1,60 @@
+import unittest
+
+from rule_extractor import RuleBasedExtractor
+
+
+class IndustryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rules = RuleBasedExtractor()
+
+    def test_benefits_do_not_count_as_industry(self):
+        description = (
+            "We are a fast-growing SaaS company building planning software.\n\n"
+            "What we offer\n"
+            "Health insurance, dental insurance, vision insurance and 401(k).\n\n"
+            "This is a permanent position."
+        )
+        self.assertNotEqual(self.rules.extract_industry(description).get('value'), 'Insurance')
+
+    def test_insurance_needs_company_context(self):
+        description = "Our client is a leading insurance provider modernising its insurance claims platform."
+        self.assertEqual(self.rules.extract_industry(description), {'value': 'Insurance', 'confidence': 0.8})
+
+
+class BenefitsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rules = RuleBasedExtractor()
+
+    def test_coverage_terms_in_either_order(self):
+        expected = {'Health insurance', 'Dental insurance', 'Vision insurance', '401(k)', 'Paid time off'}
+        for description in ("Benefits: vision, dental, medical, 401k and PTO.",
+                            "Benefits: medical, dental, vision, 401k and PTO."):
+            self.assertEqual(set(self.rules.resolve(description)['benefits'].split(', ')), expected)
+
+    def test_coverage_line_without_heading(self):
+        self.assertEqual(
+            self.rules.extract_benefits("Medical and vision coverage."), ['Health insurance', 'Vision insurance']
+        )
+
+    def test_bare_terms_outside_benefits(self):
+        self.assertEqual(self.rules.extract_benefits("We build medical devices. Our vision is simple."), [])
+
+
+class ExcelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rules = RuleBasedExtractor()
+
+    def test_verb_is_not_a_skill(self):
+        self.assertNotIn('Excel', self.rules.extract_skills("You will excel in a fast-paced team."))
+
+    def test_skill_forms(self):
+        self.assertIn('Excel', self.rules.extract_skills("Advanced Microsoft excel and SQL."))
+        self.assertIn('Excel', self.rules.extract_skills("Strong Excel reporting."))
+        self.assertIn('Excel', self.rules.extract_skills("- sql, excel, tableau"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+from search_urls import parse_results_count
+
+
+class ParseResultsCountTest(unittest.TestCase):
+
+    def test_plain_counts(self):
+        self.assertEqual(parse_results_count('1,234 results'), 1234)
+        self.assertEqual(parse_results_count('87 results'), 87)
+        self.assertEqual(parse_results_count('1 result'), 1)
+
+    def test_abbreviated_counts(self):
+        self.assertEqual(parse_results_count('1K+ results'), 1000)
+        self.assertEqual(parse_results_count('1.5K+ results'), 1500)
+        self.assertEqual(parse_results_count('2.25K results'), 2250)
+
+    def test_no_count(self):
+        self.assertIsNone(parse_results_count('No matching jobs found'))
+        self.assertIsNone(parse_results_count(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import time
+import queue
+import logging
+import multiprocessing
+from typing import Dict, List, Optional
+from config import SCHEDULER_CONFIG, WORKER_POOL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class SharedRateLimiter:
+    """Request-rate cap shared by every worker process.
+
+    Holds the time of the next free slot in shared memory. Each page load or click takes the next
+    slot, one every 60 / actions_per_minute seconds, so the pool as a whole never goes faster than
+    a single browser would however many workers there are.
+    """
+
+    def __init__(self, actions_per_minute: float, context=None):
+        context = context or multiprocessing.get_context('spawn')
+        self.interval = 60.0 / actions_per_minute
+        self.next_slot = context.Value('d', 0.0)
+
+    def acquire(self) -> float:
+        """Wait for this caller's slot; returns the seconds waited."""
+        with self.next_slot.get_lock():
+            now = time.time()
+            slot = max(now, self.next_slot.value)
+            self.next_slot.value = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def worker_main(worker_index: int, worker_count: int, run_id: str, resuming: bool, output_file: str,
+                searches, results, rate_limiter: SharedRateLimiter, deadline: Optional[float] = None):
+    """Worker process: its own browser and MongoDB client, taking searches until the None sentinel.
+
+    With a deadline (a time.time() value from the run's time budget) the worker starts no new
+    search once it has passed.
+    """
+    # Imported here so the scraper module, and its logging setup, load inside the spawned process
+    from linkedin_scraper import LinkedInScraper
+
+    report = {'worker': worker_index, 'searches': 0, 'jobs': 0, 'skipped': 0, 'minutes': 0.0, 'error': None}
+    started = time.monotonic()
+    scraper = None
+    try:
+        scraper = LinkedInScraper(worker_index, worker_count, rate_limiter)
+        scraper.join_run(run_id, resuming)
+        scraper.persistence.start()
+        if not scraper.login():
+            raise Exception("Failed to login to LinkedIn")
+
+        while True:
+            if deadline is not None and time.time() >= deadline:
+                logger.info(f"Worker {worker_index}: time budget used, taking no more searches")
+                break
+            search = searches.get()
+            if search is None:
+                break
+            # Pick up jobs other workers have extracted so this run visits each job once
+            scraper.mongo.execute(scraper.known_jobs.load_run, run_id)
+            jobs_data = scraper.run_search(search, output_file)
+            report['searches'] += 1
+            report['jobs'] += len(jobs_data)
+            report['skipped'] += scraper.known_jobs.skipped
+        scraper.log_run_summary()
+    except Exception as e:
+        logger.error(f"Worker {worker_index} failed: {str(e)}")
+        report['error'] = str(e)
+    finally:
+        if scraper:
+            scraper.close()
+        report['minutes'] = (time.monotonic() - started) / 60
+        results.put(report)
+
+
+def log_throughput(reports: List[Dict], minutes: float):
+    """Per-worker and total jobs per minute."""
+    for report in sorted(reports, key=lambda r: r['worker']):
+        logger.info(
+            f"Worker {report['worker']}: {report['jobs']} jobs from {report['searches']} searches, "
+            f"{report['skipped']} skipped, {report['jobs'] / max(report['minutes'], 0.01):.1f} jobs/min"
+            + (f", failed: {report['error']}" if report['error'] else "")
+        )
+    total = sum(report['jobs'] for report in reports)
+    logger.info(
+        f"Worker pool: {total} jobs with {len(reports)} workers in {minutes:.1f} minutes "
+        f"({total / max(minutes, 0.01):.1f} jobs/min)"
+    )
+
+
+def run_pool(input_file: str, output_file: str, workers: int = None, resume: bool = False):
+    """Scrape the input CSV's searches on several browser processes under one shared rate cap."""
+    from linkedin_scraper import LinkedInScraper
+
+    workers = workers or WORKER_POOL_CONFIG['workers']
+    context = multiprocessing.get_context('spawn')
+    rate_limiter = SharedRateLimiter(WORKER_POOL_CONFIG['actions_per_minute'], context)
+    searches = context.Queue()
+    results = context.Queue()
+
+    # The coordinator only plans the run and records its outcome; it opens no browser
+    coordinator = LinkedInScraper(start_browser=False)
+    try:
+        run_id = coordinator.start_run(input_file, resume)
+        planned = coordinator.plan_searches(input_file)
+        for search in planned:
+            searches.put(search)
+        for _ in range(workers):
+            searches.put(None)
+        logger.info(f"Queued {len(planned)} searches for {workers} workers")
+
+        started = time.monotonic()
+        time_budget = SCHEDULER_CONFIG['time_budget_minutes']
+        deadline = time.time() + time_budget * 60 if time_budget is not None else None
+        processes = []
+        for worker_index in range(workers):
+            if worker_index:
+                time.sleep(WORKER_POOL_CONFIG['start_stagger_seconds'])
+            process = context.Process(
+                target=worker_main,
+                name=f"worker-{worker_index}",
+                args=(worker_index, workers, run_id, coordinator.checkpoint.resuming, output_file,
+                      searches, results, rate_limiter, deadline)
+            )
+            process.start()
+            processes.append(process)
+
+        reports = []
+        while len(reports) < workers:
+            try:
+                reports.append(results.get(timeout=WORKER_POOL_CONFIG['report_timeout']))
+            except Exception:
+                if not any(process.is_alive() for process in processes):
+                    logger.error(f"{workers - len(reports)} workers exited without a report")
+                    break
+        for process in processes:
+            process.join()
+        # Workers stopped by the time budget leave searches behind; drain them so the queue's
+        # feeder thread does not block this process on exit
+        left = 0
+        while True:
+            try:
+                if searches.get(timeout=1) is not None:
+                    left += 1
+            except queue.Empty:
+                break
+        if left and deadline is not None and time.time() >= deadline:
+            logger.info(f"Time budget of {time_budget} minutes used, leaving {left} searches")
+        elif left:
+            logger.warning(f"{left} searches were not taken by any worker")
+
+        log_throughput(reports, (time.monotonic() - started) / 60)
+        if reports and not any(report['error'] for report in reports):
+            coordinator.mongo.execute(coordinator.checkpoint.finish_run)
+        else:
+            logger.warning(f"Run {run_id} left unfinished; continue it with --resume")
+    finally:
+        coordinator.close()